@@ -8,15 +8,22 @@ import {
   Delete,
   UseGuards,
   Query,
+  HttpCode,
+  HttpStatus,
+  UseInterceptors,
 } from '@nestjs/common';
 import { AttendancesService } from './attendances.service';
 import { CreateAttendanceDto } from './dto/create-attendance.dto';
 import { UpdateAttendanceDto } from './dto/update-attendance.dto';
+import { BulkCreateAttendanceDto } from './dto/bulk-create-attendance.dto';
+import { BulkDeleteAttendanceDto } from './dto/bulk-delete-attendance.dto';
 import { JwtAuthGuard } from '../auth/guards/jwt-auth.guard';
 import { CurrentUser } from '../auth/decorators/current-user.decorator';
+import { IdempotencyInterceptor } from './idempotency.interceptor';
 
 @Controller('attendances')
 @UseGuards(JwtAuthGuard)
+@UseInterceptors(IdempotencyInterceptor)
 export class AttendancesController {
   constructor(private readonly attendancesService: AttendancesService) {}
 
@@ -25,16 +32,52 @@ export class AttendancesController {
     return this.attendancesService.create(createAttendanceDto);
   }
 
+  @Post('bulk')
+  createMany(@Body() bulkCreateAttendanceDto: BulkCreateAttendanceDto) {
+    return this.attendancesService.createMany(bulkCreateAttendanceDto);
+  }
+
+  @Post('bulk-delete')
+  @HttpCode(HttpStatus.OK)
+  removeMany(
+    @CurrentUser() user: { teamId: string },
+    @Body() bulkDeleteAttendanceDto: BulkDeleteAttendanceDto,
+  ) {
+    return this.attendancesService.removeMany(
+      user.teamId,
+      bulkDeleteAttendanceDto,
+    );
+  }
+
   @Get()
   findAll(
     @CurrentUser() user: { teamId: string },
     @Query('startDate') startDate?: string,
     @Query('endDate') endDate?: string,
+    @Query('fields') fields?: string,
+    @Query('limit') limit?: string,
+    @Query('cursor') cursor?: string,
   ) {
     return this.attendancesService.findAll({
       teamId: user.teamId,
       startDate,
       endDate,
+      fields,
+      limit,
+      cursor,
+    });
+  }
+
+  @Get('count')
+  count(
+    @CurrentUser() user: { teamId: string },
+    @Query('startDate') startDate?: string,
+    @Query('endDate') endDate?: string,
+  ) {
+    return this.attendancesService.count({
+      teamId: user.teamId,
+      startDate,
+      endDate,
     });
   }
 
@@ -1,7 +1,27 @@
-import { Injectable, NotFoundException } from '@nestjs/common';
+import {
+  Injectable,
+  NotFoundException,
+  BadRequestException,
+} from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../prisma/prisma.service';
 import { CreateAttendanceDto } from './dto/create-attendance.dto';
 import { UpdateAttendanceDto } from './dto/update-attendance.dto';
+import { BulkCreateAttendanceDto } from './dto/bulk-create-attendance.dto';
+import { BulkDeleteAttendanceDto } from './dto/bulk-delete-attendance.dto';
+
+// GET /attendances?fields= 로 고를 수 있는 컬럼 (배치 동기화용 가벼운 조회)
+const SELECTABLE_FIELDS = [
+  'id',
+  'userId',
+  'typeId',
+  'startDate',
+  'endDate',
+  'content',
+  'createdAt',
+  'updatedAt',
+] as const;
+const MAX_PAGE_SIZE = 1000;
 
 @Injectable()
 export class AttendancesService {
@@ -53,8 +73,45 @@ export class AttendancesService {
     });
   }
 
-  async findAll(params: { teamId: string; startDate?: string; endDate?: string }) {
-    const { teamId, startDate, endDate } = params;
+  async createMany(bulkCreateAttendanceDto: BulkCreateAttendanceDto) {
+    const { items } = bulkCreateAttendanceDto;
+    const userIds = [...new Set(items.map((item) => item.userId))];
+    const typeIds = [...new Set(items.map((item) => item.typeId))];
+
+    return this.prisma.$transaction(async (tx) => {
+      // 사용자 존재 체크
+      const userCount = await tx.user.count({
+        where: { id: { in: userIds } },
+      });
+
+      if (userCount !== userIds.length) {
+        throw new NotFoundException('User not found');
+      }
+
+      // 출결 유형 존재 체크
+      const typeCount = await tx.attendanceType.count({
+        where: { id: { in: typeIds } },
+      });
+
+      if (typeCount !== typeIds.length) {
+        throw new NotFoundException('Attendance type not found');
+      }
+
+      return tx.attendance.createMany({
+        data: items.map((item) => ({
+          userId: item.userId,
+          typeId: item.typeId,
+          content: item.content,
+          location: item.location,
+          remarks: item.remarks,
+          startDate: new Date(item.startDate),
+          endDate: new Date(item.endDate),
+        })),
+      });
+    });
+  }
+
+  private buildRangeFilter(teamId: string, startDate?: string, endDate?: string) {
     const filters: any = {
       user: { teamId },
     };
@@ -70,20 +127,106 @@ export class AttendancesService {
       filters.startDate = { lte: new Date(endDate) };
     }
 
-    return this.prisma.attendance.findMany({
-      where: filters,
-      include: {
-        user: {
-          select: {
-            id: true,
-            name: true,
-            email: true,
+    return filters;
+  }
+
+  async findAll(params: {
+    teamId: string;
+    startDate?: string;
+    endDate?: string;
+    fields?: string;
+    limit?: string;
+    cursor?: string;
+  }) {
+    const { teamId, startDate, endDate, fields, limit, cursor } = params;
+    const filters = this.buildRangeFilter(teamId, startDate, endDate);
+    const select = this.buildFieldSelect(fields);
+
+    // limit 없이 부르면 기존 형태(전체 배열)
+    if (limit === undefined) {
+      if (select) {
+        return this.prisma.attendance.findMany({
+          where: filters,
+          select,
+          orderBy: { id: 'asc' },
+        });
+      }
+      return this.prisma.attendance.findMany({
+        where: filters,
+        include: {
+          user: {
+            select: {
+              id: true,
+              name: true,
+              email: true,
+            },
           },
+          type: true,
         },
-        type: true,
-      },
-      orderBy: [{ type: { category: 'asc' } }, { startDate: 'asc' }],
+        orderBy: [{ type: { category: 'asc' } }, { startDate: 'asc' }],
+      });
+    }
+
+    // 커서 페이지: id 순으로 limit건, 다음 페이지는 nextCursor(마지막 id) 다음부터
+    const take = Number(limit);
+    if (!Number.isInteger(take) || take < 1 || take > MAX_PAGE_SIZE) {
+      throw new BadRequestException(`limit must be an integer between 1 and ${MAX_PAGE_SIZE}`);
+    }
+    const where = cursor ? { AND: [filters, { id: { gt: cursor } }] } : filters;
+    const items = select
+      ? await this.prisma.attendance.findMany({
+          where,
+          select,
+          orderBy: { id: 'asc' },
+          take: take + 1,
+        })
+      : await this.prisma.attendance.findMany({
+          where,
+          include: {
+            user: { select: { id: true, name: true, email: true } },
+            type: true,
+          },
+          orderBy: { id: 'asc' },
+          take: take + 1,
+        });
+    const hasMore = items.length > take;
+    const page = hasMore ? items.slice(0, take) : items;
+
+    return {
+      items: page,
+      nextCursor: hasMore ? page[page.length - 1].id : null,
+    };
+  }
+
+  private buildFieldSelect(fields?: string): Prisma.AttendanceSelect | null {
+    if (!fields) {
+      return null;
+    }
+    const names = fields
+      .split(',')
+      .map((name) => name.trim())
+      .filter(Boolean);
+    const unknown = names.filter(
+      (name) => !(SELECTABLE_FIELDS as readonly string[]).includes(name),
+    );
+    if (unknown.length > 0) {
+      throw new BadRequestException(
+        `Unknown fields: ${unknown.join(', ')} (allowed: ${SELECTABLE_FIELDS.join(', ')})`,
+      );
+    }
+    // 커서에 필요한 id는 항상 포함
+    return Object.fromEntries(
+      ['id', ...names].map((name) => [name, true]),
+    ) as Prisma.AttendanceSelect;
+  }
+
+  async count(params: { teamId: string; startDate?: string; endDate?: string }) {
+    const { teamId, startDate, endDate } = params;
+    const count = await this.prisma.attendance.count({
+      where: this.buildRangeFilter(teamId, startDate, endDate),
     });
+
+    return { count };
   }
 
   async findOne(id: string) {
@@ -193,4 +336,22 @@ export class AttendancesService {
 
     return { message: 'Attendance deleted successfully' };
   }
+
+  async removeMany(teamId: string, bulkDeleteAttendanceDto: BulkDeleteAttendanceDto) {
+    const { ids, startDate, endDate } = bulkDeleteAttendanceDto;
+
+    if (!ids?.length && !startDate && !endDate) {
+      throw new BadRequestException('ids 또는 startDate/endDate 중 하나는 필요합니다.');
+    }
+
+    // 팀 범위 안에서만 삭제 (ids와 기간을 함께 주면 둘 다 만족하는 것만)
+    const filters = this.buildRangeFilter(teamId, startDate, endDate);
+    if (ids?.length) {
+      filters.id = { in: ids };
+    }
+
+    return this.prisma.$transaction(async (tx) =>
+      tx.attendance.deleteMany({ where: filters }),
+    );
+  }
 }
@@ -0,0 +1,17 @@
+import {
+  IsArray,
+  ArrayNotEmpty,
+  ArrayMaxSize,
+  ValidateNested,
+} from 'class-validator';
+import { Type } from 'class-transformer';
+import { CreateAttendanceDto } from './create-attendance.dto';
+
+export class BulkCreateAttendanceDto {
+  @IsArray()
+  @ArrayNotEmpty()
+  @ArrayMaxSize(1000)
+  @ValidateNested({ each: true })
+  @Type(() => CreateAttendanceDto)
+  items: CreateAttendanceDto[];
+}
@@ -0,0 +1,23 @@
+import {
+  IsArray,
+  ArrayMaxSize,
+  IsOptional,
+  IsDateString,
+  IsUUID,
+} from 'class-validator';
+
+export class BulkDeleteAttendanceDto {
+  @IsArray()
+  @ArrayMaxSize(1000)
+  @IsUUID('all', { each: true })
+  @IsOptional()
+  ids?: string[];
+
+  @IsDateString()
+  @IsOptional()
+  startDate?: string;
+
+  @IsDateString()
+  @IsOptional()
+  endDate?: string;
+}
@@ -0,0 +1,58 @@
+import {
+  CallHandler,
+  ExecutionContext,
+  Injectable,
+  NestInterceptor,
+} from '@nestjs/common';
+import { Observable, from, lastValueFrom } from 'rxjs';
+
+const TTL_MS = 10 * 60 * 1000;
+const MAX_ENTRIES = 10000;
+
+interface Entry {
+  expiresAt: number;
+  result: Promise<unknown>;
+}
+
+/**
+ * `Idempotency-Key` 헤더가 있는 POST 요청의 결과를 일정 시간 기억한다.
+ *
+ * 배치가 응답을 받지 못하고 같은 키로 재시도하면 다시 실행하지 않고
+ * 첫 요청의 결과(진행 중이면 그 완료)를 돌려준다. 실패한 요청은 기억하지
+ * 않으므로 같은 키로 다시 시도할 수 있다. 키는 사용자 단위로 구분된다.
+ */
+@Injectable()
+export class IdempotencyInterceptor implements NestInterceptor {
+  private readonly entries = new Map<string, Entry>();
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    const request = context.switchToHttp().getRequest();
+    const key = request.headers['idempotency-key'];
+    if (request.method !== 'POST' || typeof key !== 'string' || !key) {
+      return next.handle();
+    }
+
+    const now = Date.now();
+    this.evict(now);
+    const scopedKey = `${request.user?.id ?? ''}:${request.path}:${key}`;
+    const existing = this.entries.get(scopedKey);
+    if (existing) {
+      return from(existing.result);
+    }
+
+    const result = lastValueFrom(next.handle());
+    this.entries.set(scopedKey, { expiresAt: now + TTL_MS, result });
+    result.catch(() => this.entries.delete(scopedKey));
+    return from(result);
+  }
+
+  private evict(now: number) {
+    for (const [key, entry] of this.entries) {
+      if (entry.expiresAt <= now || this.entries.size > MAX_ENTRIES) {
+        this.entries.delete(key);
+      } else {
+        break;
+      }
+    }
+  }
+}
@@ -1,10 +1,15 @@
 import { NestFactory } from '@nestjs/core';
 import { ValidationPipe } from '@nestjs/common';
 import { SwaggerModule, DocumentBuilder } from '@nestjs/swagger';
+import { NestExpressApplication } from '@nestjs/platform-express';
 import { AppModule } from './app.module';
 
 async function bootstrap() {
-  const app = await NestFactory.create(AppModule);
+  const app = await NestFactory.create<NestExpressApplication>(AppModule);
+
+  // JSON 본문 크기 제한: 기본 100kb로는 일괄 생성(items 최대 1000건, 건당 약 170바이트 +
+  // content)이 검증 전에 413으로 거부되므로 넉넉히 늘린다 (gzip 본문은 압축 해제 후 크기 기준)
+  app.useBodyParser('json', { limit: '2mb' });
 
   // Global prefix
   app.setGlobalPrefix('api/v1');
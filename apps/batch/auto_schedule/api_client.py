@@ -3,15 +3,49 @@ API Client for Weekly Report Backend
 
 Handles authentication and API calls to the NestJS backend.
 """
-import time
-from typing import Any, Optional
+import base64
+import json
+import uuid
+from typing import Any, Iterator, Optional
 import requests
 
+from metadata_cache import MetadataCache
+from metrics import instrument_session
+from rate_limiter import AdaptiveTokenBucket
+from retry_policy import CircuitBreaker, RetryPolicy
+from sync_journal import chunk_key
+from transport import configure_session, encode_json
+
+
+def _chunks(items: list, size: int):
+    """Yield successive slices of at most `size` items."""
+    size = max(1, size)
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+# 동기화 비교(attendance_key)와 삭제에 필요한 컬럼만 받는다
+SYNC_FIELDS = ("id", "userId", "typeId", "startDate", "endDate", "content")
+
 
 class APIClient:
     """Client for interacting with the Weekly Report backend API."""
 
-    def __init__(self, base_url: str, email: str, password: str):
+    def __init__(
+        self,
+        base_url: str,
+        email: str,
+        password: str,
+        rate_limiter: Optional[AdaptiveTokenBucket] = None,
+        pool_size: int = 10,
+        metadata_cache: Optional[MetadataCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        bulk_read_timeout: float = 30.0,
+        compress_min_bytes: int = 0,
+        page_size: int = 500,
+    ):
         """
         Initialize API client.
 
@@ -19,13 +53,85 @@ class APIClient:
             base_url: Base URL of the API (e.g., http://localhost:4000/api/v1)
             email: User email for authentication
             password: User password for authentication
+            rate_limiter: Shared limiter for write calls (default: 10 req/s)
+            pool_size: Max pooled connections (match worker concurrency)
+            metadata_cache: Cache for users/attendance types (None = always download)
+            retry_policy: Retry/circuit-breaker policy shared by every call
+                          (default: 4 attempts, breaker after 5 failures)
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for a response
+            bulk_read_timeout: Read timeout for bulk/range requests
+            compress_min_bytes: Gzip JSON request bodies at least this large (0 = off)
+            page_size: Records per GET /attendances page (0 = one unpaged request)
         """
         self.base_url = base_url.rstrip("/")
         self.email = email
         self.password = password
-        self.session = requests.Session()
+        self.session = configure_session(instrument_session(requests.Session(), "api"), pool_size)
+        self.timeout = (connect_timeout, read_timeout)
+        self.bulk_timeout = (connect_timeout, max(read_timeout, bulk_read_timeout))
+        self.compress_min_bytes = compress_min_bytes
+        self.page_size = max(0, page_size)
+        self.rate_limiter = rate_limiter or AdaptiveTokenBucket(rate=10)
+        self.metadata_cache = metadata_cache
+        self.retry_policy = retry_policy or RetryPolicy("api", breaker=CircuitBreaker("api"))
         self.token: Optional[str] = None
 
+    def _send(self, method: str, url: str, limited: bool, **kwargs: Any) -> requests.Response:
+        """One attempt; write calls (limited=True) draw from the shared rate limiter."""
+        if limited:
+            self.rate_limiter.acquire()
+        response = self.session.request(method, url, **kwargs)
+        response.raise_for_status()
+        if limited:
+            self.rate_limiter.reward()
+        return response
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        limited: bool = False,
+        max_attempts: Optional[int] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a request through the shared retry policy.
+
+        POST requests carry an Idempotency-Key that stays the same across
+        retries, so a retried create/bulk call is not applied twice. JSON
+        bodies are encoded once (gzip above compress_min_bytes) and the
+        client's connect/read timeouts apply unless `timeout` is given.
+
+        Args:
+            method: HTTP method
+            url: Full endpoint URL
+            limited: Draw from the rate limiter (write calls)
+            max_attempts: Override the policy's attempt count
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            Successful (or 304) response
+
+        Raises:
+            requests.RequestException: If the call finally fails (CircuitOpenError
+                                       while the backend is considered down)
+        """
+        headers = dict(kwargs.pop("headers", None) or {})
+        if method == "POST":
+            headers.setdefault("Idempotency-Key", str(uuid.uuid4()))
+        if "json" in kwargs:
+            kwargs["data"], body_headers = encode_json(kwargs.pop("json"), self.compress_min_bytes)
+            headers.update(body_headers)
+        kwargs["headers"] = headers
+        kwargs.setdefault("timeout", self.timeout)
+        return self.retry_policy.call(
+            lambda: self._send(method, url, limited, **kwargs),
+            max_attempts=max_attempts,
+            on_throttle=self.rate_limiter.penalize,
+            label=f"{method} {url.removeprefix(self.base_url)}",
+        )
+
     def login(self) -> dict[str, Any]:
         """
         Login and obtain JWT token.
@@ -40,8 +146,7 @@ class APIClient:
         payload = {"email": self.email, "password": self.password}
 
         print(f"[api] Logging in as {self.email}...")
-        response = self.session.post(url, json=payload, timeout=10)
-        response.raise_for_status()
+        response = self._request("POST", url, json=payload)
 
         data = response.json()
         self.token = data.get("accessToken")  # camelCase!
@@ -49,6 +154,73 @@ class APIClient:
         print("[api] ✅ Login successful")
         return data
 
+    def restore_token(self, token: str) -> bool:
+        """
+        Reuse a previously issued JWT if the backend still accepts it.
+
+        Args:
+            token: Access token from an earlier login
+
+        Returns:
+            True if GET /auth/me succeeded with the token
+        """
+        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        try:
+            self._request("GET", f"{self.base_url}/auth/me")
+            valid = True
+        except requests.HTTPError:
+            valid = False
+        except requests.RequestException as e:
+            print(f"[api] Cached token probe failed: {e}")
+            valid = False
+        if valid:
+            self.token = token
+            print("[api] ✅ Reusing cached token")
+            return True
+        self.session.headers.pop("Authorization", None)
+        self.token = None
+        return False
+
+    def token_expires_at(self) -> Optional[float]:
+        """Return the `exp` claim (epoch seconds) of the current JWT, if any."""
+        if not self.token:
+            return None
+        try:
+            payload = self.token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+        except (IndexError, KeyError, ValueError):
+            return None
+
+    def _get_metadata(self, url: str) -> Any:
+        """
+        GET a metadata list through the metadata cache.
+
+        Within the TTL the cached copy is returned without a request; after
+        that the request carries If-None-Match and a 304 reuses the cached copy.
+
+        Args:
+            url: Full endpoint URL
+
+        Returns:
+            Decoded JSON body
+        """
+        cache = self.metadata_cache
+        key = f"{self.email} {url}"
+        entry = cache.get(key) if cache else None
+        if entry and cache.is_fresh(entry):
+            return entry["data"]
+
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+        response = self._request("GET", url, headers=headers)
+        if response.status_code == 304 and entry:
+            cache.touch(key)
+            return entry["data"]
+        data = response.json()
+        if cache:
+            cache.put(key, data, response.headers.get("ETag"))
+        return data
+
     def get_users(self) -> list[dict[str, Any]]:
         """
         Get all users.
@@ -56,10 +228,7 @@ class APIClient:
         Returns:
             List of user objects with id, name, email, etc.
         """
-        url = f"{self.base_url}/users"
-        response = self.session.get(url, timeout=10)
-        response.raise_for_status()
-        users = response.json()
+        users = self._get_metadata(f"{self.base_url}/users")
         print(f"[api] Retrieved {len(users)} users")
         return users
 
@@ -70,15 +239,53 @@ class APIClient:
         Returns:
             List of attendance type objects with id, code, name, category
         """
-        url = f"{self.base_url}/attendance-types"
-        response = self.session.get(url, timeout=10)
-        response.raise_for_status()
-        types = response.json()
+        types = self._get_metadata(f"{self.base_url}/attendance-types")
         print(f"[api] Retrieved {len(types)} attendance types")
         return types
 
+    def iter_attendances_in_range(
+        self,
+        start_date: str,
+        end_date: str,
+        fields: Optional[tuple[str, ...]] = SYNC_FIELDS,
+        page_size: Optional[int] = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream attendances in date range page by page (cursor pagination).
+
+        The next page is requested only when the previous one has been
+        consumed. A backend without pagination answers with a plain array,
+        which is yielded as a single page.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            fields: Columns to return (None = full objects with user/type)
+            page_size: Records per page (default: client page_size, 0 = unpaged)
+
+        Yields:
+            Attendance objects
+        """
+        url = f"{self.base_url}/attendances"
+        params: dict[str, Any] = {"startDate": start_date, "endDate": end_date}
+        if fields:
+            params["fields"] = ",".join(fields)
+        limit = self.page_size if page_size is None else page_size
+        if limit:
+            params["limit"] = limit
+        while True:
+            response = self._request("GET", url, params=params, timeout=self.bulk_timeout)
+            body = response.json()
+            if isinstance(body, list):
+                yield from body
+                return
+            yield from body["items"]
+            if not body.get("nextCursor"):
+                return
+            params["cursor"] = body["nextCursor"]
+
     def get_attendances_in_range(
-        self, start_date: str, end_date: str
+        self, start_date: str, end_date: str, fields: Optional[tuple[str, ...]] = SYNC_FIELDS
     ) -> list[dict[str, Any]]:
         """
         Get all attendances in date range.
@@ -86,16 +293,28 @@ class APIClient:
         Args:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
+            fields: Columns to return (None = full objects with user/type)
 
         Returns:
             List of attendance objects
         """
-        url = f"{self.base_url}/attendances"
+        return list(self.iter_attendances_in_range(start_date, end_date, fields))
+
+    def count_attendances_in_range(self, start_date: str, end_date: str) -> int:
+        """
+        Count attendances in date range (GET /attendances/count).
+
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+
+        Returns:
+            Number of team attendances overlapping the range
+        """
+        url = f"{self.base_url}/attendances/count"
         params = {"startDate": start_date, "endDate": end_date}
-        response = self.session.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        attendances = response.json()
-        return attendances
+        response = self._request("GET", url, params=params)
+        return int(response.json()["count"])
 
     def delete_attendance(self, attendance_id: str) -> None:
         """
@@ -105,90 +324,189 @@ class APIClient:
             attendance_id: UUID of the attendance to delete
         """
         url = f"{self.base_url}/attendances/{attendance_id}"
-        response = self.session.delete(url, timeout=10)
-        response.raise_for_status()
+        self._request("DELETE", url, limited=True)
 
-    def delete_attendances_in_range(self, start_date: str, end_date: str) -> int:
+    def delete_attendances_in_range(
+        self, start_date: str, end_date: str, bulk: bool = False
+    ) -> int:
         """
         Delete all attendances in date range.
 
         Args:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
+            bulk: Use a single POST /attendances/bulk-delete range request
 
         Returns:
             Number of attendances deleted
         """
-        print(f"[api] Fetching attendances from {start_date} to {end_date}...")
-        attendances = self.get_attendances_in_range(start_date, end_date)
-        count = len(attendances)
-
-        if count == 0:
-            print("[api] No existing attendances to delete")
-            return 0
-
-        print(f"[api] Deleting {count} existing attendances...")
-        for i, attendance in enumerate(attendances, 1):
+        if bulk:
+            url = f"{self.base_url}/attendances/bulk-delete"
+            payload = {"startDate": start_date, "endDate": end_date}
+            print(f"[api] Bulk deleting attendances from {start_date} to {end_date}...")
+            response = self._request("POST", url, limited=True, json=payload, timeout=self.bulk_timeout)
+            count = response.json().get("count", 0)
+            print(f"[api] ✅ Deleted {count} attendances")
+            return count
+
+        # 페이지 단위로 받으면서 바로 삭제 (커서가 id 기준이라 삭제해도 다음 페이지가 밀리지 않음)
+        print(f"[api] Deleting attendances from {start_date} to {end_date}...")
+        count = 0
+        for attendance in self.iter_attendances_in_range(start_date, end_date, fields=("id",)):
             try:
                 self.delete_attendance(attendance["id"])
-                if i % 10 == 0:
-                    print(f"[api]   Deleted {i}/{count}...")
+                count += 1
+                if count % 10 == 0:
+                    print(f"[api]   Deleted {count}...")
             except Exception as e:
                 print(f"[api]   ⚠️  Failed to delete {attendance['id']}: {e}")
 
-        print(f"[api] ✅ Deleted {count} attendances")
+        if count == 0:
+            print("[api] No existing attendances to delete")
+        else:
+            print(f"[api] ✅ Deleted {count} attendances")
         return count
 
-    def create_attendance(self, payload: dict[str, Any]) -> dict[str, Any]:
+    def create_attendances_bulk(
+        self,
+        payloads: list[dict[str, Any]],
+        chunk_size: int = 200,
+        keys: Optional[list[str]] = None,
+    ) -> tuple[int, list[dict[str, Any]]]:
         """
-        Create a new attendance.
+        Create many attendances via POST /attendances/bulk.
+
+        Each chunk is one request and one transaction on the backend, so a
+        chunk either lands completely or not at all.
 
         Args:
-            payload: Attendance data (userId, typeId, startDate, endDate, etc.)
+            payloads: Attendance payloads
+            chunk_size: Records per request (backend limit: 1000)
+            keys: Idempotency key per payload (sync journal); each chunk is
+                  sent with a key derived from its payloads' keys
 
         Returns:
-            Created attendance object
+            (number created, payloads whose chunk failed)
+        """
+        url = f"{self.base_url}/attendances/bulk"
+        created = 0
+        failed: list[dict[str, Any]] = []
+        key_chunks = _chunks(keys, chunk_size) if keys else None
+        for chunk in _chunks(payloads, chunk_size):
+            headers = {"Idempotency-Key": chunk_key(next(key_chunks))} if key_chunks else None
+            ok, result = self._with_retry(
+                "POST", url, json={"items": chunk}, headers=headers, timeout=self.bulk_timeout
+            )
+            if ok:
+                created += result.get("count", len(chunk))
+            else:
+                failed.extend(chunk)
+        print(f"[api] Bulk created {created}/{len(payloads)} attendances")
+        return created, failed
+
+    def delete_attendances_bulk(
+        self, attendance_ids: list[str], chunk_size: int = 500
+    ) -> tuple[int, list[str]]:
+        """
+        Delete many attendances via POST /attendances/bulk-delete.
 
-        Raises:
-            requests.HTTPError: If creation fails
+        Args:
+            attendance_ids: UUIDs of the attendances to delete
+            chunk_size: Ids per request (backend limit: 1000)
+
+        Returns:
+            (number deleted, ids whose chunk failed)
         """
-        url = f"{self.base_url}/attendances"
-        response = self.session.post(url, json=payload, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        url = f"{self.base_url}/attendances/bulk-delete"
+        deleted = 0
+        failed: list[str] = []
+        for chunk in _chunks(attendance_ids, chunk_size):
+            ok, result = self._with_retry("POST", url, json={"ids": chunk}, timeout=self.bulk_timeout)
+            if ok:
+                deleted += result.get("count", len(chunk))
+            else:
+                failed.extend(chunk)
+        print(f"[api] Bulk deleted {deleted}/{len(attendance_ids)} attendances")
+        return deleted, failed
+
+    def _with_retry(
+        self, method: str, url: str, max_retries: Optional[int] = None, **kwargs: Any
+    ) -> tuple[bool, Any]:
+        """
+        Run a write call through the retry policy without raising.
+
+        Args:
+            method: HTTP method
+            url: Full endpoint URL
+            max_retries: Maximum number of attempts (default: the policy's)
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            (succeeded, decoded JSON body or None)
+        """
+        try:
+            response = self._request(method, url, limited=True, max_attempts=max_retries, **kwargs)
+            return True, response.json() if response.content else None
+        except requests.RequestException as e:
+            print(f"[api]   ❌ {method} {url.removeprefix(self.base_url)} failed: {e}")
+            return False, None
+        except ValueError as e:
+            print(f"[api]   ❌ Unexpected response: {e}")
+            return False, None
 
     def create_attendance_with_retry(
-        self, payload: dict[str, Any], max_retries: int = 3
+        self,
+        payload: dict[str, Any],
+        max_retries: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Optional[dict[str, Any]]:
         """
         Create attendance with retry logic.
 
         Args:
             payload: Attendance data
-            max_retries: Maximum number of retry attempts
+            max_retries: Maximum number of attempts (default: the policy's)
+            idempotency_key: Idempotency-Key to send (default: random per call)
 
         Returns:
             Created attendance object, or None if all retries failed
         """
-        for attempt in range(max_retries):
-            try:
-                result = self.create_attendance(payload)
-                time.sleep(0.1)  # Rate limiting
-                return result
-            except requests.HTTPError as e:
-                if e.response.status_code == 429:  # Too Many Requests
-                    wait = 2**attempt
-                    print(f"[api]   Rate limited, waiting {wait}s...")
-                    time.sleep(wait)
-                    continue
-                elif attempt < max_retries - 1:
-                    print(f"[api]   ⚠️  Attempt {attempt + 1} failed, retrying...")
-                    time.sleep(1)
-                    continue
-                else:
-                    print(f"[api]   ❌ Failed after {max_retries} attempts: {e}")
-                    return None
-            except Exception as e:
-                print(f"[api]   ❌ Unexpected error: {e}")
-                return None
-        return None
+        url = f"{self.base_url}/attendances"
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        _, result = self._with_retry("POST", url, max_retries, json=payload, headers=headers)
+        return result
+
+    def update_attendance_with_retry(
+        self, attendance_id: str, payload: dict[str, Any], max_retries: Optional[int] = None
+    ) -> Optional[dict[str, Any]]:
+        """
+        Update attendance with retry logic.
+
+        Args:
+            attendance_id: UUID of the attendance to update
+            payload: Fields to change
+            max_retries: Maximum number of attempts (default: the policy's)
+
+        Returns:
+            Updated attendance object, or None if all retries failed
+        """
+        url = f"{self.base_url}/attendances/{attendance_id}"
+        _, result = self._with_retry("PATCH", url, max_retries, json=payload)
+        return result
+
+    def delete_attendance_with_retry(
+        self, attendance_id: str, max_retries: Optional[int] = None
+    ) -> bool:
+        """
+        Delete attendance with retry logic.
+
+        Args:
+            attendance_id: UUID of the attendance to delete
+            max_retries: Maximum number of attempts (default: the policy's)
+
+        Returns:
+            True if deleted, False if all retries failed
+        """
+        url = f"{self.base_url}/attendances/{attendance_id}"
+        ok, _ = self._with_retry("DELETE", url, max_retries)
+        return ok
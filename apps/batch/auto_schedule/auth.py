@@ -1,9 +1,16 @@
 import calendar
 import email
 import imaplib
-from datetime import datetime, timezone
+import itertools
+import select
+import time
+from datetime import datetime, timedelta, timezone
 from email.header import decode_header, make_header
 
+# imaplib 태그는 대문자 접두어라 소문자 접두어를 쓰면 겹치지 않는다
+_IDLE_TAGS = itertools.count(1)
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
 
 def _extract_code(subject: str) -> str:
     """Parse `[123456]` style 인증 코드를 잘라낸다."""
@@ -21,24 +28,25 @@ def _parse_internal_date(payload) -> datetime:
     return datetime.fromtimestamp(calendar.timegm(stamp_tuple), timezone.utc)
 
 
-def getAuthNumber(mail, appPw, from_email, max_retries=3):
-    """Gmail에서 인증 코드 가져오기 (재시도 로직 포함)"""
-    last_error = None
-
+def _connect(mail, appPw, max_retries=3):
+    """Gmail IMAP 접속 + inbox 선택 (재시도 로직 포함)"""
     for attempt in range(max_retries):
         try:
             server = imaplib.IMAP4_SSL("imap.gmail.com", 993, timeout=30)
             server.login(mail, appPw)
             server.select("inbox")
-            break
+            return server
         except (imaplib.IMAP4.abort, OSError, EOFError) as e:
-            last_error = e
             if attempt < max_retries - 1:
-                import time
                 time.sleep(2 ** attempt)  # 1초, 2초, 4초 대기
             else:
                 raise RuntimeError(f"Gmail 연결 실패 ({max_retries}회 시도): {e}") from e
 
+
+def getAuthNumber(mail, appPw, from_email, max_retries=3):
+    """Gmail에서 인증 코드 가져오기 (재시도 로직 포함)"""
+    server = _connect(mail, appPw, max_retries)
+
     status, messages = server.search(None, f'(FROM "{from_email}")')
     mail_ids = messages[0].split()
 
@@ -59,3 +67,122 @@ def getAuthNumber(mail, appPw, from_email, max_retries=3):
 
     code = _extract_code(str(subject))
     return code, received_at
+
+
+def _latest_code_since(server, from_email, not_before):
+    """not_before 이후 도착한 최신 인증 메일의 (code, received_at), 없으면 None.
+
+    SINCE(일 단위)로 범위를 좁힌 UID SEARCH 후, 가장 최근 UID 하나만
+    INTERNALDATE + Subject 헤더로 한 번에 FETCH 한다 (본문은 받지 않음).
+    """
+    # SINCE는 서버 시간대 기준 날짜 비교라 하루 여유를 둔다 (정확한 비교는 INTERNALDATE로)
+    since_date = not_before - timedelta(days=1)
+    since = f"{since_date.day:02d}-{_MONTHS[since_date.month - 1]}-{since_date.year}"
+    _, data = server.uid("SEARCH", None, f'(FROM "{from_email}" SINCE {since})')
+    uids = data[0].split() if data and data[0] else []
+    if not uids:
+        return None
+
+    _, data = server.uid("FETCH", uids[-1], "(INTERNALDATE BODY.PEEK[HEADER.FIELDS (SUBJECT)])")
+    fetched = next((part for part in data if isinstance(part, tuple)), None)
+    if fetched is None:
+        return None
+
+    received_at = _parse_internal_date(fetched)
+    if received_at < not_before:
+        return None
+    header = email.message_from_bytes(fetched[1])
+    subject = make_header(decode_header(header.get("Subject", "")))
+    return _extract_code(str(subject)), received_at
+
+
+def _readline(server):
+    """응답 한 줄. 빈 바이트(EOF)는 연결 끊김으로 보고 abort를 던진다 (무한 대기/바쁜 루프 방지)."""
+    line = server.readline()
+    if not line:
+        raise imaplib.IMAP4.abort("IMAP 연결이 끊겼습니다")
+    return line
+
+
+def _idle(server, timeout):
+    """IMAP IDLE로 최대 timeout초 대기. 새 메일(EXISTS) 알림이 오면 True.
+
+    IDLE을 지원하지 않는 서버면 imaplib.IMAP4.error를,
+    연결이 끊기면 imaplib.IMAP4.abort를 던진다.
+    """
+    tag = f"idle{next(_IDLE_TAGS)}".encode()
+    server.send(tag + b" IDLE\r\n")
+    response = _readline(server)
+    if not response.startswith(b"+"):
+        raise imaplib.IMAP4.error(f"IDLE 미지원: {response!r}")
+
+    sock = server.socket()
+    deadline = time.monotonic() + timeout
+    notified = False
+    while not notified:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        pending = getattr(sock, "pending", lambda: 0)()
+        if not pending:
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                break
+        notified = b"EXISTS" in _readline(server)
+
+    server.send(b"DONE\r\n")
+    while not _readline(server).startswith(tag):
+        pass
+    return notified
+
+
+def _shutdown(server):
+    """끊긴 연결 정리 (실패는 무시)"""
+    try:
+        server.shutdown()
+    except (imaplib.IMAP4.error, OSError):
+        pass
+
+
+def wait_for_auth_code(mail, appPw, from_email, not_before, timeout=65, idle_slice=10):
+    """IMAP 연결 하나를 유지하며 not_before 이후 도착한 인증 코드를 기다린다.
+
+    IDLE 푸시 알림을 받으면 바로 확인하고, idle_slice초마다 한 번씩은
+    알림과 무관하게 재확인한다. IDLE 미지원 서버이거나 IDLE 중 연결이 끊기면
+    (끊긴 경우 재접속 후) NOOP + 재검색으로 대신한다.
+
+    Returns:
+        (code, received_at)
+    """
+    server = _connect(mail, appPw)
+    deadline = time.monotonic() + timeout
+    use_idle = True
+    try:
+        while True:
+            found = _latest_code_since(server, from_email, not_before)
+            if found:
+                return found
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("인증 메일 대기 시간 초과")
+            wait = min(idle_slice, remaining)
+            if use_idle:
+                try:
+                    _idle(server, wait)
+                    continue
+                except imaplib.IMAP4.abort:
+                    # 연결이 끊김: 새로 접속해 폴링으로 이어간다
+                    use_idle = False
+                    _shutdown(server)
+                    server = _connect(mail, appPw)
+                    continue
+                except imaplib.IMAP4.error:
+                    use_idle = False
+            time.sleep(min(1, wait))
+            server.noop()
+    finally:
+        try:
+            server.close()
+            server.logout()
+        except (imaplib.IMAP4.error, OSError):
+            pass
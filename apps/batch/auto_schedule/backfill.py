@@ -0,0 +1,93 @@
+"""
+Checkpoint journal for historical backfills (--from/--to).
+
+A backfill walks a long range (months, a whole year) in fixed windows
+that are synced in parallel. Every finished window is appended to a
+JSON-lines journal as soon as it completes, so an interrupted run only
+re-does the windows that have no "done" line yet. Each window owns the
+attendances that start inside it, which keeps parallel windows from
+touching each other's records.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+
+class BackfillJournal:
+    """Append-only JSON-lines file of finished (and failed) backfill windows."""
+
+    def __init__(self, path: Path, scope: str):
+        """
+        Initialize backfill journal.
+
+        Args:
+            path: Journal file path (e.g., <base_dir>/backfill_journal.jsonl)
+            scope: Identifies the target (API URL, account, team); lines
+                   written for another scope are ignored
+        """
+        self.path = Path(path)
+        self.scope = scope
+        self._lock = threading.Lock()
+        self.completed: dict[tuple[str, str], dict[str, Any]] = self._read()
+
+    def _read(self) -> dict[tuple[str, str], dict[str, Any]]:
+        completed: dict[tuple[str, str], dict[str, Any]] = {}
+        if not self.path.exists():
+            return completed
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            print(f"[backfill] 체크포인트 파일을 읽을 수 없어 처음부터 진행합니다: {e}")
+            return completed
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 중단 중에 잘린 마지막 줄
+            if entry.get("scope") != self.scope:
+                continue
+            window = (entry.get("start_date"), entry.get("end_date"))
+            if entry.get("status") == "done":
+                completed[window] = entry
+            else:
+                completed.pop(window, None)
+        return completed
+
+    def is_done(self, start_date: str, end_date: str) -> bool:
+        return (start_date, end_date) in self.completed
+
+    def record(self, start_date: str, end_date: str, status: str, **fields: Any) -> None:
+        """
+        Append one window result and flush it to disk.
+
+        Args:
+            start_date: Window start (YYYY-MM-DD)
+            end_date: Window end (YYYY-MM-DD)
+            status: "done" (skipped on resume) or "failed" (retried on resume)
+            **fields: Extra values to keep (stats, events, seconds, ...)
+        """
+        entry = {
+            "scope": self.scope,
+            "start_date": start_date,
+            "end_date": end_date,
+            "status": status,
+            **fields,
+            "at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                print(f"[backfill] ⚠️  체크포인트 기록 실패 ({start_date} ~ {end_date}): {e}")
+                return
+            if status == "done":
+                self.completed[(start_date, end_date)] = entry
+            else:
+                self.completed.pop((start_date, end_date), None)
@@ -0,0 +1,123 @@
+"""
+Change detection between syncs.
+
+Each member's bracket schedules are reduced to the attendance keys they
+would be written as (see sync_plan.attendance_key), sorted and hashed.
+The run fingerprint is the hash of all member hashes plus the window.
+The last successful sync is kept in a small JSON state file together
+with the backend's attendance count for the window, so an unchanged
+calendar can be skipped without any write traffic and a changed one can
+be limited to the users of the members whose hash moved.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+from sync_plan import attendance_key
+
+
+def _digest(parts: list[str]) -> str:
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class ScheduleFingerprint:
+    """Accumulates per-member hashes while the schedule stream is consumed."""
+
+    def __init__(self):
+        self._keys: dict[str, list[str]] = defaultdict(list)
+        self._users: dict[str, set[str]] = defaultdict(set)
+
+    def add(self, member_id: Optional[str], payload: dict[str, Any]) -> None:
+        """등록될 payload 한 건 반영 (memberId별로 묶음)"""
+        member = member_id or ""
+        self._keys[member].append("\x1f".join(attendance_key(payload)))
+        self._users[member].add(payload["userId"])
+
+    def members(self) -> dict[str, dict[str, Any]]:
+        """{memberId: {"hash", "users"}} (상태 파일 형식)"""
+        return {
+            member: {"hash": _digest(sorted(keys)), "users": sorted(self._users[member])}
+            for member, keys in self._keys.items()
+        }
+
+    def digest(self, start_date: str, end_date: str) -> str:
+        """기간 + 팀원별 해시 전체의 해시"""
+        members = self.members()
+        return _digest([start_date, end_date] + [f"{m}={members[m]['hash']}" for m in sorted(members)])
+
+
+class SyncState:
+    """JSON file holding the fingerprint and result of the last successful sync."""
+
+    def __init__(self, path: Path, scope: str):
+        """
+        Initialize sync state.
+
+        Args:
+            path: State file path (e.g., <base_dir>/sync_state.json)
+            scope: Identifies the target (API URL, account, mode); a state
+                   written for another scope is ignored
+        """
+        self.path = Path(path)
+        self.scope = scope
+        self.last: dict[str, Any] = self._read()
+
+    def _read(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[state] 동기화 상태 파일을 읽을 수 없어 무시합니다: {e}")
+            return {}
+        return data if data.get("scope") == self.scope else {}
+
+    def same_window(self, start_date: str, end_date: str) -> bool:
+        return (self.last.get("start_date"), self.last.get("end_date")) == (start_date, end_date)
+
+    def changed_users(self, members: dict[str, dict[str, Any]]) -> set[str]:
+        """
+        해시가 바뀐(추가/삭제 포함) 팀원의 이전/현재 사용자 id.
+
+        같은 사용자가 다른 팀원 캘린더에도 있을 수 있으므로 호출부는 이 사용자들의
+        일정 전체를 다시 맞춰야 한다.
+        """
+        previous = self.last.get("members", {})
+        users: set[str] = set()
+        for member in previous.keys() | members.keys():
+            before, after = previous.get(member), members.get(member)
+            if (before or {}).get("hash") != (after or {}).get("hash"):
+                users.update((before or {}).get("users", ()))
+                users.update((after or {}).get("users", ()))
+        return users
+
+    def save(
+        self,
+        start_date: str,
+        end_date: str,
+        fingerprint: str,
+        members: dict[str, dict[str, Any]],
+        count: int,
+        result: dict[str, int],
+    ) -> None:
+        """성공한 동기화 결과 기록 (원자적 교체)"""
+        self.last = {
+            "scope": self.scope,
+            "start_date": start_date,
+            "end_date": end_date,
+            "fingerprint": fingerprint,
+            "members": members,
+            "count": count,
+            "result": result,
+            "synced_at": time.time(),
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps(self.last, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[state] 동기화 상태 저장 실패: {e}")
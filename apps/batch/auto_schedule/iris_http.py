@@ -0,0 +1,149 @@
+"""
+Browser-free IRIS login over plain HTTP.
+
+Replays the same steps the Selenium flow performs in Chrome: submit the
+IRIS login form, request the 2FA mail, submit the code and follow the
+Schedule menu SSO hop to calendar.worksmobile.com. Endpoints that the
+login page does not expose in HTML (the 2FA request/verify calls made by
+JavaScript) come from the [iris_http] section, recorded once from the
+browser's network tab.
+"""
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from typing import Callable, Optional
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import instrument_session
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36"
+)
+
+
+class IrisHttpLoginError(RuntimeError):
+    """HTTP 로그인 흐름이 예상과 다를 때 (브라우저 로그인으로 대체)"""
+
+
+class _PageParser(HTMLParser):
+    """로그인 form의 action/hidden 값과 일정 메뉴 링크 추출"""
+
+    def __init__(self, form_id: str):
+        super().__init__()
+        self.form_id = form_id
+        self.form_action: Optional[str] = None
+        self.form_fields: dict[str, str] = {}
+        self.schedule_href: Optional[str] = None
+        self._in_form = False
+        self._in_schedule_menu = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form" and attrs.get("id") == self.form_id:
+            self._in_form = True
+            self.form_action = attrs.get("action") or ""
+        elif tag == "input" and self._in_form and attrs.get("name"):
+            self.form_fields[attrs["name"]] = attrs.get("value") or ""
+        elif tag == "li" and attrs.get("data-menu-alias") == "Schedule":
+            self._in_schedule_menu = True
+        elif tag == "a" and self._in_schedule_menu and self.schedule_href is None:
+            self.schedule_href = attrs.get("href")
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._in_form = False
+        elif tag == "li":
+            self._in_schedule_menu = False
+
+
+def _parse(html: str, form_id: str = "frm") -> _PageParser:
+    parser = _PageParser(form_id)
+    parser.feed(html)
+    return parser
+
+
+def _new_session() -> requests.Session:
+    session = instrument_session(requests.Session(), "iris")
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"user-agent": USER_AGENT})
+    return session
+
+
+def login(settings: dict, fetch_auth_code: Callable[[datetime], str]) -> list:
+    """
+    IRIS 로그인 + 2차 인증 + 캘린더 SSO를 HTTP로 수행.
+
+    Args:
+        settings: _load_settings() 결과 (iris_http_* 키 사용)
+        fetch_auth_code: not_before를 받아 2차 인증 코드를 돌려주는 함수
+
+    Returns:
+        calendar.worksmobile.com 쿠키 목록 (Selenium get_cookies() 형식)
+
+    Raises:
+        IrisHttpLoginError: 흐름이 기록된 것과 다를 때
+    """
+    session = _new_session()
+    timeout = settings["iris_http_timeout"]
+    login_url = settings["iris_http_login_url"]
+
+    # 1. 로그인 페이지에서 form action / hidden 값 수집
+    response = session.get(login_url, timeout=timeout)
+    response.raise_for_status()
+    page = _parse(response.text)
+    if page.form_action is None:
+        raise IrisHttpLoginError("로그인 form(#frm)을 찾을 수 없습니다")
+    form = dict(page.form_fields)
+    form[settings["iris_http_id_field"]] = settings["iris_id"]
+    form[settings["iris_http_password_field"]] = settings["iris_password"]
+
+    response = session.post(urljoin(response.url, page.form_action), data=form, timeout=timeout)
+    response.raise_for_status()
+    print("[iris-http] 로그인 form 제출 완료")
+
+    # 2. 2차 인증 메일 요청 → 코드 입력
+    request_url = settings["iris_http_auth_request_url"]
+    verify_url = settings["iris_http_auth_verify_url"]
+    if not request_url or not verify_url:
+        raise IrisHttpLoginError("[iris_http] auth_request_url / auth_verify_url 설정이 필요합니다")
+
+    request_timestamp = datetime.now(timezone.utc)
+    session.post(urljoin(login_url, request_url), timeout=timeout).raise_for_status()
+    print("[iris-http] 2차 인증 메일 요청 완료")
+
+    auth_num = fetch_auth_code(request_timestamp)
+    response = session.post(
+        urljoin(login_url, verify_url),
+        data={settings["iris_http_auth_code_field"]: auth_num},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    print("[iris-http] 2차 인증번호 제출 완료")
+
+    # 3. 일정 메뉴 SSO → calendar.worksmobile.com
+    schedule_url = settings["iris_http_schedule_url"]
+    if not schedule_url:
+        portal = session.get(urljoin(login_url, "/"), timeout=timeout)
+        portal.raise_for_status()
+        schedule_url = _parse(portal.text).schedule_href
+        if not schedule_url:
+            raise IrisHttpLoginError("일정 메뉴 링크를 찾을 수 없습니다 (2차 인증 실패?)")
+
+    response = session.get(urljoin(login_url, schedule_url), timeout=timeout)
+    response.raise_for_status()
+    if "calendar.worksmobile.com" not in response.url:
+        raise IrisHttpLoginError(f"SSO 후 캘린더로 이동하지 않았습니다: {response.url}")
+    print(f"[iris-http] 캘린더 SSO 완료: {response.url}")
+
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        for c in session.cookies
+        if "worksmobile.com" in c.domain
+    ]
+    session.close()
+    return cookies
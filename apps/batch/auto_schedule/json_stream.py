@@ -0,0 +1,126 @@
+"""
+Incremental parser for JSON arrays delivered in chunks.
+
+memberScheduleViewList returns one top-level array with an object per
+member. iter_json_array yields each member as soon as its closing brace
+has arrived, so only one member (plus the unread tail of the socket
+buffer) is held in memory at a time.
+"""
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\r\n"
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[ \t\r\n,\]}]")
+
+
+def _element_end(buffer: str, start: int, scan: dict) -> int | None:
+    """
+    Find where the element starting at buffer[start] ends, without decoding it.
+
+    Only the characters that arrived since the previous call are scanned
+    (progress is kept in scan, relative to start), so an element spread
+    over many chunks is scanned once in total instead of re-decoded per chunk.
+
+    Returns:
+        Index just past the element, or None if it has not fully arrived
+    """
+    if buffer[start] not in '{["':
+        # 숫자/true/false/null: 뒤에 구분자가 와야 끝난 것 ("2." 다음에 "5"가 올 수 있음)
+        match = _SCALAR_END.search(buffer, start + max(1, scan["offset"]))
+        if match is not None:
+            return match.start()
+        scan["offset"] = len(buffer) - start
+        return None
+
+    pos, depth, in_string = start + scan["offset"], scan["depth"], scan["in_string"]
+    while True:
+        if in_string:
+            match = _STRING_SPECIAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            if match.group() == "\\":
+                if match.end() == len(buffer):
+                    pos = match.start()  # 이스케이프 대상 문자가 아직 안 옴
+                    break
+                pos = match.end() + 1
+                continue
+            in_string, pos = False, match.end()
+            if depth == 0:
+                return pos
+            continue
+        match = _STRUCTURAL.search(buffer, pos)
+        if match is None:
+            pos = len(buffer)
+            break
+        char, pos = match.group(), match.end()
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+    scan.update(offset=pos - start, depth=depth, in_string=in_string)
+    return None
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array from a byte stream.
+
+    Args:
+        chunks: Raw response bytes (e.g. response.iter_content(65536))
+
+    Raises:
+        ValueError: If the stream is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    state = {"buffer": "", "started": False, "finished": False}
+    fresh_scan = {"offset": 0, "depth": 0, "in_string": False}
+    scan = dict(fresh_scan)
+
+    def _skip(buffer: str, pos: int) -> int:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def _drain(final: bool) -> Iterator[Any]:
+        buffer = state["buffer"]
+        pos = _skip(buffer, 0)
+        if not state["started"] and pos < len(buffer):
+            if buffer[pos] != "[":
+                raise ValueError("JSON array expected")
+            state["started"] = True
+            pos = _skip(buffer, pos + 1)
+
+        while state["started"] and pos < len(buffer):
+            if buffer[pos] == "]":
+                state["finished"] = True
+                pos = len(buffer)
+                break
+            if buffer[pos] == ",":
+                pos = _skip(buffer, pos + 1)
+                continue
+            if not final and _element_end(buffer, pos, scan) is None:
+                break  # 요소가 아직 다 도착하지 않음 → 다음 청크 대기 (재디코딩 없음)
+            item, end = decoder.raw_decode(buffer, pos)
+            scan.update(fresh_scan)
+            yield item
+            pos = _skip(buffer, end)
+        state["buffer"] = buffer[pos:]
+
+    for chunk in chunks:
+        state["buffer"] += utf8.decode(chunk)
+        yield from _drain(final=False)
+
+    state["buffer"] += utf8.decode(b"", final=True)
+    yield from _drain(final=True)
+    if not state["finished"]:
+        raise ValueError("JSON array ended unexpectedly")
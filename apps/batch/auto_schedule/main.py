@@ -1,23 +1,53 @@
+import argparse
 import configparser
+import itertools
+import json
 import os
+import signal
 import sys
+import threading
 import time
-from datetime import datetime, timedelta, timezone
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 import requests
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+# Selenium(브라우저 로그인)과 IMAP(auth, 2차 인증 메일)은 로그인이 실제로 필요할 때만
+# 함수 안에서 import한다. 캐시된 세션으로 도는 실행과 plan/resume은 이 모듈들을 읽지 않는다.
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
 
-import auth
 from api_client import APIClient
+from backfill import BackfillJournal
+from fingerprint import ScheduleFingerprint, SyncState
+from json_stream import iter_json_array
+from metadata_cache import MetadataCache
+from metrics import instrument_session, metrics, span
+from rate_limiter import AdaptiveTokenBucket
+from retry_policy import TRANSIENT_ERRORS, CircuitBreaker, RetryPolicy
+from schedule_parser import parse_schedule
+from scheduler import CronSchedule, next_run
+from session_cache import SessionCache
+from sync_journal import SyncJournal
+from sync_plan import attendance_key, plan_sync
+from transport import configure_session, enable_http2
+from user_index import UserIndex
 
 CONFIG_FILENAME = os.getenv("AUTO_LOGIN_CONFIG", "config.ini")
 
+# 일정 타입 -> AttendanceType code (config.ini [mapping]으로 추가/변경/삭제 가능)
+DEFAULT_TYPE_MAPPING = {
+    "휴가": "ANNUAL",
+    "반차": "ANNUAL",
+    "반반차": "ANNUAL",
+    "출장": "BUSINESS_TRIP",
+    "외근": "BUSINESS_TRIP",
+}
+
 
 def _base_dir() -> Path:
     if getattr(sys, "frozen", False):
@@ -39,6 +69,12 @@ def _required(config: configparser.ConfigParser, section: str, option: str) -> s
     return value
 
 
+def _optional_path(value: str) -> Path | None:
+    """빈 값이면 None, 상대 경로는 실행 파일 기준"""
+    value = value.strip()
+    return _base_dir() / value if value else None
+
+
 def _load_settings() -> dict:
     config_path = _config_path()
     parser = configparser.ConfigParser()
@@ -46,7 +82,29 @@ def _load_settings() -> dict:
     if not read_files:
         raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {config_path}")
 
-    return {
+    sync_mode = parser.get("api", "sync_mode", fallback="reconcile").strip().lower()
+    if sync_mode not in ("reconcile", "replace"):
+        raise RuntimeError(f"[api] sync_mode 값이 올바르지 않습니다: {sync_mode} (reconcile/replace)")
+
+    login_mode = parser.get("selenium", "login_mode", fallback="browser").strip().lower()
+    if login_mode not in ("browser", "http"):
+        raise RuntimeError(f"[selenium] login_mode 값이 올바르지 않습니다: {login_mode} (browser/http)")
+
+    daemon_cron = parser.get("daemon", "cron", fallback="").strip()
+    try:
+        daemon_schedule = CronSchedule(daemon_cron) if daemon_cron else None
+    except ValueError as e:
+        raise RuntimeError(f"[daemon] cron 값이 올바르지 않습니다: {e}") from e
+
+    # [mapping] 일정 타입 = AttendanceType code (빈 값이면 기본 매핑에서 제외)
+    type_mapping = dict(DEFAULT_TYPE_MAPPING)
+    if parser.has_section("mapping"):
+        for schedule_type, code in parser.items("mapping"):
+            type_mapping.pop(schedule_type, None)
+            if code.strip():
+                type_mapping[schedule_type] = code.strip()
+
+    settings = {
         "config_path": config_path,
         "iris_id": _required(parser, "iris", "id"),
         "iris_password": _required(parser, "iris", "password"),
@@ -57,12 +115,128 @@ def _load_settings() -> dict:
         "auth_initial_delay": parser.getint("auth", "initial_delay", fallback=5),
         "auth_poll_delay": parser.getint("auth", "poll_delay", fallback=5),
         "auth_poll_retries": parser.getint("auth", "poll_retries", fallback=12),
+        "auth_idle": parser.getboolean("auth", "idle", fallback=True),
         "headless": parser.getboolean("selenium", "headless", fallback=False),
+        "login_mode": login_mode,
+        # HTTP 로그인 (login_mode = http) - 브라우저 네트워크 탭에서 기록한 값
+        "iris_http_login_url": parser.get("iris_http", "login_url", fallback="https://iris.dongkuk.com/").strip(),
+        "iris_http_id_field": parser.get("iris_http", "id_field", fallback="id").strip(),
+        "iris_http_password_field": parser.get("iris_http", "password_field", fallback="password").strip(),
+        "iris_http_auth_request_url": parser.get("iris_http", "auth_request_url", fallback="").strip(),
+        "iris_http_auth_verify_url": parser.get("iris_http", "auth_verify_url", fallback="").strip(),
+        "iris_http_auth_code_field": parser.get("iris_http", "auth_code_field", fallback="number1").strip(),
+        "iris_http_schedule_url": parser.get("iris_http", "schedule_url", fallback="").strip(),
+        "iris_http_timeout": parser.getint("iris_http", "timeout", fallback=15),
         # API 설정
         "api_base_url": _required(parser, "api", "base_url"),
         "api_email": _required(parser, "api", "email"),
         "api_password": _required(parser, "api", "password"),
+        "api_concurrency": max(1, parser.getint("api", "concurrency", fallback=4)),
+        "api_pool_size": max(1, parser.getint("api", "pool_size", fallback=0) or parser.getint("api", "concurrency", fallback=4)),
+        "api_connect_timeout": parser.getfloat("api", "connect_timeout", fallback=5.0),
+        "api_read_timeout": parser.getfloat("api", "read_timeout", fallback=10.0),
+        "api_bulk_read_timeout": parser.getfloat("api", "bulk_read_timeout", fallback=30.0),
+        "api_compress_min_bytes": max(0, parser.getint("api", "compress_min_bytes", fallback=8192)),
+        "api_page_size": min(1000, max(0, parser.getint("api", "page_size", fallback=500))),
+        "api_rate_limit": parser.getfloat("api", "rate_limit", fallback=10.0),
+        "api_sync_mode": sync_mode,
+        "api_bulk": parser.getboolean("api", "bulk", fallback=True),
+        "api_bulk_chunk_size": max(1, parser.getint("api", "bulk_chunk_size", fallback=200)),
+        "api_skip_unchanged": parser.getboolean("api", "skip_unchanged", fallback=True),
+        "api_retries": max(1, parser.getint("api", "retries", fallback=4)),
+        "api_retry_base_delay": parser.getfloat("api", "retry_base_delay", fallback=0.5),
+        "api_retry_max_delay": parser.getfloat("api", "retry_max_delay", fallback=30.0),
+        "api_breaker_failures": max(1, parser.getint("api", "breaker_failures", fallback=5)),
+        "api_breaker_reset_seconds": parser.getfloat("api", "breaker_reset_seconds", fallback=30.0),
+        "type_mapping": type_mapping,
+        # 캘린더 조회 설정
+        "calendar_member_chunk_size": parser.getint("calendar", "member_chunk_size", fallback=50),
+        "calendar_window_days": parser.getint("calendar", "window_days", fallback=14),
+        "calendar_workers": max(1, parser.getint("calendar", "workers", fallback=4)),
+        "calendar_timeout": (
+            parser.getfloat("calendar", "connect_timeout", fallback=5.0),
+            parser.getfloat("calendar", "timeout", fallback=30.0),
+        ),
+        "calendar_pool_size": max(1, parser.getint("calendar", "pool_size", fallback=0) or parser.getint("calendar", "workers", fallback=4)),
+        "calendar_http2": parser.getboolean("calendar", "http2", fallback=False),
+        "calendar_retries": max(1, parser.getint("calendar", "retries", fallback=3)),
+        # 세션 캐시 설정
+        "cache_enabled": parser.getboolean("cache", "enabled", fallback=True),
+        "cache_path": _base_dir() / parser.get("cache", "path", fallback="session_cache.bin"),
+        "cache_key": parser.get("cache", "key", fallback="").strip() or None,
+        "cache_calendar_ttl": parser.getint("cache", "calendar_ttl_minutes", fallback=120),
+        "cache_metadata_path": _base_dir() / parser.get("cache", "metadata_path", fallback="metadata_cache.json"),
+        "cache_metadata_ttl": parser.getint("cache", "metadata_ttl_minutes", fallback=60),
+        "cache_state_path": _base_dir() / parser.get("cache", "state_path", fallback="sync_state.json"),
+        "cache_journal_path": _optional_path(parser.get("cache", "journal_path", fallback="sync_journal.jsonl")),
+        # 상주 모드 (--daemon) 설정
+        "daemon_interval_minutes": max(1, parser.getint("daemon", "interval_minutes", fallback=10)),
+        "daemon_cron": daemon_schedule,
+        "daemon_jitter_seconds": max(0, parser.getint("daemon", "jitter_seconds", fallback=60)),
+        "daemon_keepalive_minutes": max(1, parser.getint("daemon", "keepalive_minutes", fallback=15)),
+        "daemon_token_renew_minutes": max(1, parser.getint("daemon", "token_renew_minutes", fallback=10)),
+        # 과거 기간 백필 (--from/--to) 설정
+        "backfill_window_days": max(1, parser.getint("backfill", "window_days", fallback=7)),
+        "backfill_workers": max(1, parser.getint("backfill", "workers", fallback=2)),
+        "backfill_journal_path": _base_dir() / parser.get("backfill", "journal_path", fallback="backfill_journal.jsonl"),
+        # 실행 지표 (빈 값이면 끔)
+        "metrics_json_log": _optional_path(parser.get("metrics", "json_log", fallback="")),
+        "metrics_textfile": _optional_path(parser.get("metrics", "textfile", fallback="")),
+        # 사용자 매칭 설정
+        "users_index_path": _base_dir() / parser.get("users", "index_path", fallback="user_index.json"),
+        "users_aliases": dict(parser.items("aliases")) if parser.has_section("aliases") else {},
+        "users_members": dict(parser.items("members")) if parser.has_section("members") else {},
     }
+    settings["teams"] = _load_teams(parser, settings)
+    return settings
+
+
+def _load_teams(parser: configparser.ConfigParser, settings: dict) -> list[dict]:
+    """
+    [team:<이름>] 섹션 -> 팀 프로필 목록 (섹션이 없으면 [api] 설정 그대로 한 팀).
+
+    팀마다 백엔드 계정/동기화 방식과 캘린더 팀원 범위(members: memberId 또는 이름, 쉼표 구분)를
+    따로 두고, 캘린더 로그인 세션은 모든 팀이 공유한다. 값을 생략하면 [api] 설정을 쓰고,
+    사용자 인덱스/동기화 상태 파일은 팀 이름을 붙여 분리한다.
+
+    Raises:
+        RuntimeError: 두 팀이 같은 백엔드 계정(base_url + email)을 쓰는 경우. 근태 조회는
+            로그인 계정의 팀 범위라서, 서로 상대 팀 근태를 "캘린더에 없음"으로 보고 삭제한다.
+    """
+    teams = []
+    accounts: dict[tuple[str, str], str] = {}
+    for section in parser.sections():
+        if not section.startswith("team:"):
+            continue
+        name = section.split(":", 1)[1].strip()
+        if not name:
+            raise RuntimeError(f"[{section}] 팀 이름이 비어 있습니다")
+        sync_mode = parser.get(section, "sync_mode", fallback=settings["api_sync_mode"]).strip().lower()
+        if sync_mode not in ("reconcile", "replace"):
+            raise RuntimeError(f"[{section}] sync_mode 값이 올바르지 않습니다: {sync_mode} (reconcile/replace)")
+        members = parser.get(section, "members", fallback="")
+        base_url = parser.get(section, "base_url", fallback=settings["api_base_url"]).strip()
+        email = parser.get(section, "email", fallback=settings["api_email"]).strip()
+        account = (base_url.rstrip("/").casefold(), email.casefold())
+        if account in accounts:
+            raise RuntimeError(
+                f"[{section}] [team:{accounts[account]}]와 같은 백엔드 계정({email})을 씁니다 - "
+                "팀마다 다른 계정(email)을 지정하세요"
+            )
+        accounts[account] = name
+        teams.append({
+            "team_name": name,
+            "team_members": [member.strip() for member in members.split(",") if member.strip()],
+            "api_base_url": base_url,
+            "api_email": email,
+            "api_password": parser.get(section, "password", fallback=settings["api_password"]).strip(),
+            "api_sync_mode": sync_mode,
+            "users_index_path": _base_dir() / f"user_index.{name}.json",
+            "cache_state_path": _base_dir() / f"sync_state.{name}.json",
+            "backfill_journal_path": _base_dir() / f"backfill_journal.{name}.jsonl",
+            "cache_journal_path": _base_dir() / f"sync_journal.{name}.jsonl" if settings["cache_journal_path"] else None,
+        })
+    return teams or [{"team_name": "default", "team_members": []}]
 
 
 def _fetch_auth_code(
@@ -73,8 +247,28 @@ def _fetch_auth_code(
     initial_delay: int,
     retries: int,
     delay: int,
+    idle: bool = True,
 ) -> str:
-    """Poll Gmail until a mail newer than `not_before` arrives."""
+    """Wait until a mail newer than `not_before` arrives.
+
+    idle=True keeps one IMAP connection open and returns as soon as the
+    server pushes the new mail (IDLE). The overall budget is the same as
+    the polling mode: initial_delay + retries * delay seconds.
+    """
+    import auth
+
+    if idle:
+        timeout = initial_delay + retries * delay
+        print(f"[auth] 새 인증 메일 대기 시작 (IMAP IDLE, 최대 {timeout}s)")
+        try:
+            code, received_at = auth.wait_for_auth_code(
+                email, app_password, from_email, not_before, timeout=timeout
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError("새로운 2차 인증 메일을 확인하지 못했습니다.") from exc
+        print(f"[auth] 새 메일 감지 ({received_at.astimezone(timezone.utc).isoformat()})")
+        return code
+
     last_error: Exception | None = None
     print(
         f"[auth] 새 인증 메일 대기 시작 "
@@ -102,6 +296,21 @@ def _fetch_auth_code(
     raise RuntimeError("새로운 2차 인증 메일을 확인하지 못했습니다.")
 
 
+def _fetch_settings_auth_code(settings: dict, not_before: datetime) -> str:
+    """설정 파일의 [auth] 값으로 _fetch_auth_code 호출"""
+    with span("auth.fetch_code", mode="idle" if settings["auth_idle"] else "poll"):
+        return _fetch_auth_code(
+            settings["auth_email"],
+            settings["auth_app_password"],
+            settings["auth_from_email"],
+            not_before=not_before,
+            initial_delay=settings["auth_initial_delay"],
+            retries=settings["auth_poll_retries"],
+            delay=settings["auth_poll_delay"],
+            idle=settings["auth_idle"],
+        )
+
+
 def _get_date_range() -> tuple[str, str]:
     """이번주 월요일부터 다음주 일요일까지 반환"""
     today = datetime.now()
@@ -115,11 +324,16 @@ def _get_date_range() -> tuple[str, str]:
     )
 
 
-def _create_calendar_session(driver: webdriver.Chrome) -> requests.Session:
-    """Selenium 쿠키로 requests 세션 생성"""
-    session = requests.Session()
-    for cookie in driver.get_cookies():
-        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""))
+def _create_calendar_session(cookies: list, pool_size: int = 10) -> requests.Session:
+    """Selenium 쿠키(또는 캐시된 쿠키 목록)로 requests 세션 생성 (keep-alive 풀, 압축 응답)"""
+    session = configure_session(instrument_session(requests.Session(), "calendar"), pool_size)
+    for cookie in cookies:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+        )
     return session
 
 
@@ -134,7 +348,7 @@ def _get_calendar_headers() -> dict:
     }
 
 
-def _fetch_member_list(session: requests.Session) -> list:
+def _fetch_member_list(session: requests.Session, timeout: float | tuple[float, float] = (5.0, 30.0)) -> list:
     """팀원 목록 동적 조회"""
     url = "https://calendar.worksmobile.com/api/individualUserList"
     payload = {
@@ -143,225 +357,641 @@ def _fetch_member_list(session: requests.Session) -> list:
         "includeDefaultGroup": True,
         "includeDomainCalendar": False,
     }
-    response = session.post(url, headers=_get_calendar_headers(), json=payload)
+    response = session.post(url, headers=_get_calendar_headers(), json=payload, timeout=timeout)
     response.raise_for_status()
     data = response.json()
     return data.get("userInfoList", [])
 
 
-def _fetch_team_schedule(driver: webdriver.Chrome) -> list:
-    """Selenium 쿠키로 캘린더 일정 조회"""
-    session = _create_calendar_session(driver)
+def _probe_calendar_session(
+    session: requests.Session, timeout: float | tuple[float, float] = (5.0, 30.0)
+) -> list | None:
+    """세션이 살아있는지 확인 겸 팀원 목록 조회 (거부되면 None)"""
+    try:
+        return _fetch_member_list(session, timeout)
+    except (requests.RequestException, ValueError) as e:
+        print(f"[calendar] 캐시된 세션 거부됨: {e}")
+        return None
+
+
+def _select_members(member_list: list, selectors: list[str]) -> list:
+    """팀 프로필의 members(memberId 또는 이름)에 해당하는 팀원만 (비어 있으면 전체)"""
+    if not selectors:
+        return member_list
+    wanted = set(selectors)
+    selected = [m for m in member_list if m.get("memberId") in wanted or m.get("name") in wanted]
+    missing = wanted - {m.get("memberId") for m in selected} - {m.get("name") for m in selected}
+    if missing:
+        print(f"[teams] ⚠️  캘린더 세션에서 볼 수 없는 팀원 (권한 확인 필요): {', '.join(sorted(missing))}")
+    return selected
+
+
+def _split_date_range(view_from: str, view_until: str, window_days: int) -> list[tuple[str, str]]:
+    """조회 기간을 window_days 일 단위 구간으로 분할 ("YYYY-MM-DD HH:MM" 형식 유지)"""
+    start = datetime.strptime(view_from, "%Y-%m-%d %H:%M")
+    end = datetime.strptime(view_until, "%Y-%m-%d %H:%M")
+    windows = []
+    while start <= end:
+        window_end = min(end, start + timedelta(days=window_days) - timedelta(minutes=1))
+        windows.append((start.strftime("%Y-%m-%d %H:%M"), window_end.strftime("%Y-%m-%d %H:%M")))
+        start = (start + timedelta(days=window_days)).replace(hour=0, minute=0)
+    return windows
+
+
+def _calendar_retry_policy(retries: int) -> RetryPolicy:
+    """
+    캘린더 청크 요청용 재시도 정책 (조회 한 번의 모든 청크가 공유).
 
-    # 1. 팀원 목록 동적 조회
-    member_list = _fetch_member_list(session)
-    print(f"[calendar] 팀원 {len(member_list)}명 조회 완료")
+    잘린 스트림(ValueError)도 재시도하고, 캘린더가 계속 실패하면 차단기가 열려
+    남은 청크가 각자 재시도 대기를 반복하지 않고 바로 실패한다.
+    """
+    return RetryPolicy(
+        "calendar",
+        max_attempts=retries,
+        base_delay=1.0,
+        breaker=CircuitBreaker("calendar"),
+        retry_exceptions=TRANSIENT_ERRORS + (ValueError,),
+    )
 
-    # 2. 일정 조회
-    view_from, view_until = _get_date_range()
-    url = "https://calendar.worksmobile.com/api/memberScheduleViewList"
-    params = {"viewFrom": view_from, "viewUntil": view_until, "rl": "24101"}
-    payload = {"memberList": member_list}
 
-    response = session.post(url, params=params, headers=_get_calendar_headers(), json=payload)
-    response.raise_for_status()
-    return response.json()
+def _fetch_schedule_chunk_events(
+    session: requests.Session,
+    members: list,
+    view_from: str,
+    view_until: str,
+    timeout: float | tuple[float, float],
+    retries: int,
+    policy: RetryPolicy | None = None,
+) -> list:
+    """
+    팀원 일부 × 기간 일부에 대한 memberScheduleViewList 요청 (청크별 타임아웃/재시도).
 
+    응답을 통째로 json()으로 읽지 않고 팀원 단위로 점진 파싱하면서
+    대괄호 일정만 남긴다. 메모리에는 팀원 한 명 분량 + 필터된 일정만 유지된다.
+    """
+    url = "https://calendar.worksmobile.com/api/memberScheduleViewList"
+    params = {"viewFrom": view_from, "viewUntil": view_until, "rl": "24101"}
+    payload = {"memberList": members}
+    attempts = itertools.count(1)
+
+    def _attempt() -> list:
+        with span("calendar.chunk") as fields, session.post(
+            url,
+            params=params,
+            headers=_get_calendar_headers(),
+            json=payload,
+            timeout=timeout,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            received = 0
+
+            def _counted(chunks: Iterable[bytes]) -> Iterator[bytes]:
+                nonlocal received
+                for chunk in chunks:
+                    received += len(chunk)
+                    yield chunk
+
+            members_iter = iter_json_array(_counted(response.iter_content(chunk_size=65536)))
+            events = list(_iter_bracket_events(members_iter))
+            if "Content-Length" not in response.headers:
+                # 스트리밍 응답은 훅에서 크기를 알 수 없으므로 여기서 기록
+                metrics.inc(
+                    "http_response_bytes_total",
+                    received,
+                    component="calendar",
+                    method="POST",
+                    path="/api/memberScheduleViewList",
+                )
+            fields.update(members=len(members), events=len(events), bytes=received, attempt=next(attempts))
+            return events
+
+    policy = policy or _calendar_retry_policy(retries)
+    return policy.call(_attempt, max_attempts=retries, label=f"{view_from} ~ {view_until}, {len(members)}명")
+
+
+def _stream_team_schedule(
+    session: requests.Session,
+    member_list: list,
+    view_from: str | None = None,
+    view_until: str | None = None,
+    member_chunk_size: int = 50,
+    window_days: int = 14,
+    workers: int = 4,
+    timeout: float | tuple[float, float] = (5.0, 30.0),
+    retries: int = 3,
+) -> Iterator[dict]:
+    """
+    대괄호 일정을 팀원/기간 순서대로 흘려보내는 스트림.
 
-def _filter_bracket_schedules(schedule_data: list) -> list:
-    """대괄호로 시작하는 일정만 필터링 (휴가, 출장 등), 교육 제외"""
-    results = []
-    for member in schedule_data:
+    호출 즉시 모든 청크 요청을 워커 풀에 넣으므로, 반환된 제너레이터를
+    소비하기 전(예: 백엔드 로그인/메타데이터 조회 중)에도 다운로드가 진행된다.
+    앞 청크가 끝나는 대로 일정을 내보내며, 기간 경계에 걸친 일정은 한 번만 내보낸다.
+    """
+    if view_from is None or view_until is None:
+        view_from, view_until = _get_date_range()
+    windows = _split_date_range(view_from, view_until, max(1, window_days))
+    size = max(1, member_chunk_size)
+    member_chunks = [member_list[i : i + size] for i in range(0, len(member_list), size)]
+    jobs = [(members, start, end) for start, end in windows for members in member_chunks]
+    print(f"[calendar] 일정 스트리밍 조회: {len(member_chunks)}개 팀원 청크 × {len(windows)}개 기간 = {len(jobs)}건")
+
+    policy = _calendar_retry_policy(retries)
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = [
+        executor.submit(_fetch_schedule_chunk_events, session, members, start, end, timeout, retries, policy)
+        for members, start, end in jobs
+    ]
+    executor.shutdown(wait=False)
+
+    def _events() -> Iterator[dict]:
+        seen = set()
+        try:
+            for future in futures:
+                for event in future.result():
+                    # 반복 일정은 회차마다 scheduleId가 같을 수 있으므로 날짜까지 키에 넣는다
+                    # (경계에 걸쳐 두 기간에서 받은 같은 일정만 중복으로 본다)
+                    key = (
+                        event["memberId"],
+                        event.get("scheduleId"),
+                        event["startDate"],
+                        event["endDate"],
+                        event["summary"],
+                    )
+                    if key not in seen:
+                        seen.add(key)
+                        yield event
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return _events()
+
+
+def _is_bracket_schedule(summary: str) -> bool:
+    """대괄호로 시작하고, 교육이 아닌 것만"""
+    return summary.startswith("[") and not summary.startswith("[교육]")
+
+
+def _iter_bracket_events(members: Iterable[dict]) -> Iterator[dict]:
+    """팀원별 일정에서 대괄호 일정만 하나씩 꺼내는 제너레이터 (휴가, 출장 등), 교육 제외"""
+    for member in members:
         for event in member.get("scheduleViewList", []):
             summary = event.get("summary", "")
-            # 대괄호로 시작하고, 교육이 아닌 것만
-            if summary.startswith("[") and not summary.startswith("[교육]"):
-                results.append({
+            if _is_bracket_schedule(summary):
+                yield {
                     "memberId": member.get("memberId"),
                     "summary": summary,
                     "startDate": event.get("startDate"),
                     "endDate": event.get("endDate"),
                     "scheduleType": event.get("scheduleType"),
-                })
-    return results
-
-
-def _parse_schedule_type(summary: str) -> str:
-    """일정 제목에서 타입 추출 (예: [휴가], [출장])"""
-    if not summary.startswith("["):
-        return ""
-    try:
-        return summary.split("]")[0][1:]  # [휴가] -> 휴가
-    except IndexError:
-        return ""
+                    "scheduleId": event.get("scheduleId"),
+                }
 
 
-def _parse_user_name(summary: str) -> str:
-    """일정 제목에서 사용자 이름 추출 (예: [휴가]-손병진 -> 손병진)"""
-    # 패턴: [타입]내용-이름 또는 [타입]-이름
-    if "-" not in summary:
-        return ""
-    # 마지막 - 뒤의 텍스트가 이름
-    return summary.split("-")[-1].strip()
-
-
-def _parse_schedule_content(summary: str) -> str:
-    """일정 제목에서 내용 추출 (예: [출장]스틸샵 시스템 업무 협의-이경봉 -> 스틸샵 시스템 업무 협의)"""
-    # 패턴: [타입]내용-이름
-    if "]" not in summary or "-" not in summary:
-        return ""
-    
-    # ] 다음부터 마지막 - 전까지 추출
-    try:
-        after_bracket = summary.split("]", 1)[1]  # [출장]스틸샵... -> 스틸샵...
-        # 마지막 - 앞까지가 내용
-        parts = after_bracket.rsplit("-", 1)  # 마지막 -로 split
-        if len(parts) == 2:
-            content = parts[0].strip()
-            return content if content else ""
-    except (IndexError, AttributeError):
-        pass
-    
-    return ""
+def _build_type_table(type_mapping: dict, attendance_types: list) -> dict:
+    """
+    일정 타입 -> AttendanceType id 조회 테이블 생성 (실행당 한 번).
 
+    Args:
+        type_mapping: 설정의 [mapping] (일정 타입 -> AttendanceType code)
+        attendance_types: get_attendance_types() 결과
 
-def _extract_date_only(datetime_str: str) -> str:
-    """날짜/시간 문자열에서 날짜만 추출 (YYYY-MM-DD)"""
-    # "2025-11-13 13:00" -> "2025-11-13"
-    return datetime_str.split()[0] if " " in datetime_str else datetime_str
+    Returns:
+        {일정 타입(casefold): AttendanceType id}
+    """
+    id_by_code = {t["code"]: t["id"] for t in attendance_types}
+    table = {}
+    for schedule_type, code in type_mapping.items():
+        type_id = id_by_code.get(code)
+        if type_id is None:
+            print(f"[registration] ⚠️  [mapping] {schedule_type} = {code}: 존재하지 않는 AttendanceType code")
+            continue
+        table[schedule_type.casefold()] = type_id
+    return table
 
 
-def _map_type_to_attendance_type(schedule_type: str, attendance_types: list) -> str | None:
-    """일정 타입을 AttendanceType code로 매핑"""
-    # 휴가 계열 -> ANNUAL
-    if schedule_type in ["휴가", "반차", "반반차"]:
-        for t in attendance_types:
-            if t["code"] == "ANNUAL":
-                return t["id"]
-    # 출장/외근 -> BUSINESS_TRIP
-    elif schedule_type in ["출장", "외근"]:
-        for t in attendance_types:
-            if t["code"] == "BUSINESS_TRIP":
-                return t["id"]
-    return None
+def _map_type_to_attendance_type(schedule_type: str, type_table: dict) -> str | None:
+    """일정 타입을 AttendanceType id로 매핑 (_build_type_table 결과에서 dict 조회 한 번)"""
+    return type_table.get(schedule_type.casefold())
 
 
 def _create_attendance_payload(
     user_id: str,
     type_id: str,
-    start_date: str,
-    end_date: str,
+    start_date: date,
+    end_date: date,
     content: str | None = None,
 ) -> dict:
     """Attendance 생성 API 페이로드 생성"""
     return {
         "userId": user_id,
         "typeId": type_id,
-        "startDate": _extract_date_only(start_date),
-        "endDate": _extract_date_only(end_date),
+        "startDate": start_date.isoformat(),
+        "endDate": end_date.isoformat(),
         "content": content,
     }
 
 
+def _run_concurrently(tasks: list, worker, concurrency: int) -> None:
+    """worker(task)를 최대 concurrency 개 스레드에서 실행하고 모두 끝날 때까지 대기"""
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [executor.submit(worker, task) for task in tasks]
+        for future in as_completed(futures):
+            future.result()
+
+
+def _describe_plan(operations: list, existing: list, skipped: list, mode: str, start_date: str, end_date: str) -> dict:
+    """실행 계획을 JSON으로 내보낼 수 있는 형태로 (--plan)"""
+    existing_by_id = {record.get("id"): record for record in existing}
+    described = []
+    for action, attendance_id, job in operations:
+        if action == "delete":
+            described.append({"action": "delete", "id": attendance_id, "record": existing_by_id.get(attendance_id)})
+            continue
+        index, schedule, user_name, schedule_type, payload = job
+        entry = {"action": action, "summary": schedule["summary"], "user": user_name, "type": schedule_type, "payload": payload}
+        if attendance_id:
+            entry["id"] = attendance_id
+        described.append(entry)
+    counts = {action: sum(1 for entry in described if entry["action"] == action) for action in ("create", "update", "delete")}
+    return {
+        "mode": mode,
+        "start_date": start_date,
+        "end_date": end_date,
+        "counts": {**counts, "skip": len(skipped)},
+        "operations": described,
+        "skipped": skipped,
+    }
+
+
+def _print_plan(plan: dict, limit: int = 50) -> None:
+    """--plan 콘솔 출력 (작업 종류별 limit건까지, 전체는 --plan-json)"""
+    counts = plan["counts"]
+    print("\n" + "=" * 60)
+    print(
+        f"[plan] {plan['start_date']} ~ {plan['end_date']} (mode={plan['mode']}): "
+        f"{counts['create']} create, {counts['update']} update, {counts['delete']} delete, "
+        f"{plan.get('unchanged', 0)} unchanged, {counts['skip']} skip"
+    )
+    symbols = {"create": "+", "update": "~", "delete": "-"}
+    for action in ("delete", "update", "create"):
+        entries = [entry for entry in plan["operations"] if entry["action"] == action]
+        for entry in entries[:limit]:
+            if action == "delete":
+                record = entry["record"] or {}
+                detail = f"{entry['id']} ({record.get('userId')}, {str(record.get('startDate'))[:10]} ~ {str(record.get('endDate'))[:10]})"
+            else:
+                payload = entry["payload"]
+                detail = f"{entry['summary']} -> {payload['userId']} {payload['typeId']} {payload['startDate']} ~ {payload['endDate']}"
+            print(f"  {symbols[action]} {action:<6} {detail}")
+        if len(entries) > limit:
+            print(f"  ... {action} {len(entries) - limit}건 더 (전체는 --plan-json)")
+    for entry in plan["skipped"][:limit]:
+        print(f"  · skip   {entry['reason']}: {entry['summary']}")
+    if len(plan["skipped"]) > limit:
+        print(f"  ... skip {len(plan['skipped']) - limit}건 더")
+    print("=" * 60)
+
+
+def _prefetch_first(records: Iterator[dict]) -> Iterator[dict]:
+    """첫 페이지까지만 받아 둔 스트림 (조회 오류는 여기서 바로 드러나고, 다음 페이지는 소비할 때 요청)"""
+    first = next(records, None)
+    return records if first is None else itertools.chain([first], records)
+
+
 def _register_attendances(
-    filtered_schedules: list,
+    filtered_schedules: Iterable[dict],
     api_client: APIClient,
     start_date: str,
     end_date: str,
+    concurrency: int = 1,
+    mode: str = "reconcile",
+    bulk: bool = True,
+    chunk_size: int = 200,
+    type_mapping: dict | None = None,
+    user_index: UserIndex | None = None,
+    sync_state: SyncState | None = None,
+    plan: dict | None = None,
+    metadata: tuple[list, list] | None = None,
+    clip_to_window: bool = False,
+    journal: SyncJournal | None = None,
 ) -> dict:
     """
-    필터링된 일정을 백엔드 API로 등록.
+    필터링된 일정(리스트 또는 _stream_team_schedule 스트림)을 백엔드 API로 등록.
+    
+    mode="replace": 해당 기간의 모든 Attendance 삭제 후 전부 재등록
+    mode="reconcile": 기존 Attendance를 한 번 조회해 달라진 것만 생성/수정/삭제
+    
+    bulk=True이면 생성/삭제를 /attendances/bulk, /attendances/bulk-delete로
+    chunk_size 건씩 묶어 보내고, API 호출은 concurrency 개의 워커가 병렬로 수행한다.
+    
+    type_mapping은 일정 타입 -> AttendanceType code 표 (기본값 DEFAULT_TYPE_MAPPING).
+    user_index는 이름/별칭/memberId로 사용자를 찾는 인덱스 (없으면 이번 실행용으로 생성).
     
-    1. 먼저 해당 기간의 모든 Attendance 삭제
-    2. 새로운 일정을 등록
+    sync_state가 있으면 직전 성공 결과와 fingerprint를 비교해, 일정과 백엔드 건수가
+    그대로면 쓰기 없이 끝내고, reconcile 모드에서는 일정이 바뀐 팀원의 사용자만 맞춘다.
+    
+    plan(빈 dict)을 넘기면 조회/파싱/매핑/비교까지만 하고 쓰기 대신 실행할 작업을
+    plan에 채운다 (_describe_plan 형식, 사용자 인덱스/동기화 상태도 저장하지 않음).
+    
+    metadata는 미리 받아 둔 (users, attendance_types) (_warm_up_teams). reconcile 모드에서
+    기존 Attendance 조회는 일정 수집과 동시에 백그라운드에서 시작한다 (변경 감지로 생략될 수
+    있는 경우 제외).
+    
+    clip_to_window=True이면 시작일이 기간 안인 일정/근태만 다룬다 (이웃 기간과 병렬로 도는
+    백필 기간이 경계에 걸친 근태를 서로 만들거나 지우지 않도록).
+    
+    journal이 있으면 첫 쓰기 전에 전체 작업(replace 모드의 기간 삭제 포함)을 기록하고 끝난
+    작업마다 완료 표시를 남긴다. 중간에 죽으면 --resume이 남은 작업만 다시 실행한다 (_resume_team).
     
     Returns:
-        통계 정보 (deleted, success, failed, skipped)
+        통계 정보 (deleted, updated, success, unchanged, failed, skipped)
     """
     print("\n" + "=" * 60)
-    print("[registration] Starting attendance registration...")
+    print(f"[registration] Starting attendance registration (mode={mode})...")
     print("=" * 60)
     
-    # 1. 기간별 일괄 삭제
-    try:
-        deleted_count = api_client.delete_attendances_in_range(start_date, end_date)
-    except Exception as e:
-        print(f"[registration] ⚠️  Failed to delete existing attendances: {e}")
-        deleted_count = 0
+    stats = {"deleted": 0, "updated": 0, "success": 0, "unchanged": 0, "failed": 0, "skipped": 0}
     
-    # 2. 사용자 및 타입 정보 조회
-    print("\n[registration] Fetching users and attendance types...")
-    try:
-        users = api_client.get_users()
-        attendance_types = api_client.get_attendance_types()
-    except Exception as e:
-        print(f"[registration] ❌ Failed to fetch metadata: {e}")
-        return {"deleted": deleted_count, "success": 0, "failed": 0, "skipped": 0}
+    # 기존 Attendance 조회는 캘린더 일정과 무관하므로 첫 페이지 요청만 수집과 겹쳐서 진행
+    # (나머지 페이지는 비교하면서 한 장씩 받아 전체 목록을 메모리에 두지 않는다)
+    existing_future = None
+    if mode == "reconcile" and not (sync_state and sync_state.same_window(start_date, end_date)):
+        prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fetch-existing")
+        existing_future = prefetch.submit(_prefetch_first, api_client.iter_attendances_in_range(start_date, end_date))
+        prefetch.shutdown(wait=False)
     
-    # 사용자명 -> userId 매핑
-    user_map = {user["name"]: user["id"] for user in users}
-    print(f"[registration] User mapping: {len(user_map)} users")
+    # 1. 사용자 및 타입 정보 조회
+    print("\n[registration] Fetching users and attendance types...")
+    with span("registration.metadata"):
+        try:
+            if metadata:
+                users, attendance_types = metadata
+            else:
+                users = api_client.get_users()
+                attendance_types = api_client.get_attendance_types()
+        except Exception as e:
+            print(f"[registration] ❌ Failed to fetch metadata: {e}")
+            return stats
+    type_table = _build_type_table(type_mapping or DEFAULT_TYPE_MAPPING, attendance_types)
+    print(f"[registration] Type mapping: {len(type_table)} schedule types")
     
-    # 3. 일정 등록
-    stats = {"deleted": deleted_count, "success": 0, "failed": 0, "skipped": 0}
-    print(f"\n[registration] Registering {len(filtered_schedules)} schedules...")
+    # 사용자명/별칭/memberId -> userId 인덱스 (바뀐 사용자만 재색인)
+    if user_index is None:
+        user_index = UserIndex()
+    changed = user_index.update(users)
+    print(f"[registration] User mapping: {len(users)} users ({changed} re-indexed)")
+    known_names = user_index.names
     
-    for i, schedule in enumerate(filtered_schedules, 1):
-        summary = schedule["summary"]
-        start_date_str = schedule["startDate"]
-        end_date_str = schedule["endDate"]
+    # 2. 페이로드 생성 (스트림이면 캘린더 다운로드와 겹쳐서 진행)
+    jobs = []
+    skipped = []
+    fingerprint = ScheduleFingerprint()
+    with span("registration.collect") as collect_fields:
+        for i, schedule in enumerate(filtered_schedules, 1):
+            summary = schedule["summary"]
         
-        # 파싱
-        schedule_type = _parse_schedule_type(summary)
-        user_name = _parse_user_name(summary)
-        schedule_content = _parse_schedule_content(summary)  # 출장 내용, 휴가 세부사항 등
+            # 파싱 (타입, 이름, 내용, 날짜를 한 번에)
+            parsed = parse_schedule(schedule, known_names)
+            schedule_type, user_name = parsed.type, parsed.user_name
+            if parsed.start_date is None or parsed.end_date is None:
+                print(f"[{i}] ⚠️  Invalid date: {schedule['startDate']} ~ {schedule['endDate']} ({summary})")
+                stats["skipped"] += 1
+                skipped.append({"index": i, "summary": summary, "reason": "Invalid date"})
+                continue
+            if clip_to_window and not start_date <= parsed.start_date.isoformat() <= end_date:
+                continue  # 이전 기간에서 시작한 일정은 그 기간이 맡는다
         
-        # 사용자 매칭
-        user_id = user_map.get(user_name)
-        if not user_id:
-            print(f"[{i}/{len(filtered_schedules)}] ⚠️  User not found: {user_name} ({summary})")
-            stats["skipped"] += 1
-            continue
+            # 사용자 매칭
+            user_id, how = user_index.resolve(user_name, parsed.member_id)
+            if not user_id:
+                reason = "Ambiguous user" if how == "ambiguous" else "User not found"
+                print(f"[{i}] ⚠️  {reason}: {user_name} ({summary})")
+                stats["skipped"] += 1
+                skipped.append({"index": i, "summary": summary, "reason": reason, "user": user_name})
+                continue
+            if how == "fuzzy":
+                print(f"[{i}] ℹ️  User matched by similar name: {user_name} -> {user_id} ({summary})")
         
-        # 타입 매핑
-        type_id = _map_type_to_attendance_type(schedule_type, attendance_types)
-        if not type_id:
-            print(f"[{i}/{len(filtered_schedules)}] ⚠️  Unknown type: {schedule_type} ({summary})")
-            stats["skipped"] += 1
-            continue
+            # 타입 매핑
+            type_id = _map_type_to_attendance_type(schedule_type, type_table)
+            if not type_id:
+                print(f"[{i}] ⚠️  Unknown type: {schedule_type} ({summary})")
+                stats["skipped"] += 1
+                skipped.append({"index": i, "summary": summary, "reason": "Unknown type", "type": schedule_type})
+                continue
         
-        # content: 일정 내용만 (출장 목적, 휴가 세부사항 등)
-        content = schedule_content if schedule_content else None
-        
-        # 페이로드 생성
-        payload = _create_attendance_payload(
-            user_id, type_id, start_date_str, end_date_str, content
+            # 페이로드 생성 (content: 일정 내용만 - 출장 목적, 휴가 세부사항 등)
+            payload = _create_attendance_payload(
+                user_id, type_id, parsed.start_date, parsed.end_date, parsed.content
+            )
+            jobs.append((i, schedule, user_name, schedule_type, payload))
+            fingerprint.add(parsed.member_id, payload)
+        collect_fields["jobs"] = len(jobs)
+    
+    if plan is None:
+        try:
+            user_index.save()
+        except OSError as e:
+            print(f"[registration] ⚠️  Failed to save user index: {e}")
+    
+    # 변경 감지: fingerprint와 백엔드 건수가 직전 성공 시와 같으면 쓰기 생략
+    members = fingerprint.members()
+    digest = fingerprint.digest(start_date, end_date)
+    scope_users = None
+    if sync_state and sync_state.same_window(start_date, end_date):
+        try:
+            backend_count = api_client.count_attendances_in_range(start_date, end_date)
+        except Exception as e:
+            print(f"[registration] ⚠️  Failed to count attendances, running full sync: {e}")
+            backend_count = None
+        if backend_count is not None and backend_count == sync_state.last.get("count"):
+            if sync_state.last.get("fingerprint") == digest:
+                print(f"\n[registration] ✅ No changes since last sync ({backend_count} attendances), skipping writes")
+                stats["unchanged"] = len(jobs)
+                if plan is not None:
+                    plan.update(_describe_plan([], [], skipped, mode, start_date, end_date), unchanged=len(jobs))
+                return stats
+            if mode == "reconcile":
+                scope_users = sync_state.changed_users(members)
+                print(f"[registration] Changed schedules: syncing {len(scope_users)} users only")
+    
+    # 3. replace 모드 계획만: 삭제될 기존 레코드를 조회로 확인 (실제 삭제는 작업 기록 후 5단계)
+    existing = []
+    if mode == "replace" and plan is not None:
+        with span("registration.fetch_existing"):
+            existing = api_client.get_attendances_in_range(start_date, end_date)
+    
+    # 4. 실행할 작업 목록 (action, attendance_id, job)
+    if mode == "reconcile":
+        print(f"\n[registration] Fetching existing attendances ({start_date} ~ {end_date})...")
+        scoped_jobs = jobs
+        if scope_users is not None:
+            # 바뀐 팀원의 사용자만 비교 (나머지는 직전 동기화 그대로)
+            scoped_jobs = [job for job in jobs if job[4]["userId"] in scope_users]
+        try:
+            with span("registration.fetch_existing"):
+                if existing_future is not None:
+                    records = existing_future.result()
+                else:
+                    records = _prefetch_first(api_client.iter_attendances_in_range(start_date, end_date))
+            if clip_to_window:
+                records = (record for record in records if start_date <= str(record.get("startDate"))[:10] <= end_date)
+            if scope_users is not None:
+                records = (record for record in records if record.get("userId") in scope_users)
+            with span("registration.plan"):
+                sync_plan = plan_sync([job[4] for job in scoped_jobs], records)
+        except Exception as e:
+            print(f"[registration] ❌ Failed to fetch existing attendances, nothing changed: {e}")
+            stats["failed"] = len(jobs)
+            return stats
+        existing = sync_plan.stale
+        job_by_payload = {id(job[4]): job for job in scoped_jobs}
+        stats["unchanged"] = sync_plan.unchanged + len(jobs) - len(scoped_jobs)
+        operations = (
+            [("delete", attendance_id, None) for attendance_id in sync_plan.deletes]
+            + [("update", attendance_id, job_by_payload[id(payload)]) for attendance_id, payload in sync_plan.updates]
+            + [("create", None, job_by_payload[id(payload)]) for payload in sync_plan.creates]
         )
-        
-        # API 호출
-        result = api_client.create_attendance_with_retry(payload)
-        if result:
-            if i % 10 == 0 or i == len(filtered_schedules):
-                print(f"[{i}/{len(filtered_schedules)}] ✅ {user_name}: {schedule_type} ({start_date_str} ~ {end_date_str})")
-            stats["success"] += 1
+        print(
+            f"[registration] Plan: {len(sync_plan.creates)} create, {len(sync_plan.updates)} update, "
+            f"{len(sync_plan.deletes)} delete, {sync_plan.unchanged} unchanged"
+        )
+    else:
+        operations = [("delete", record["id"], None) for record in existing] + [("create", None, job) for job in jobs]
+
+    if plan is not None:
+        plan.update(_describe_plan(operations, existing, skipped, mode, start_date, end_date), unchanged=stats["unchanged"])
+        return stats
+    
+    # 작업 기록(write-ahead): 첫 쓰기 전에 전체 계획을 남긴다
+    op_keys: dict[tuple, str] = {}
+    range_key = None
+    if journal is not None:
+        planned = [(action, attendance_id, job[4] if job else None) for action, attendance_id, job in operations]
+        if mode == "replace":
+            planned.insert(0, ("delete_range", None, None))
+        try:
+            keys = journal.begin(start_date, end_date, mode, planned)
+        except OSError as e:
+            print(f"[registration] ⚠️  Failed to write sync journal, continuing without it: {e}")
+            journal = None
         else:
-            print(f"[{i}/{len(filtered_schedules)}] ❌ Failed: {summary}")
-            stats["failed"] += 1
+            if mode == "replace":
+                range_key = keys.pop(0)
+            op_keys = {
+                (action, attendance_id, id(job)): key
+                for (action, attendance_id, job), key in zip(operations, keys)
+            }
+    
+    def _done(done_operations: Iterable[tuple]) -> None:
+        if journal is not None:
+            journal.mark_done(op_keys[(action, attendance_id, id(job))] for action, attendance_id, job in done_operations)
+    
+    # 5. replace 모드: 기간별 일괄 삭제 (일정을 모두 받은 뒤에 삭제해 조회 실패 시 데이터 유실 방지)
+    if mode == "replace":
+        try:
+            stats["deleted"] = api_client.delete_attendances_in_range(start_date, end_date, bulk=bulk)
+            if journal is not None:
+                journal.mark_done([range_key])
+        except Exception as e:
+            # 삭제가 끝나지 않았으면 생성하지 않는다 (중복 방지, --resume은 삭제부터 다시 실행)
+            print(f"[registration] ❌ Failed to delete existing attendances, skipping {len(operations)} creates: {e}")
+            stats["failed"] += len(operations) or 1
+            operations = []
+    
+    # bulk 모드: 생성/삭제는 chunk_size 단위 요청으로 묶고, 수정만 건별로 보낸다
+    if bulk:
+        deletes = [attendance_id for action, attendance_id, _ in operations if action == "delete"]
+        creates = [job for action, _, job in operations if action == "create"]
+        operations = [operation for operation in operations if operation[0] == "update"]
+        if deletes:
+            operations.insert(0, ("delete_bulk", None, deletes))
+        if creates:
+            operations.append(("create_bulk", None, creates))
+    
+    print(f"\n[registration] Applying {len(operations)} operations (concurrency={concurrency}, bulk={bulk})...")
+    stats_lock = threading.Lock()
+    done = 0
+    counter = {"create": "success", "update": "updated", "delete": "deleted"}
+    
+    def _apply(operation: tuple) -> None:
+        nonlocal done
+        action, attendance_id, job = operation
+        if action == "delete_bulk":
+            deleted, failed_ids = api_client.delete_attendances_bulk(job, chunk_size)
+            failed_set = set(failed_ids)
+            _done(("delete", attendance, None) for attendance in job if attendance not in failed_set)
+            with stats_lock:
+                stats["deleted"] += deleted
+                stats["failed"] += len(failed_ids)
+                for failed_id in failed_ids:
+                    print(f"[registration] ❌ Failed: delete {failed_id}")
+            return
+        if action == "create_bulk":
+            keys = [op_keys[("create", None, id(j))] for j in job] if journal is not None else None
+            created, failed_payloads = api_client.create_attendances_bulk([j[4] for j in job], chunk_size, keys)
+            failed_keys = {id(payload) for payload in failed_payloads}
+            _done(("create", None, j) for j in job if id(j[4]) not in failed_keys)
+            with stats_lock:
+                stats["success"] += created
+                stats["failed"] += len(failed_payloads)
+                for j in job:
+                    if id(j[4]) in failed_keys:
+                        print(f"[registration] ❌ Failed: create {j[1]['summary']}")
+            return
+        if action == "delete":
+            ok = api_client.delete_attendance_with_retry(attendance_id)
+        elif action == "update":
+            ok = api_client.update_attendance_with_retry(attendance_id, job[4]) is not None
+        else:
+            key = op_keys.get((action, attendance_id, id(job)))
+            ok = api_client.create_attendance_with_retry(job[4], idempotency_key=key) is not None
+        label = f"{action} {attendance_id}" if job is None else f"{action} {job[1]['summary']}"
+        if ok:
+            _done([operation])
+        with stats_lock:
+            done += 1
+            if ok:
+                stats[counter[action]] += 1
+                if done % 10 == 0 or done == len(operations):
+                    print(f"[{done}/{len(operations)}] ✅ {label}")
+            else:
+                stats["failed"] += 1
+                print(f"[{done}/{len(operations)}] ❌ Failed: {label}")
+    
+    # API 호출 (동시 요청 수는 concurrency, 전체 속도는 api_client.rate_limiter가 제한)
+    with span("registration.apply", operations=str(len(operations))):
+        _run_concurrently(operations, _apply, concurrency)
+    
+    # 성공했으면 다음 실행의 비교 기준으로 저장
+    if sync_state and stats["failed"] == 0:
+        try:
+            count = api_client.count_attendances_in_range(start_date, end_date)
+            sync_state.save(start_date, end_date, digest, members, count, stats)
+        except Exception as e:
+            print(f"[registration] ⚠️  Failed to record sync state: {e}")
     
     # 최종 통계
     print("\n" + "=" * 60)
     print("[registration] Registration complete!")
-    print(f"  Deleted:  {stats['deleted']} existing attendances")
-    print(f"  Success:  {stats['success']} attendances created")
-    print(f"  Failed:   {stats['failed']} attendances")
-    print(f"  Skipped:  {stats['skipped']} attendances (user/type not found)")
+    print(f"  Deleted:   {stats['deleted']} attendances")
+    print(f"  Updated:   {stats['updated']} attendances")
+    print(f"  Success:   {stats['success']} attendances created")
+    print(f"  Unchanged: {stats['unchanged']} attendances")
+    print(f"  Failed:    {stats['failed']} operations")
+    print(f"  Skipped:   {stats['skipped']} schedules (user/type not found)")
     print("=" * 60)
     
     return stats
 
 
-def _input_credentials(driver: webdriver.Chrome, wait: WebDriverWait, settings: dict) -> None:
+def _input_credentials(driver: "webdriver.Chrome", wait: "WebDriverWait", settings: dict) -> None:
     """Handle overlay inputs (#idtemp/#passwordtemp) and type into real fields."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
     user_id_overlay = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#idtemp")))
     user_id_overlay.click()
     user_id = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "#id")))
@@ -375,9 +1005,45 @@ def _input_credentials(driver: webdriver.Chrome, wait: WebDriverWait, settings:
     pw.send_keys(settings["iris_password"])
 
 
-def main() -> None:
-    settings = _load_settings()
-    print(f"[config] 설정 파일 로드: {settings['config_path']}")
+def _wait_for_calendar_page(driver: "webdriver.Chrome") -> bool:
+    """팝업이나 다중 윈도우를 처리하며 calendar 페이지를 찾음"""
+    end_time = time.time() + 30
+    while time.time() < end_time:
+        try:
+            # 현재 윈도우에서 URL 확인
+            if "calendar.worksmobile.com" in driver.current_url:
+                return True
+        except Exception:
+            # 현재 윈도우가 닫혔거나 접근 불가
+            pass
+
+        # 모든 열린 윈도우를 확인
+        try:
+            handles = driver.window_handles
+            for handle in handles:
+                try:
+                    driver.switch_to.window(handle)
+                    if "calendar.worksmobile.com" in driver.current_url:
+                        print(f"[calendar] calendar 페이지 발견 (윈도우 전환)")
+                        return True
+                except Exception:
+                    # 이 윈도우는 접근 불가, 다음 윈도우 확인
+                    continue
+        except Exception:
+            pass
+
+        time.sleep(0.5)
+
+    raise TimeoutError("calendar.worksmobile.com 페이지를 찾을 수 없습니다")
+
+
+def _login_with_browser(settings: dict) -> list:
+    """Selenium으로 IRIS 로그인 + 2차 인증 후 calendar.worksmobile.com 쿠키 반환"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
 
     chrome_options = Options()
     chrome_options.add_experimental_option("detach", not settings["headless"])
@@ -389,7 +1055,8 @@ def main() -> None:
         chrome_options.add_argument("--disable-dev-shm-usage")
     print(f"[iris] 브라우저 옵션 설정 완료 (headless={settings['headless']})")
 
-    iris_driver = webdriver.Chrome(options=chrome_options)
+    with span("browser.chrome_start"):
+        iris_driver = webdriver.Chrome(options=chrome_options)
     wait = WebDriverWait(iris_driver, 15)
     print("[iris] WebDriver 초기화 완료")
 
@@ -412,15 +1079,7 @@ def main() -> None:
     print("[iris] 2차 인증 메일 요청 완료")
 
     request_timestamp = datetime.now(timezone.utc)
-    auth_num = _fetch_auth_code(
-        settings["auth_email"],
-        settings["auth_app_password"],
-        settings["auth_from_email"],
-        not_before=request_timestamp,
-        initial_delay=settings["auth_initial_delay"],
-        retries=settings["auth_poll_retries"],
-        delay=settings["auth_poll_delay"],
-    )
+    auth_num = _fetch_settings_auth_code(settings, request_timestamp)
 
     pw2 = WebDriverWait(iris_driver, 30).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#number1")))
     pw2.clear()
@@ -445,80 +1104,918 @@ def main() -> None:
             break
     print("[calendar] 새 탭으로 전환 완료")
 
-    # calendar.worksmobile.com 페이지 로드 대기 (팝업 처리 포함)
-    def wait_for_calendar_page(driver):
-        """팝업이나 다중 윈도우를 처리하며 calendar 페이지를 찾음"""
-        end_time = time.time() + 30
-        while time.time() < end_time:
-            try:
-                # 현재 윈도우에서 URL 확인
-                if "calendar.worksmobile.com" in driver.current_url:
-                    return True
-            except Exception:
-                # 현재 윈도우가 닫혔거나 접근 불가
-                pass
-
-            # 모든 열린 윈도우를 확인
-            try:
-                handles = driver.window_handles
-                for handle in handles:
-                    try:
-                        driver.switch_to.window(handle)
-                        if "calendar.worksmobile.com" in driver.current_url:
-                            print(f"[calendar] calendar 페이지 발견 (윈도우 전환)")
-                            return True
-                    except Exception:
-                        # 이 윈도우는 접근 불가, 다음 윈도우 확인
-                        continue
-            except Exception:
-                pass
-
-            time.sleep(0.5)
-
-        raise TimeoutError("calendar.worksmobile.com 페이지를 찾을 수 없습니다")
-
-    wait_for_calendar_page(iris_driver)
+    with span("browser.wait_for_calendar_page"):
+        _wait_for_calendar_page(iris_driver)
     print(f"[calendar] 캘린더 페이지 로드 완료: {iris_driver.current_url}")
 
-    # 캘린더 일정 조회
-    print("\n[calendar] 팀원 일정 조회 중...")
-    try:
-        schedule = _fetch_team_schedule(iris_driver)
-        filtered = _filter_bracket_schedules(schedule)
-        print(f"[calendar] 조회 완료 (휴가/출장 등 {len(filtered)}건)")
+    cookies = iris_driver.get_cookies()
+    if settings["headless"]:
+        iris_driver.quit()
+    return cookies
+
+
+def _calendar_cache_name(settings: dict) -> str:
+    return f"calendar:{settings['iris_id']}"
+
+
+def _api_cache_name(settings: dict) -> str:
+    return f"api:{settings['api_base_url']}:{settings['api_email']}"
+
+
+def _open_calendar_session(settings: dict, cache: SessionCache | None) -> tuple[requests.Session, list]:
+    """
+    캘린더 세션과 팀원 목록 반환.
+
+    캐시된 쿠키가 있고 서버가 받아주면 브라우저 없이 바로 반환하고,
+    없거나 거부되면 로그인 후 쿠키를 캐시에 저장한다.
+    login_mode = http이면 HTTP 로그인을 먼저 시도하고, 실패하면 Selenium으로 대체한다.
+    """
+    cache_name = _calendar_cache_name(settings)
+    if cache:
+        cookies = cache.load(cache_name)
+        if cookies:
+            session = _create_calendar_session(cookies, settings["calendar_pool_size"])
+            with span("calendar.probe_cached"):
+                member_list = _probe_calendar_session(session, settings["calendar_timeout"])
+            if member_list is not None:
+                print("[calendar] 캐시된 세션 재사용 (브라우저 로그인 생략)")
+                return session, member_list
+            cache.invalidate(cache_name)
+
+    session, member_list = None, None
+    if settings["login_mode"] == "http":
+        import iris_http
+
+        try:
+            with span("login.http"):
+                cookies = iris_http.login(settings, lambda not_before: _fetch_settings_auth_code(settings, not_before))
+            session = _create_calendar_session(cookies, settings["calendar_pool_size"])
+            member_list = _probe_calendar_session(session, settings["calendar_timeout"])
+        except Exception as e:  # noqa: BLE001
+            print(f"[iris-http] HTTP 로그인 실패, 브라우저 로그인으로 대체: {e}")
+        if member_list is None:
+            session = None
+
+    if session is None:
+        with span("login.browser"):
+            cookies = _login_with_browser(settings)
+        session = _create_calendar_session(cookies, settings["calendar_pool_size"])
+        member_list = _fetch_member_list(session, settings["calendar_timeout"])
+    if cache:
+        cache.save(cache_name, cookies, time.time() + settings["cache_calendar_ttl"] * 60)
+        print(f"[cache] 캘린더 세션 저장 ({settings['cache_calendar_ttl']}분)")
+    return session, member_list
+
+
+def _login_api_client(api_client: APIClient, settings: dict, cache: SessionCache | None) -> None:
+    """캐시된 JWT가 유효하면 재사용, 아니면 로그인 후 캐시에 저장"""
+    cache_name = _api_cache_name(settings)
+    if cache:
+        token = cache.load(cache_name)
+        if token and api_client.restore_token(token):
+            return
+        if token:
+            cache.invalidate(cache_name)
+
+    api_client.login()
+    if cache and api_client.token:
+        expires_at = api_client.token_expires_at() or time.time() + 3600
+        cache.save(cache_name, api_client.token, expires_at)
+
+
+def _build_session_cache(settings: dict) -> SessionCache | None:
+    if not settings["cache_enabled"]:
+        return None
+    return SessionCache(settings["cache_path"], key=settings["cache_key"])
+
+
+def _build_metadata_cache(settings: dict, refresh: bool) -> MetadataCache | None:
+    if not settings["cache_enabled"]:
+        return None
+    metadata_cache = MetadataCache(settings["cache_metadata_path"], ttl=settings["cache_metadata_ttl"] * 60)
+    if refresh:
+        print("[cache] --refresh-metadata: 사용자/근태 타입 캐시 초기화")
+        metadata_cache.clear()
+    return metadata_cache
+
+
+COMMANDS = ("sync", "plan", "login")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    [명령] [옵션] 해석. 명령을 생략하면 sync (기존 옵션만 쓰는 실행과 호환).
+
+    sync: 동기화 (기본), plan: --plan과 같음, login: 캘린더/API 로그인만 하고 세션 캐시 갱신
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command = argv.pop(0) if argv and argv[0] in COMMANDS else "sync"
+    parser = argparse.ArgumentParser(
+        description="IRIS 캘린더 일정을 주간보고 근태로 동기화",
+        usage="%(prog)s [sync|plan|login] [options]",
+        epilog="명령: sync 동기화(기본) / plan 쓰기 없이 실행 계획만 / login 로그인해서 세션 캐시만 갱신",
+    )
+    parser.add_argument(
+        "--refresh-metadata",
+        action="store_true",
+        help="캐시된 사용자/근태 타입 목록을 무시하고 다시 받기",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="종료하지 않고 [daemon] 설정 주기로 반복 동기화 (세션은 백그라운드에서 갱신)",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="백엔드에 쓰지 않고 생성/수정/삭제/건너뛸 작업과 단계별 소요 시간만 출력",
+    )
+    parser.add_argument(
+        "--plan-json",
+        metavar="PATH",
+        type=Path,
+        help="--plan 결과를 JSON 파일로 저장 (--plan 포함)",
+    )
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        metavar="YYYY-MM-DD",
+        type=date.fromisoformat,
+        help="과거 기간 백필 시작일 (--to와 함께, [backfill] window_days 단위로 나눠 병렬 동기화)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        metavar="YYYY-MM-DD",
+        type=date.fromisoformat,
+        help="과거 기간 백필 종료일 (중단 후 같은 기간으로 다시 실행하면 완료된 구간은 건너뜀)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="캘린더 조회 없이, 중단된 직전 동기화의 작업 기록에서 끝나지 않은 쓰기만 다시 실행",
+    )
+    args = parser.parse_args(argv)
+    args.command = command
+    args.plan = args.plan or args.plan_json is not None or command == "plan"
+    if command == "login" and (args.daemon or args.plan or args.resume or args.date_from is not None):
+        parser.error("login 명령은 --daemon, --plan, --resume, --from/--to와 함께 쓸 수 없습니다")
+    if args.resume and (args.daemon or args.plan or args.date_from is not None):
+        parser.error("--resume은 --daemon, --plan, --from/--to와 함께 쓸 수 없습니다")
+    if args.plan and args.daemon:
+        parser.error("--plan은 --daemon과 함께 쓸 수 없습니다")
+    if (args.date_from is None) != (args.date_to is None):
+        parser.error("--from과 --to는 함께 지정해야 합니다")
+    if args.date_from is not None:
+        if args.date_from > args.date_to:
+            parser.error("--from이 --to보다 늦습니다")
+        if args.daemon or args.plan:
+            parser.error("--from/--to는 --daemon, --plan과 함께 쓸 수 없습니다")
+    return args
+
+
+def _build_api_client(settings: dict, metadata_cache: MetadataCache | None) -> APIClient:
+    return APIClient(
+        settings["api_base_url"],
+        settings["api_email"],
+        settings["api_password"],
+        rate_limiter=AdaptiveTokenBucket(rate=settings["api_rate_limit"]),
+        pool_size=settings["api_pool_size"],
+        metadata_cache=metadata_cache,
+        retry_policy=RetryPolicy(
+            "api",
+            max_attempts=settings["api_retries"],
+            base_delay=settings["api_retry_base_delay"],
+            max_delay=settings["api_retry_max_delay"],
+            breaker=CircuitBreaker(
+                "api",
+                failure_threshold=settings["api_breaker_failures"],
+                reset_timeout=settings["api_breaker_reset_seconds"],
+            ),
+        ),
+        connect_timeout=settings["api_connect_timeout"],
+        read_timeout=settings["api_read_timeout"],
+        bulk_read_timeout=settings["api_bulk_read_timeout"],
+        compress_min_bytes=settings["api_compress_min_bytes"],
+        page_size=settings["api_page_size"],
+    )
+
+
+def _build_user_index(settings: dict) -> UserIndex:
+    return UserIndex(
+        settings["users_index_path"],
+        aliases=settings["users_aliases"],
+        members=settings["users_members"],
+    )
+
+
+def _build_sync_state(settings: dict) -> SyncState | None:
+    if not settings["api_skip_unchanged"]:
+        return None
+    scope = f"{settings['api_base_url']}|{settings['api_email']}|{settings['api_sync_mode']}"
+    return SyncState(settings["cache_state_path"], scope)
+
+
+def _build_sync_journal(settings: dict) -> SyncJournal | None:
+    if not settings["cache_journal_path"]:
+        return None
+    scope = f"{settings['api_base_url']}|{settings['api_email']}|{settings['team_name']}"
+    return SyncJournal(settings["cache_journal_path"], scope)
+
+
+def _build_teams(settings: dict, refresh_metadata: bool) -> list[dict]:
+    """팀 프로필마다 {"settings", "api_client", "user_index", "sync_state", "journal"} (메타데이터 캐시는 공유)"""
+    metadata_cache = _build_metadata_cache(settings, refresh_metadata)
+    teams = []
+    for team in settings["teams"]:
+        team_settings = {**settings, **team}
+        teams.append({
+            "settings": team_settings,
+            "api_client": _build_api_client(team_settings, metadata_cache),
+            "user_index": _build_user_index(team_settings),
+            "sync_state": _build_sync_state(team_settings),
+            "journal": _build_sync_journal(team_settings),
+        })
+    return teams
+
+
+def _login_teams(teams: list[dict], cache: SessionCache | None) -> None:
+    """
+    팀별 API 로그인 (팀끼리는 순서대로).
+
+    캘린더 로그인과 동시에 워밍업 스레드에서 돌 수 있으므로 세션 캐시 파일 접근은
+    SessionCache 내부 잠금으로 직렬화된다.
+    """
+    for team in teams:
+        with span("api.login", team=team["settings"]["team_name"]):
+            _login_api_client(team["api_client"], team["settings"], cache)
+
+
+def _warm_up_teams(teams: list[dict], cache: SessionCache | None) -> None:
+    """
+    팀별 API 로그인 + 사용자/근태 타입 선조회 (team["metadata"]).
+
+    캘린더 로그인(2FA 메일 대기 포함)과 동시에 실행해, 등록 단계가 시작될 때는
+    백엔드 준비가 끝나 있도록 한다. 메타데이터 조회 실패는 등록 단계에서 다시 시도한다.
+    """
+    _login_teams(teams, cache)
+    for team in teams:
+        api_client = team["api_client"]
+        try:
+            with span("api.prefetch_metadata", team=team["settings"]["team_name"]):
+                team["metadata"] = (api_client.get_users(), api_client.get_attendance_types())
+        except Exception as e:  # noqa: BLE001
+            print(f"[api] ⚠️  사용자/근태 타입 선조회 실패 (등록 단계에서 재시도): {e}")
+
+
+def _sync_once(
+    settings: dict,
+    session: requests.Session,
+    member_list: list,
+    api_client: APIClient,
+    user_index: UserIndex,
+    sync_state: SyncState | None = None,
+    plan: dict | None = None,
+    metadata: tuple[list, list] | None = None,
+    journal: SyncJournal | None = None,
+) -> dict | None:
+    """
+    캘린더 일정 1회 조회 + 근태 등록 (plan을 넘기면 쓰기 없이 실행 계획만, _register_attendances 참고).
+
+    Returns:
+        _register_attendances 통계 (등록할 일정이 없으면 None)
+
+    Raises:
+        Exception: 캘린더 조회 또는 API 호출 실패 (상주 모드에서 세션 점검 신호로 사용)
+    """
+    # 캘린더 일정 조회 (백그라운드 다운로드 시작, 결과는 스트림으로 등록 단계에 전달)
+    team_name = settings["team_name"]
+    member_list = _select_members(member_list, settings["team_members"])
+    print(f"\n[calendar] 팀원 일정 조회 중... (팀: {team_name})")
+    print(f"[calendar] 팀원 {len(member_list)}명 조회 완료")
+    if not member_list:
+        # 팀원을 하나도 못 봤으면 "일정 없음"과 구분할 수 없으므로 비교/삭제하지 않는다
+        print("[calendar] ⚠️  조회할 팀원이 없어 동기화를 건너뜁니다 (기존 근태 일괄 삭제 방지)")
+        return None
+    # 조회 기간은 한 번만 계산해 캘린더 조회와 비교 범위에 함께 쓴다 (자정 경계에서 어긋나지 않도록)
+    view_from, view_until = _get_date_range()
+    events = _stream_team_schedule(
+        session,
+        member_list,
+        view_from,
+        view_until,
+        member_chunk_size=settings["calendar_member_chunk_size"],
+        window_days=settings["calendar_window_days"],
+        workers=settings["calendar_workers"],
+        timeout=settings["calendar_timeout"],
+        retries=settings["calendar_retries"],
+    )
+    first = next(events, None)
+    if first is None:
+        if settings["api_sync_mode"] != "reconcile":
+            print("\n[calendar] No schedules to register")
+            return None
+        # 기간 내 일정이 모두 지워진 경우: 빈 목록과 비교해 남은 근태를 정리한다
+        # (캘린더 조회가 실패했다면 스트림이 예외를 던지므로 여기까지 오지 않는다)
+        print("\n[calendar] 기간 내 일정 없음 - 기존 근태와 비교해 정리합니다")
+
+    def _echo(items: Iterable[dict]) -> Iterator[dict]:
+        count = 0
         print("=" * 60)
-        for item in filtered:
+        for item in items:
             print(f"  {item['summary']} | {item['startDate']} ~ {item['endDate']}")
+            count += 1
+            yield item
+        print(f"[calendar] 조회 완료 (휴가/출장 등 {count}건)")
         print("=" * 60)
-        
-        # API 클라이언트 초기화 및 등록
-        if filtered:
-            print("\n[api] Initializing API client...")
+
+    start_date = view_from.split()[0]  # "YYYY-MM-DD HH:MM" -> "YYYY-MM-DD"
+    end_date = view_until.split()[0]
+
+    # 등록 실행
+    stats = _register_attendances(
+        _echo(itertools.chain([first], events) if first is not None else events),
+        api_client,
+        start_date,
+        end_date,
+        concurrency=settings["api_concurrency"],
+        mode=settings["api_sync_mode"],
+        bulk=settings["api_bulk"],
+        chunk_size=settings["api_bulk_chunk_size"],
+        type_mapping=settings["type_mapping"],
+        user_index=user_index,
+        sync_state=sync_state,
+        plan=plan,
+        metadata=metadata,
+        journal=journal,
+    )
+    if plan is not None:
+        return stats
+    for result, count in stats.items():
+        metrics.inc("attendances_total", count, result=result, team=team_name)
+    return stats
+
+
+def _sync_teams(
+    session: requests.Session,
+    member_list: list,
+    teams: list[dict],
+    plans: dict[str, dict] | None = None,
+) -> dict[str, dict | None]:
+    """
+    모든 팀을 같은 캘린더 세션으로 병렬 동기화하고 팀별 결과를 출력.
+
+    캘린더 동시 요청 수는 세션 연결 풀([calendar] pool_size)이, 백엔드 쓰기 속도는
+    팀별 APIClient의 rate limiter가 제한한다. plans({팀 이름: 빈 dict})를 넘기면 쓰기 없이
+    팀별 실행 계획만 채운다.
+
+    Returns:
+        {팀 이름: _register_attendances 통계 또는 None}
+
+    Raises:
+        RuntimeError: 한 팀이라도 실패한 경우 (요약 출력 후)
+    """
+
+    def _sync_team(team: dict) -> dict | None:
+        name = team["settings"]["team_name"]
+        with span("sync", team=name):
+            return _sync_once(
+                team["settings"],
+                session,
+                member_list,
+                team["api_client"],
+                team["user_index"],
+                team["sync_state"],
+                plan=plans[name] if plans is not None else None,
+                metadata=team.pop("metadata", None),
+                journal=team.get("journal"),
+            )
+
+    results: dict[str, dict | None] = {}
+    errors: dict[str, Exception] = {}
+    with ThreadPoolExecutor(max_workers=len(teams), thread_name_prefix="team") as executor:
+        futures = {executor.submit(_sync_team, team): team["settings"]["team_name"] for team in teams}
+        for future in as_completed(futures):
+            name = futures[future]
             try:
-                api_client = APIClient(
-                    settings["api_base_url"],
-                    settings["api_email"],
-                    settings["api_password"],
+                results[name] = future.result()
+            except Exception as e:  # noqa: BLE001
+                errors[name] = e
+                print(f"[teams] ❌ {name} 동기화 실패: {e}")
+
+    if len(teams) > 1:
+        print("\n[teams] 팀별 결과")
+        for team in teams:
+            name = team["settings"]["team_name"]
+            if name in errors:
+                summary = f"실패 ({errors[name]})"
+            elif results.get(name) is None:
+                summary = "등록할 일정 없음"
+            else:
+                summary = ", ".join(f"{key} {value}" for key, value in results[name].items())
+            print(f"  {name}: {summary}")
+    if errors:
+        first_error = next(iter(errors.values()))
+        raise RuntimeError(f"{len(errors)}/{len(teams)}개 팀 동기화 실패: {', '.join(sorted(errors))}") from first_error
+    return results
+
+
+def _run_plan(session: requests.Session, member_list: list, teams: list[dict], json_path: Path | None) -> None:
+    """--plan: 팀별 실행 계획과 단계별 소요 시간 출력 (json_path가 있으면 JSON으로도 저장)"""
+    plans: dict[str, dict] = {team["settings"]["team_name"]: {} for team in teams}
+    with span("plan"):
+        _sync_teams(session, member_list, teams, plans)
+
+    for name, plan in plans.items():
+        if len(plans) > 1:
+            print(f"\n[plan] 팀: {name}")
+        if plan:
+            _print_plan(plan)
+        else:
+            print("[plan] 등록할 일정 없음")
+
+    timings = metrics.summary()
+    print("\n[plan] 단계별 소요 시간 (합계)")
+    for phase, summary in sorted(timings.items()):
+        print(f"  {phase:<32} {summary['sum']:8.3f}s  ({summary['count']}회)")
+
+    if json_path:
+        document = {"generated_at": datetime.now().isoformat(timespec="seconds"), "teams": plans, "timings": timings}
+        json_path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[plan] JSON 저장: {json_path}")
+
+
+def _backfill_window(
+    team: dict,
+    session: requests.Session,
+    member_list: list,
+    start_date: str,
+    end_date: str,
+) -> tuple[dict, int]:
+    """
+    백필 기간 하나를 reconcile로 동기화 (시작일이 기간 안인 일정/근태만).
+
+    일정이 하나도 없는 기간도 기존 근태와 비교해 남은 레코드를 삭제한다. 다른 기간과
+    병렬로 돌기 때문에 사용자 인덱스는 기간마다 메모리에서 새로 만들고 동기화
+    상태(sync_state)는 쓰지 않는다.
+
+    Returns:
+        (_register_attendances 통계, 받은 일정 수)
+    """
+    settings = team["settings"]
+    events = _stream_team_schedule(
+        session,
+        member_list,
+        f"{start_date} 00:00",
+        f"{end_date} 23:59",
+        member_chunk_size=settings["calendar_member_chunk_size"],
+        window_days=settings["calendar_window_days"],
+        workers=settings["calendar_workers"],
+        timeout=settings["calendar_timeout"],
+        retries=settings["calendar_retries"],
+    )
+    count = 0
+
+    def _counted(items: Iterable[dict]) -> Iterator[dict]:
+        nonlocal count
+        for item in items:
+            count += 1
+            yield item
+
+    stats = _register_attendances(
+        _counted(events),
+        team["api_client"],
+        start_date,
+        end_date,
+        concurrency=settings["api_concurrency"],
+        mode="reconcile",
+        bulk=settings["api_bulk"],
+        chunk_size=settings["api_bulk_chunk_size"],
+        type_mapping=settings["type_mapping"],
+        user_index=UserIndex(aliases=settings["users_aliases"], members=settings["users_members"]),
+        metadata=team.get("metadata"),
+        clip_to_window=True,
+    )
+    return stats, count
+
+
+def _run_backfill(
+    session: requests.Session,
+    member_list: list,
+    teams: list[dict],
+    date_from: date,
+    date_to: date,
+) -> None:
+    """
+    --from/--to: 긴 기간을 [backfill] window_days 단위로 나눠 workers 개씩 병렬 동기화.
+
+    기간이 끝날 때마다 팀별 체크포인트 파일(BackfillJournal)에 기록하고, 다시 실행하면
+    완료된 기간은 건너뛴다. replace 모드의 기간 삭제는 이웃 기간의 근태까지 지우므로
+    백필은 항상 reconcile로 동작한다. 기간마다 처리한 일정 수와 events/s를 출력한다.
+
+    Raises:
+        RuntimeError: 실패한 기간이 있는 경우 (다시 실행하면 그 기간부터 재시도)
+    """
+    window_days = teams[0]["settings"]["backfill_window_days"]
+    windows = [
+        (start[:10], end[:10])
+        for start, end in _split_date_range(f"{date_from:%Y-%m-%d} 00:00", f"{date_to:%Y-%m-%d} 23:59", window_days)
+    ]
+    print(f"\n[backfill] {date_from} ~ {date_to}: {window_days}일 단위 {len(windows)}개 기간")
+
+    jobs = []
+    for team in teams:
+        team_settings = team["settings"]
+        name = team_settings["team_name"]
+        scope = f"{team_settings['api_base_url']}|{team_settings['api_email']}|{name}"
+        journal = BackfillJournal(team_settings["backfill_journal_path"], scope)
+        pending = [window for window in windows if not journal.is_done(*window)]
+        print(f"[backfill] 팀 {name}: 완료 {len(windows) - len(pending)}개, 남은 기간 {len(pending)}개")
+        if not pending:
+            continue
+        if "metadata" not in team:
+            # 모든 기간이 같은 사용자/근태 타입 목록을 쓴다
+            team["metadata"] = (team["api_client"].get_users(), team["api_client"].get_attendance_types())
+        members = _select_members(member_list, team_settings["team_members"])
+        if not members:
+            print(f"[backfill] ⚠️  팀 {name}: 조회할 팀원이 없어 건너뜁니다 (기존 근태 일괄 삭제 방지)")
+            continue
+        jobs.extend((team, journal, members, start, end) for start, end in pending)
+
+    def _run_window(job: tuple) -> int:
+        team, journal, members, start_date, end_date = job
+        name = team["settings"]["team_name"]
+        started = time.perf_counter()
+        try:
+            with span("backfill.window", team=name):
+                stats, events = _backfill_window(team, session, members, start_date, end_date)
+        except Exception as e:
+            journal.record(start_date, end_date, "failed", error=str(e))
+            raise
+        seconds = time.perf_counter() - started
+        rate = events / seconds if seconds > 0 else 0.0
+        failed = stats["failed"]
+        journal.record(
+            start_date,
+            end_date,
+            "failed" if failed else "done",
+            stats=stats,
+            events=events,
+            seconds=round(seconds, 3),
+            events_per_sec=round(rate, 1),
+        )
+        for result, count in stats.items():
+            metrics.inc("attendances_total", count, result=result, team=name)
+        print(
+            f"[backfill] {'❌' if failed else '✅'} {name} {start_date} ~ {end_date}: "
+            f"일정 {events}건, {seconds:.1f}초 ({rate:.1f} events/s)"
+        )
+        if failed:
+            raise RuntimeError(f"{failed}건 실패")
+        return events
+
+    started = time.perf_counter()
+    total_events = 0
+    errors: dict[tuple[str, str, str], Exception] = {}
+    with ThreadPoolExecutor(max_workers=teams[0]["settings"]["backfill_workers"], thread_name_prefix="backfill") as executor:
+        futures = {executor.submit(_run_window, job): (job[0]["settings"]["team_name"], job[3], job[4]) for job in jobs}
+        for future in as_completed(futures):
+            try:
+                total_events += future.result()
+            except Exception as e:  # noqa: BLE001
+                errors[futures[future]] = e
+                name, start_date, end_date = futures[future]
+                print(f"[backfill] ❌ {name} {start_date} ~ {end_date} 실패: {e}")
+
+    seconds = time.perf_counter() - started
+    rate = total_events / seconds if seconds > 0 else 0.0
+    print(
+        f"\n[backfill] 기간 {len(jobs) - len(errors)}/{len(jobs)}개 완료, "
+        f"일정 {total_events}건, {seconds:.1f}초 ({rate:.1f} events/s)"
+    )
+    if errors:
+        raise RuntimeError(f"{len(errors)}개 기간 실패 (다시 실행하면 실패한 기간부터 이어서 진행)")
+
+
+def _resume_team(team: dict) -> dict | None:
+    """
+    --resume: 작업 기록(SyncJournal)에 완료 표시가 없는 쓰기만 다시 실행.
+
+    캘린더는 조회하지 않는다. 기존 근태를 한 번 조회해 이미 반영된 작업(같은 내용의 레코드가
+    있는 생성, 이미 사라진 삭제 대상, 이미 같은 내용인 수정)은 완료로 표시하고 나머지만
+    기록된 idempotency key로 보낸다. replace 모드의 기간 삭제가 끝나지 않았으면 그것부터 한다.
+
+    Returns:
+        통계 (deleted, updated, success, unchanged, failed) 또는 남은 작업이 없으면 None
+    """
+    settings, api_client, journal = team["settings"], team["api_client"], team.get("journal")
+    name = settings["team_name"]
+    pending = journal.pending() if journal else None
+    if pending is None:
+        print(f"[resume] {name}: 다시 실행할 작업 없음")
+        return None
+    start_date, end_date, operations = pending["start_date"], pending["end_date"], pending["operations"]
+    print(f"[resume] {name}: {start_date} ~ {end_date} ({pending['mode']}) 남은 작업 {len(operations)}건")
+
+    stats = {"deleted": 0, "updated": 0, "success": 0, "unchanged": 0, "failed": 0}
+    range_delete = [op for op in operations if op["action"] == "delete_range"]
+    if range_delete and "create" in pending["done_actions"]:
+        # 생성은 기간 삭제가 성공한 뒤에만 시작하므로, 완료된 생성이 있으면 삭제도 끝난 것
+        # (완료 줄만 유실된 경우). 다시 지우면 이미 만든 근태까지 사라진다.
+        print(f"[resume] {name}: 완료된 생성이 있어 기간 삭제는 다시 하지 않습니다")
+        journal.mark_done([range_delete[0]["key"]])
+        range_delete = []
+    if range_delete:
+        # 기간 삭제 전에 죽었거나 삭제가 실패했으면 생성도 하나도 안 된 상태
+        stats["deleted"] = api_client.delete_attendances_in_range(start_date, end_date, bulk=settings["api_bulk"])
+        journal.mark_done([range_delete[0]["key"]])
+    # 기존 근태는 페이지 단위로 훑으며 남은 작업과 관련된 것(수정/삭제 대상 id, 생성할 내용)만 남긴다
+    key_by_id: dict[str, tuple] = {}
+    existing_keys: Counter = Counter()
+    if not range_delete:
+        ids = {op["id"] for op in operations if op["action"] in ("delete", "update")}
+        create_keys = {attendance_key(op["payload"]) for op in operations if op["action"] == "create"}
+        with span("resume.fetch_existing", team=name):
+            for record in api_client.iter_attendances_in_range(start_date, end_date):
+                key = attendance_key(record)
+                if record["id"] in ids:
+                    key_by_id[record["id"]] = key
+                if key in create_keys:
+                    existing_keys[key] += 1
+
+    todo = []
+    settled = []
+    for op in operations:
+        action, attendance_id, payload = op["action"], op["id"], op["payload"]
+        if action == "delete_range":
+            continue
+        if action == "create" and existing_keys[attendance_key(payload)] > 0:
+            existing_keys[attendance_key(payload)] -= 1
+        elif action == "delete" and attendance_id not in key_by_id:
+            pass
+        elif action == "update" and (
+            attendance_id not in key_by_id or key_by_id[attendance_id] == attendance_key(payload)
+        ):
+            pass
+        else:
+            todo.append(op)
+            continue
+        settled.append(op["key"])
+    journal.mark_done(settled)
+    stats["unchanged"] = len(settled)
+    print(f"[resume] {name}: 이미 반영됨 {len(settled)}건, 다시 보낼 작업 {len(todo)}건")
+
+    chunk_size = settings["api_bulk_chunk_size"]
+    stats_lock = threading.Lock()
+    counter = {"create": "success", "update": "updated", "delete": "deleted"}
+
+    def _replay(op: dict) -> None:
+        action = op["action"]
+        if action == "delete":
+            ok = api_client.delete_attendance_with_retry(op["id"])
+        elif action == "update":
+            ok = api_client.update_attendance_with_retry(op["id"], op["payload"]) is not None
+        else:
+            ok = api_client.create_attendance_with_retry(op["payload"], idempotency_key=op["key"]) is not None
+        if ok:
+            journal.mark_done([op["key"]])
+        with stats_lock:
+            stats[counter[action] if ok else "failed"] += 1
+
+    single = [op for op in todo if op["action"] == "update"]
+    deletes = [op for op in todo if op["action"] == "delete"]
+    creates = [op for op in todo if op["action"] == "create"]
+    with span("resume.apply", team=name, operations=str(len(todo))):
+        if settings["api_bulk"]:
+            if deletes:
+                deleted, failed_ids = api_client.delete_attendances_bulk([op["id"] for op in deletes], chunk_size)
+                failed_set = set(failed_ids)
+                journal.mark_done(op["key"] for op in deletes if op["id"] not in failed_set)
+                stats["deleted"] += deleted
+                stats["failed"] += len(failed_ids)
+            _run_concurrently(single, _replay, settings["api_concurrency"])
+            if creates:
+                created, failed_payloads = api_client.create_attendances_bulk(
+                    [op["payload"] for op in creates], chunk_size, [op["key"] for op in creates]
                 )
-                api_client.login()
-                
-                # 조회 기간 가져오기
-                view_from, view_until = _get_date_range()
-                start_date = view_from.split()[0]  # "YYYY-MM-DD HH:MM" -> "YYYY-MM-DD"
-                end_date = view_until.split()[0]
-                
-                # 등록 실행
-                _register_attendances(filtered, api_client, start_date, end_date)
+                failed_keys = {id(payload) for payload in failed_payloads}
+                journal.mark_done(op["key"] for op in creates if id(op["payload"]) not in failed_keys)
+                stats["success"] += created
+                stats["failed"] += len(failed_payloads)
+        else:
+            _run_concurrently(deletes + single + creates, _replay, settings["api_concurrency"])
+
+    print(f"[resume] {name}: " + ", ".join(f"{key} {value}" for key, value in stats.items()))
+    return stats
+
+
+def _run_resume(teams: list[dict]) -> None:
+    """
+    --resume: 팀마다 _resume_team 실행.
+
+    Raises:
+        RuntimeError: 다시 보낸 작업 중 실패가 있는 경우 (작업 기록에 남아 다음 --resume에서 재시도)
+    """
+    failed = []
+    for team in teams:
+        stats = _resume_team(team)
+        if stats and stats["failed"]:
+            failed.append(team["settings"]["team_name"])
+    if failed:
+        raise RuntimeError(f"재실행 실패가 남은 팀: {', '.join(failed)} (--resume으로 다시 시도)")
+
+
+def _renew_sessions(
+    state: dict,
+    settings: dict,
+    cache: SessionCache | None,
+    teams: list[dict],
+    check_token: bool = False,
+) -> None:
+    """
+    상주 모드 세션 유지: 캘린더 세션은 가벼운 조회로 연장하고 거부되면 다시 로그인,
+    JWT는 만료 token_renew_minutes 전에 새로 발급받는다.
+
+    Args:
+        state: {"session", "member_list"} (갱신 시 교체)
+        check_token: True면 만료 전이라도 /auth/me로 토큰이 유효한지 확인
+    """
+    member_list = _probe_calendar_session(state["session"], settings["calendar_timeout"])
+    if member_list is None:
+        print("[daemon] 캘린더 세션 만료, 다시 로그인합니다")
+        state["session"].close()
+        state["session"], state["member_list"] = _open_calendar_session(settings, cache)
+    else:
+        state["member_list"] = member_list
+        if cache:
+            # 서버가 세션을 연장했으므로 캐시 유효 시간도 연장 (재시작 시 재사용)
+            cookies = [
+                {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+                for c in state["session"].cookies
+            ]
+            cache.save(
+                _calendar_cache_name(settings),
+                cookies,
+                time.time() + settings["cache_calendar_ttl"] * 60,
+            )
+
+    for team in teams:
+        api_client, team_settings = team["api_client"], team["settings"]
+        expires_at = api_client.token_expires_at()
+        expiring = expires_at is None or expires_at - time.time() < settings["daemon_token_renew_minutes"] * 60
+        if expiring or (check_token and not api_client.restore_token(api_client.token)):
+            print(f"[daemon] API 토큰 갱신 (팀: {team_settings['team_name']})")
+            if cache:
+                cache.invalidate(_api_cache_name(team_settings))
+            _login_api_client(api_client, team_settings, cache)
+
+
+def _keep_sessions_warm(
+    state: dict,
+    lock: threading.Lock,
+    stop: threading.Event,
+    settings: dict,
+    cache: SessionCache | None,
+    teams: list[dict],
+) -> None:
+    """keepalive_minutes 간격으로 _renew_sessions 실행 (백그라운드 스레드)"""
+    while not stop.wait(settings["daemon_keepalive_minutes"] * 60):
+        with lock:
+            try:
+                _renew_sessions(state, settings, cache, teams)
+            except Exception as e:  # noqa: BLE001
+                print(f"[daemon] ⚠️  세션 갱신 실패 (다음 주기에 재시도): {e}")
+
+
+def _run_daemon(settings: dict, args: argparse.Namespace, cache: SessionCache | None) -> None:
+    """
+    로그인한 캘린더/API 세션을 유지한 채 interval_minutes(또는 cron) 주기로 동기화.
+
+    매 주기는 캘린더 조회와 근태 조회/반영 몇 번의 HTTP 호출만 하고, 브라우저 로그인은
+    세션이 실제로 거부됐을 때만 다시 한다. SIGTERM/Ctrl+C로 현재 주기를 마치고 종료.
+    """
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    teams = _build_teams(settings, args.refresh_metadata)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-warmup") as warmup:
+        api_ready = warmup.submit(_warm_up_teams, teams, cache)
+        with span("calendar.open_session"):
+            session, member_list = _open_calendar_session(settings, cache)
+        api_ready.result()
+    state = {"session": session, "member_list": member_list}
+    metrics.export()
+
+    lock = threading.Lock()
+    keeper = threading.Thread(
+        target=_keep_sessions_warm,
+        args=(state, lock, stop, settings, cache, teams),
+        name="session-keeper",
+        daemon=True,
+    )
+    keeper.start()
+
+    cron = settings["daemon_cron"]
+    schedule_label = f"cron '{cron.expression}'" if cron else f"{settings['daemon_interval_minutes']}분 간격"
+    print(
+        f"[daemon] 상주 모드 시작 ({schedule_label}, 지연 최대 {settings['daemon_jitter_seconds']}초, 팀 {len(teams)}개)"
+    )
+
+    failed = False
+    try:
+        while not stop.is_set():
+            started = datetime.now()
+            metrics.reset()
+            with lock:
+                try:
+                    if failed:
+                        # 직전 주기 실패: 세션/토큰이 거부된 것인지 먼저 확인
+                        with span("daemon.renew_sessions"):
+                            _renew_sessions(state, settings, cache, teams, check_token=True)
+                    _sync_teams(state["session"], state["member_list"], teams)
+                    failed = False
+                except Exception as e:  # noqa: BLE001
+                    failed = True
+                    print(f"[daemon] ❌ 동기화 실패 (다음 주기에 세션 점검 후 재시도): {e}")
+            metrics.export()
+
+            run_at = next_run(
+                started,
+                settings["daemon_interval_minutes"],
+                cron,
+                settings["daemon_jitter_seconds"],
+            )
+            print(f"[daemon] 다음 동기화: {run_at:%Y-%m-%d %H:%M:%S}")
+            stop.wait(max(0.0, (run_at - datetime.now()).total_seconds()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        state["session"].close()
+        print("[daemon] 종료")
+
+
+def _run_login(settings: dict, cache: SessionCache | None) -> None:
+    """login 명령: 캘린더 세션과 팀별 JWT를 (캐시가 유효하지 않으면 새로) 받아 세션 캐시에 저장"""
+    if cache is None:
+        print("[login] ⚠️  [cache] enabled = false 이므로 로그인 결과가 저장되지 않습니다")
+    teams = _build_teams(settings, refresh_metadata=False)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-login") as executor:
+        api_ready = executor.submit(_login_teams, teams, cache)
+        with span("calendar.open_session"):
+            session, member_list = _open_calendar_session(settings, cache)
+        api_ready.result()
+    session.close()
+    print(f"[login] ✅ 캘린더(팀원 {len(member_list)}명)와 API 팀 {len(teams)}개 로그인 완료")
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    settings = _load_settings()
+    print(f"[config] 설정 파일 로드: {settings['config_path']}")
+    metrics.configure(json_log=settings["metrics_json_log"], textfile=settings["metrics_textfile"])
+    if settings["calendar_http2"]:
+        enable_http2()
+    cache = _build_session_cache(settings)
+
+    if args.daemon:
+        _run_daemon(settings, args, cache)
+        return
+
+    try:
+        if args.resume:
+            # 캘린더 로그인 없이 백엔드 로그인 + 작업 기록의 남은 쓰기만
+            teams = _build_teams(settings, args.refresh_metadata)
+            _login_teams(teams, cache)
+            _run_resume(teams)
+            return
+        if args.command == "login":
+            _run_login(settings, cache)
+            return
+
+        # API 클라이언트 초기화: 로그인/메타데이터 조회는 캘린더 로그인(2FA 대기)과 동시에
+        print("\n[api] Initializing API client...")
+        teams = _build_teams(settings, args.refresh_metadata)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-warmup") as warmup:
+            api_ready = warmup.submit(_warm_up_teams, teams, cache)
+            with span("calendar.open_session"):
+                session, member_list = _open_calendar_session(settings, cache)
+
+            # 등록
+            try:
+                api_ready.result()
+                if args.plan:
+                    _run_plan(session, member_list, teams, args.plan_json)
+                elif args.date_from is not None:
+                    _run_backfill(session, member_list, teams, args.date_from, args.date_to)
+                else:
+                    _sync_teams(session, member_list, teams)
             except Exception as e:
                 print(f"\n[api] ❌ API registration failed: {e}")
                 import traceback
                 traceback.print_exc()
-        else:
-            print("\n[calendar] No schedules to register")
-            
-    except Exception as e:
-        print(f"[calendar] 조회 실패: {e}")
-
+    finally:
+        metrics.export()
 
 if __name__ == "__main__":
     main()
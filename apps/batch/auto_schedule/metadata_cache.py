@@ -0,0 +1,89 @@
+"""
+On-disk cache for rarely changing backend metadata (users, attendance types).
+
+Entries are served straight from disk while younger than the TTL. After
+that the client revalidates with If-None-Match, so an unchanged list costs
+one 304 round trip instead of the full payload (the backend's Express
+layer already emits ETags and answers 304 for GET requests).
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class MetadataCache:
+    """JSON store of {url: etag, fetched_at, data} with TTL and LRU eviction (thread-safe)."""
+
+    def __init__(self, path: Path, ttl: float = 3600, max_entries: int = 32):
+        """
+        Initialize metadata cache.
+
+        Args:
+            path: Cache file path (e.g., <base_dir>/metadata_cache.json)
+            ttl: Seconds an entry is used without revalidation (0 = always revalidate)
+            max_entries: Least recently used entries beyond this are evicted on save
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = self._read()
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[cache] 메타데이터 캐시를 읽을 수 없어 무시합니다: {e}")
+            return {}
+
+    def _write(self) -> None:
+        entries = sorted(self._entries.items(), key=lambda item: item[1].get("used_at", 0))
+        self._entries = dict(entries[-self.max_entries :])
+        # 호출마다 고유한 임시 파일 (같은 파일을 쓰는 다른 팀/프로세스와 임시 파일이 겹치지 않도록)
+        tmp_name = None
+        try:
+            fd, tmp_name = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=self.path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self._entries, ensure_ascii=False))
+            os.replace(tmp_name, self.path)
+        except OSError as e:
+            print(f"[cache] 메타데이터 캐시 저장 실패: {e}")
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the entry for `key` ({etag, fetched_at, data}) or None."""
+        return self._entries.get(key)
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        """True if `entry` is younger than the TTL and can skip revalidation."""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def put(self, key: str, data: Any, etag: Optional[str]) -> None:
+        """Store a freshly downloaded payload."""
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {"etag": etag, "fetched_at": now, "used_at": now, "data": data}
+            self._write()
+
+    def touch(self, key: str) -> None:
+        """Mark `key` as revalidated by a 304, restarting its TTL."""
+        with self._lock:
+            entry = self._entries[key]
+            entry["fetched_at"] = entry["used_at"] = time.time()
+            self._write()
+
+    def clear(self) -> None:
+        """Drop every entry (--refresh-metadata)."""
+        with self._lock:
+            self._entries = {}
+            self._write()
@@ -0,0 +1,232 @@
+"""
+Run instrumentation: timed spans, HTTP counters and exports.
+
+Every phase of a run is wrapped in `span("phase.name")` and every
+requests.Session used by the batch is passed to `instrument_session`, so
+a run can be broken down into Chrome start, 2FA wait, calendar fetch,
+registration, ... together with per-endpoint status codes, bytes and 429
+counts. Results go to
+
+- a JSON-lines log (one object per span / HTTP request), and
+- a Prometheus textfile (node_exporter textfile collector / OpenMetrics
+  text format) with per-phase count, sum and p50/p95 for the run,
+
+both optional ([metrics] in config.ini). Console output is unchanged.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+PREFIX = "auto_schedule"
+
+# /attendances/3f2a...-... -> /attendances/:id (라벨 종류가 무한히 늘어나지 않도록)
+_ID_SEGMENT_RE = re.compile(r"/(?:[0-9a-fA-F-]{16,}|\d+)(?=/|$)")
+
+
+def _quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _label_text(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metrics:
+    """Thread-safe in-memory registry for one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: dict[tuple, list[float]] = defaultdict(list)
+        self._counters: dict[tuple, float] = defaultdict(float)
+        self._json_log: Optional[Path] = None
+        self._textfile: Optional[Path] = None
+        self.started_at = time.time()
+
+    def configure(self, json_log: Optional[Path] = None, textfile: Optional[Path] = None) -> None:
+        """Enable the JSON-lines log and/or the Prometheus textfile export."""
+        self._json_log = Path(json_log) if json_log else None
+        self._textfile = Path(textfile) if textfile else None
+
+    def reset(self) -> None:
+        """Start a new run (상주 모드에서 주기마다 호출)."""
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def _log(self, record: dict[str, Any]) -> None:
+        if not self._json_log:
+            return
+        line = json.dumps({"ts": round(time.time(), 3), **record}, ensure_ascii=False)
+        try:
+            with self._lock, self._json_log.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"[metrics] JSON 로그 기록 실패: {e}")
+            self._json_log = None
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add `value` to counter `name` with `labels`."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Record one duration sample for `name`."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._durations[key].append(seconds)
+
+    @contextmanager
+    def span(self, name: str, **labels: str) -> Iterator[dict[str, Any]]:
+        """
+        Time a phase.
+
+        The yielded dict can be filled with extra fields for the JSON log
+        (e.g. item counts). Exceptions are recorded as status="error" and
+        re-raised.
+        """
+        fields: dict[str, Any] = {}
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield fields
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            self.observe("phase", seconds, phase=name, **labels)
+            if status == "error":
+                self.inc("phase_errors_total", phase=name, **labels)
+            self._log({
+                "event": "span",
+                "name": name,
+                "duration_ms": round(seconds * 1000, 1),
+                "status": status,
+                **labels,
+                **fields,
+            })
+
+    def record_http(self, component: str, response: requests.Response, stream: bool = False) -> None:
+        """
+        requests response hook 본문 (instrument_session 참고).
+
+        stream=True 응답은 본문을 읽지 않으므로 Content-Length가 없으면 bytes를 호출부에서 센다.
+        """
+        request = response.request
+        path = _ID_SEGMENT_RE.sub("/:id", urlsplit(request.url).path)
+        labels = {"component": component, "method": request.method, "path": path}
+        status = str(response.status_code)
+        seconds = response.elapsed.total_seconds()
+        size = response.headers.get("Content-Length")
+        if size is None and not stream:
+            size = len(response.content or b"")
+        self.inc("http_requests_total", status=status, **labels)
+        self.observe("http_request", seconds, **labels)
+        if size is not None:
+            self.inc("http_response_bytes_total", float(size), **labels)
+        if response.status_code == 429:
+            self.inc("http_429_total", **labels)
+        self._log({
+            "event": "http",
+            "status": response.status_code,
+            "duration_ms": round(seconds * 1000, 1),
+            "bytes": int(size) if size is not None else None,
+            **labels,
+        })
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """phase -> {count, sum, p50, p95} (콘솔/JSON 로그용)"""
+        with self._lock:
+            items = [(dict(labels)["phase"], values[:]) for (name, labels), values in self._durations.items() if name == "phase"]
+        merged: dict[str, list[float]] = defaultdict(list)
+        for phase, values in items:
+            merged[phase].extend(values)
+        return {
+            phase: {
+                "count": len(values),
+                "sum": round(sum(values), 3),
+                "p50": round(_quantile(values, 0.5), 3),
+                "p95": round(_quantile(values, 0.95), 3),
+            }
+            for phase, values in merged.items()
+        }
+
+    def render(self) -> str:
+        """Prometheus text exposition of the current run."""
+        lines = [
+            f"# HELP {PREFIX}_run_timestamp_seconds Start time of the last run.",
+            f"# TYPE {PREFIX}_run_timestamp_seconds gauge",
+            f"{PREFIX}_run_timestamp_seconds {self.started_at:.3f}",
+            f"# HELP {PREFIX}_run_duration_seconds Wall time of the last run.",
+            f"# TYPE {PREFIX}_run_duration_seconds gauge",
+            f"{PREFIX}_run_duration_seconds {time.time() - self.started_at:.3f}",
+        ]
+        with self._lock:
+            durations = {key: values[:] for key, values in self._durations.items()}
+            counters = dict(self._counters)
+
+        for metric in sorted({name for name, _ in durations}):
+            full = f"{PREFIX}_{metric}_seconds"
+            lines += [f"# HELP {full} Duration of {metric} in the last run.", f"# TYPE {full} summary"]
+            for (name, labels), values in sorted(durations.items()):
+                if name != metric:
+                    continue
+                label_map = dict(labels)
+                for q in (0.5, 0.95):
+                    lines.append(f"{full}{_label_text({**label_map, 'quantile': str(q)})} {_quantile(values, q):.6f}")
+                lines.append(f"{full}_sum{_label_text(label_map)} {sum(values):.6f}")
+                lines.append(f"{full}_count{_label_text(label_map)} {len(values)}")
+
+        for metric in sorted({name for name, _ in counters}):
+            full = f"{PREFIX}_{metric}"
+            lines += [f"# HELP {full} {metric.replace('_', ' ')} in the last run.", f"# TYPE {full} counter"]
+            for (name, labels), value in sorted(counters.items()):
+                if name == metric:
+                    lines.append(f"{full}{_label_text(dict(labels))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> None:
+        """Write the textfile (atomically) and a run summary to the JSON log."""
+        self._log({"event": "run", "duration_ms": round((time.time() - self.started_at) * 1000, 1), "phases": self.summary()})
+        if not self._textfile:
+            return
+        tmp_path = self._textfile.with_suffix(self._textfile.suffix + ".tmp")
+        try:
+            tmp_path.write_text(self.render(), encoding="utf-8")
+            os.replace(tmp_path, self._textfile)
+        except OSError as e:
+            print(f"[metrics] Prometheus textfile 기록 실패: {e}")
+
+
+metrics = Metrics()
+span = metrics.span
+
+
+def instrument_session(session: requests.Session, component: str) -> requests.Session:
+    """Record every response of `session` (status, latency, bytes, 429) under `component`."""
+    def _hook(response: requests.Response, *args, **kwargs) -> None:
+        metrics.record_http(component, response, stream=bool(kwargs.get("stream")))
+
+    session.hooks["response"].append(_hook)
+    return session
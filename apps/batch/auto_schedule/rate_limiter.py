@@ -0,0 +1,87 @@
+"""
+Adaptive token-bucket rate limiter shared by concurrent API workers.
+
+All workers draw tokens from one bucket. When any worker sees a 429 the
+bucket halves its refill rate and pauses every worker until the backoff
+expires, then slowly climbs back to the configured rate on success.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class AdaptiveTokenBucket:
+    """Thread-safe token bucket with multiplicative backoff on 429."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        min_rate: float = 0.5,
+        recovery: float = 0.5,
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Maximum sustained requests per second
+            burst: Bucket capacity (defaults to max(1, rate))
+            min_rate: Lower bound the rate may shrink to while backing off
+            recovery: Requests/second added back after each success
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.recovery = float(recovery)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last
+        self._last = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def acquire(self) -> None:
+        """Block until a token is available (and no shared backoff is active)."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a 429 response: halve the rate and pause all workers.
+
+        Args:
+            retry_after: Server-provided wait in seconds, if any
+
+        Returns:
+            Seconds every worker will wait before the next request
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            wait = retry_after if retry_after is not None else 1.0 / self.rate
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + wait)
+            self._tokens = 0.0
+            self._last = now
+            return self._paused_until - now
+
+    def reward(self) -> None:
+        """Record a successful request: additively restore the rate."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.recovery)
@@ -0,0 +1,255 @@
+"""
+Shared retry policy and circuit breaker for outgoing HTTP calls.
+
+One RetryPolicy is shared by every call of a client (APIClient, calendar
+chunk fetches), so all calls agree on
+
+- what is retried: connection errors, timeouts and 408/429/5xx responses
+  (4xx answers are final),
+- how long to wait: the server's Retry-After when given, otherwise
+  decorrelated jitter (sleep = uniform(base, previous * 3), capped), so
+  concurrent workers do not retry in lock-step,
+- when to stop: after a run of failures the circuit breaker opens and
+  calls fail immediately with CircuitOpenError instead of each worker
+  sleeping through its own retries; after reset_timeout a single probe
+  call decides whether it closes again.
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+import requests
+
+from metrics import metrics
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# 연결/타임아웃/본문 수신 중 끊김
+TRANSIENT_ERRORS: tuple = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+def parse_retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """
+    Read the Retry-After header (delta-seconds or HTTP-date).
+
+    Args:
+        response: HTTP response, if any
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker (closed / open / half-open)."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Label for logs and metrics (e.g., "api", "calendar")
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before letting one probe through
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """True if a call may be sent now (while half-open only one probe at a time)."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                print(f"[{self.name}] 회로 차단 해제 (백엔드 응답 확인)")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """End a half-open probe that failed for a reason unrelated to the backend."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+                if self._opened_at is None:
+                    print(
+                        f"[{self.name}] ⛔ 연속 {self._failures}회 실패 - {self.reset_timeout:.0f}초 동안 요청 차단"
+                    )
+                    metrics.inc("circuit_open_total", component=self.name)
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class RetryPolicy:
+    """Retry loop with Retry-After, decorrelated jitter and an optional circuit breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_exceptions: tuple = TRANSIENT_ERRORS,
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            name: Label for logs and metrics; retries are counted as
+                  `<name>_retries_total{reason=...}`
+            max_attempts: Attempts per call including the first one
+            base_delay: Minimum backoff in seconds
+            max_delay: Upper bound for any single wait (also caps Retry-After)
+            breaker: Circuit breaker shared by all calls (None = no breaker)
+            retry_exceptions: Non-HTTP exceptions that are worth retrying
+        """
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.breaker = breaker
+        self.retry_exceptions = retry_exceptions
+
+    def backoff(self, previous: float) -> float:
+        """Decorrelated jitter: uniform(base, previous * 3), capped at max_delay."""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def call(
+        self,
+        action: Callable[[], Any],
+        max_attempts: Optional[int] = None,
+        on_throttle: Optional[Callable[[float], float]] = None,
+        label: str = "",
+    ) -> Any:
+        """
+        Run `action` until it succeeds or the policy gives up.
+
+        `action` performs one request and raises (raise_for_status) on an
+        error response.
+
+        Args:
+            action: Zero-argument callable performing one attempt
+            max_attempts: Override the policy's attempt count for this call
+            on_throttle: Called with the wait on 429 (e.g. a shared rate
+                         limiter's penalize); returns the wait to apply
+            label: Extra context for the retry log line
+
+        Returns:
+            Result of `action`
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            requests.RequestException: Last error once retries are exhausted
+                                       or the error is not retryable
+        """
+        attempts = max(1, max_attempts or self.max_attempts)
+        delay = self.base_delay
+        context = f" ({label})" if label else ""
+        for attempt in range(1, attempts + 1):
+            if self.breaker and not self.breaker.allow():
+                metrics.inc("circuit_rejected_total", component=self.name)
+                raise CircuitOpenError(f"{self.name} circuit open{context}")
+            try:
+                result = action()
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else 0
+                if status >= 500 or status == 0:
+                    self._failure()
+                else:
+                    self._success()
+                if status not in RETRY_STATUSES or attempt == attempts:
+                    raise
+                retry_after = parse_retry_after(e.response)
+                delay = self.backoff(delay)
+                wait = min(self.max_delay, retry_after) if retry_after is not None else delay
+                if status == 429:
+                    if on_throttle:
+                        wait = on_throttle(wait)
+                    print(f"[{self.name}]   Rate limited{context}, waiting {wait:.1f}s...")
+                    reason = "429"
+                else:
+                    print(f"[{self.name}]   ⚠️  Attempt {attempt}/{attempts} got {status}{context}, retrying in {wait:.1f}s...")
+                    reason = str(status)
+            except self.retry_exceptions as e:
+                self._failure()
+                if attempt == attempts:
+                    raise
+                delay = self.backoff(delay)
+                wait = delay
+                print(f"[{self.name}]   ⚠️  Attempt {attempt}/{attempts} failed{context}, retrying in {wait:.1f}s: {e}")
+                reason = "error"
+            except BaseException:
+                self._release()
+                raise
+            else:
+                self._success()
+                return result
+            metrics.inc(f"{self.name}_retries_total", reason=reason)
+            time.sleep(wait)
+
+    def _success(self) -> None:
+        if self.breaker:
+            self.breaker.record_success()
+
+    def _failure(self) -> None:
+        if self.breaker:
+            self.breaker.record_failure()
+
+    def _release(self) -> None:
+        if self.breaker:
+            self.breaker.release()
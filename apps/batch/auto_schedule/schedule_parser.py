@@ -0,0 +1,113 @@
+"""
+Single-pass parser for calendar schedule summaries.
+
+A summary looks like `[타입]내용-이름` (content optional: `[휴가]-이름`).
+parse_schedule() locates the bracket and the name separator once and
+returns a compact ParsedSchedule with the dates already converted to
+datetime.date (cached, since a window only spans a few dozen days).
+"""
+import re
+from datetime import date
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# 이름 앞 구분자: - (없으면 –, —), 앞뒤 공백 무시
+_SEPARATOR_RE = re.compile(r"\s*[-–—]\s*")
+
+
+class ParsedSchedule(NamedTuple):
+    type: str
+    user_name: str
+    content: Optional[str]
+    start_date: Optional[date]
+    end_date: Optional[date]
+    member_id: Optional[str]
+
+
+# ParsedSchedule._make보다 가벼운 생성 경로 (필드 검증 없이 튜플 그대로)
+_new = tuple.__new__
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(value: str) -> Optional[date]:
+    """'2025-11-13 13:00' -> date(2025, 11, 13) (원문 그대로 캐시 키로 써서 슬라이싱도 생략)"""
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def _split_name(rest: str, known_names: Optional[frozenset]) -> tuple[str, str]:
+    """'내용-이름' -> ('내용', '이름'). 구분자가 없으면 ('', '')"""
+    last = rest.rfind("-")
+    if last < 0:
+        # 일반 하이픈이 전혀 없을 때만 –, — 를 구분자로 본다
+        last = max(rest.rfind("–"), rest.rfind("—"))
+        if last < 0:
+            return "", ""
+    name = rest[last + 1 :].strip()
+    if known_names and name not in known_names:
+        # 이름에 하이픈이 있는 경우(예: Jean-Luc) 알려진 이름과 일치하는 가장 긴 꼬리를 이름으로
+        for sep in _SEPARATOR_RE.finditer(rest):
+            candidate = rest[sep.end() :].strip()
+            if candidate in known_names:
+                return rest[: sep.start()].strip(), candidate
+    return rest[:last].strip(), name
+
+
+def parse_summary(
+    summary: str, known_names: Optional[frozenset] = None
+) -> tuple[str, str, Optional[str]]:
+    """
+    일정 제목을 (타입, 이름, 내용)으로 분리.
+
+    예: '[출장]스틸샵 A-B 라인 협의-이경봉' -> ('출장', '이경봉', '스틸샵 A-B 라인 협의')
+        '[휴가]-손병진' -> ('휴가', '손병진', None)
+    """
+    if not summary.startswith("["):
+        return "", "", None
+    close = summary.find("]")
+    if close < 0:
+        # 닫는 ]가 없는 경우: 전체를 타입으로 본다 (이전 동작과 동일)
+        return summary[1:], _split_name(summary, known_names)[1], None
+    content, user_name = _split_name(summary[close + 1 :], known_names)
+    return summary[1:close], user_name, content or None
+
+
+def parse_schedule(
+    schedule: dict, known_names: Optional[frozenset] = None
+) -> ParsedSchedule:
+    """
+    _iter_bracket_events 결과 한 건을 ParsedSchedule로 변환.
+
+    흔한 형태(`[타입]내용-이름`)는 partition/rpartition만으로 처리하고,
+    나머지(–/— 구분자, 알려지지 않은 이름, 닫는 ] 없음)만 parse_summary로 넘긴다.
+
+    Args:
+        schedule: {"summary", "startDate", "endDate", "memberId", ...}
+        known_names: 등록된 사용자 이름 (이름에 하이픈이 있을 때만 필요)
+    """
+    summary = schedule.get("summary", "")
+    head, bracket, rest = summary.partition("]")
+    content, dash, user_name = rest.rpartition("-")
+    user_name = user_name.strip()
+    if known_names and user_name not in known_names:
+        # 이름 자체에 하이픈이 하나 있는 경우 (예: Jean-Luc)
+        before, _, first = content.rpartition("-")
+        if f"{first.strip()}-{user_name}" in known_names:
+            content, user_name = before, f"{first.strip()}-{user_name}"
+        else:
+            dash = ""
+    if bracket and dash and head[:1] == "[":
+        schedule_type, content = head[1:], content.strip() or None
+    else:
+        schedule_type, user_name, content = parse_summary(summary, known_names)
+    start, end = schedule.get("startDate"), schedule.get("endDate")
+    return _new(ParsedSchedule, (
+        schedule_type,
+        user_name,
+        content,
+        _parse_day(start) if start else None,
+        _parse_day(end) if end else None,
+        schedule.get("memberId"),
+    ))
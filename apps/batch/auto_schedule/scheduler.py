@@ -0,0 +1,89 @@
+"""
+Run-time computation for the --daemon mode.
+
+A cycle is scheduled either every N minutes or by a standard 5-field cron
+expression (minute hour day-of-month month day-of-week), with an optional
+random delay so several instances do not hit IRIS at the same second.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+# (최소, 최대) - 분 시 일 월 요일(0/7=일요일)
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(field: str, low: int, high: int) -> frozenset:
+    """'*/15', '1-5', '0,30', '9-18/3' -> 허용 값 집합"""
+    values = set()
+    for part in field.split(","):
+        expr, _, step = part.partition("/")
+        if expr == "*":
+            start, end = low, high
+        elif "-" in expr:
+            start, end = (int(v) for v in expr.split("-", 1))
+        else:
+            start = end = int(expr)
+            if step:
+                end = high
+        step_value = int(step) if step else 1
+        if not (low <= start <= end <= high) or step_value < 1:
+            raise ValueError(f"cron 필드 범위 오류: {part} ({low}-{high})")
+        values.update(range(start, end + 1, step_value))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """Minimal 5-field cron expression (no names, no @macros)."""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 식은 5개 필드여야 합니다: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+        )
+        # cron은 일요일을 0과 7 둘 다 허용, Python weekday()는 월=0 ... 일=6
+        self.weekdays = frozenset((d - 1) % 7 for d in weekdays)
+        # 일/요일이 둘 다 지정되면 둘 중 하나만 맞아도 실행 (표준 cron 동작)
+        self._any_day = fields[2] == "*" or fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        return (day_ok and weekday_ok) if self._any_day else (day_ok or weekday_ok)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first matching minute strictly after `moment`."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"cron 식이 실행 시각을 만들지 않습니다: {self.expression!r}")
+
+
+def next_run(
+    now: datetime,
+    interval_minutes: float,
+    cron: Optional[CronSchedule] = None,
+    jitter_seconds: float = 0,
+) -> datetime:
+    """
+    다음 동기화 시각 계산.
+
+    Args:
+        now: 기준 시각 (직전 실행 시작 시각)
+        interval_minutes: cron이 없을 때 실행 간격
+        cron: 설정된 cron 식 (있으면 interval보다 우선)
+        jitter_seconds: 0 ~ jitter_seconds 사이 임의 지연
+    """
+    base = cron.next_after(now) if cron else now + timedelta(minutes=interval_minutes)
+    return base + timedelta(seconds=random.uniform(0, jitter_seconds))
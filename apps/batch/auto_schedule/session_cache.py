@@ -0,0 +1,101 @@
+"""
+Encrypted on-disk cache for login sessions.
+
+Stores the calendar.worksmobile.com cookies and the backend JWT between
+runs so a warm run can skip Selenium and the 2FA mail round trip. Every
+entry carries an absolute expiry; callers still probe the session with a
+cheap request before trusting it.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+
+class SessionCache:
+    """Fernet-encrypted JSON store of named session entries."""
+
+    def __init__(self, path: Path, key: Optional[str] = None):
+        """
+        Initialize session cache.
+
+        Args:
+            path: Cache file path (e.g., <base_dir>/session_cache.bin)
+            key: Fernet key; if omitted, one is generated and kept in
+                 `<path>.key` next to the cache file
+        """
+        self.path = Path(path)
+        # 캘린더 로그인(메인 스레드)과 API 로그인(워밍업 스레드)이 같은 파일을 읽고 고쳐 쓴다
+        self._lock = threading.Lock()
+        self._fernet = Fernet(key.encode() if key else self._load_or_create_key())
+
+    def _load_or_create_key(self) -> bytes:
+        key_path = self.path.with_suffix(self.path.suffix + ".key")
+        if key_path.exists():
+            return key_path.read_bytes().strip()
+        key = Fernet.generate_key()
+        _write_private(key_path, key)
+        return key
+
+    def _read_all(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self._fernet.decrypt(self.path.read_bytes()))
+        except (InvalidToken, ValueError, OSError) as e:
+            print(f"[cache] 세션 캐시를 읽을 수 없어 무시합니다: {e}")
+            return {}
+
+    def _write_all(self, entries: dict[str, Any]) -> None:
+        token = self._fernet.encrypt(json.dumps(entries).encode())
+        _write_private(self.path, token)
+
+    def load(self, name: str) -> Optional[Any]:
+        """Return cached data for `name`, or None if missing or expired."""
+        with self._lock:
+            entry = self._read_all().get(name)
+        if not entry:
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            print(f"[cache] {name} 세션 만료")
+            return None
+        return entry.get("data")
+
+    def save(self, name: str, data: Any, expires_at: float) -> None:
+        """Store `data` under `name` until the epoch timestamp `expires_at`."""
+        with self._lock:
+            entries = {
+                key: entry
+                for key, entry in self._read_all().items()
+                if entry.get("expires_at", 0) > time.time()
+            }
+            entries[name] = {"expires_at": expires_at, "data": data}
+            self._write_all(entries)
+
+    def invalidate(self, name: str) -> None:
+        """Drop the entry for `name` (e.g. after the server rejected it)."""
+        with self._lock:
+            entries = self._read_all()
+            if entries.pop(name, None) is not None:
+                self._write_all(entries)
+
+
+def _write_private(path: Path, content: bytes) -> None:
+    """Atomically write `content` readable only by the current user."""
+    # 호출마다 고유한 임시 파일 (mkstemp는 0600으로 만든다)
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
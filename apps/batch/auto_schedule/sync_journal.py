@@ -0,0 +1,164 @@
+"""
+Write-ahead journal of backend writes for crash recovery (--resume).
+
+Before a sync sends its first write, the whole plan (every create /
+update / delete, plus the range delete of replace mode) is written to a
+JSON-lines journal and fsync'd. Each finished operation then appends a
+"done" line. If the process dies part-way (e.g. after the range delete
+but before all creates), the journal still lists exactly what is left,
+and `--resume` replays only those operations without a calendar login
+or a destructive re-sync.
+
+Every operation gets an idempotency key derived from the run, its
+position in the plan and its payload. Creates send it as the
+Idempotency-Key header (bulk chunks send a key derived from their
+operations' keys), so a replay that hits the backend's idempotency
+window returns the first result instead of writing twice. Done lines are
+flushed but not fsync'd: a lost one only makes --resume re-check that
+operation against the backend, which it does before replaying anyway.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+def operation_key(run_id: str, index: int, action: str, attendance_id: Optional[str], payload: Any) -> str:
+    """Idempotency key of one planned operation (stable across retries and --resume of the run)."""
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    material = "\x1f".join((run_id, str(index), action, attendance_id or "", body))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+def chunk_key(keys: Iterable[str]) -> str:
+    """Idempotency key of a bulk request made of the operations with `keys`."""
+    return hashlib.sha256("\x1f".join(keys).encode("utf-8")).hexdigest()[:32]
+
+
+class SyncJournal:
+    """JSON-lines write-ahead log of the latest sync's planned and completed operations."""
+
+    def __init__(self, path: Path, scope: str):
+        """
+        Initialize sync journal.
+
+        Args:
+            path: Journal file path (e.g., <base_dir>/sync_journal.jsonl)
+            scope: Identifies the target (API URL, account, team); a journal
+                   written for another scope is ignored
+        """
+        self.path = Path(path)
+        self.scope = scope
+        self.run_id: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def begin(
+        self,
+        start_date: str,
+        end_date: str,
+        mode: str,
+        operations: list[tuple[str, Optional[str], Optional[dict[str, Any]]]],
+    ) -> list[str]:
+        """
+        Start a new run: replace the journal with the full plan (fsync'd).
+
+        The previous run's unfinished operations are dropped; the new plan
+        was computed from the backend's current state and supersedes them.
+
+        Args:
+            start_date: Sync window start (YYYY-MM-DD)
+            end_date: Sync window end (YYYY-MM-DD)
+            mode: "reconcile" or "replace"
+            operations: (action, attendance id, payload) in apply order;
+                        actions are create / update / delete / delete_range
+
+        Returns:
+            Idempotency key of each operation (same order)
+        """
+        self.run_id = uuid.uuid4().hex
+        header = {
+            "type": "begin",
+            "scope": self.scope,
+            "run": self.run_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "mode": mode,
+            "at": time.time(),
+        }
+        keys = []
+        lines = [json.dumps(header, ensure_ascii=False)]
+        for index, (action, attendance_id, payload) in enumerate(operations):
+            key = operation_key(self.run_id, index, action, attendance_id, payload)
+            keys.append(key)
+            entry = {"type": "op", "key": key, "action": action, "id": attendance_id, "payload": payload}
+            lines.append(json.dumps(entry, ensure_ascii=False))
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        return keys
+
+    def mark_done(self, keys: Iterable[str]) -> None:
+        """Record finished operations (flushed, not fsync'd)."""
+        keys = list(keys)
+        if not keys:
+            return
+        line = json.dumps({"type": "done", "keys": keys}) + "\n"
+        with self._lock:
+            try:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                print(f"[journal] ⚠️  완료 기록 실패 (--resume 시 백엔드와 다시 비교): {e}")
+
+    def pending(self) -> Optional[dict[str, Any]]:
+        """
+        Unfinished operations of the journaled run.
+
+        Returns:
+            {"run", "start_date", "end_date", "mode", "operations": [{"key",
+            "action", "id", "payload"}, ...], "done_actions": {action, ...}}
+            or None if nothing is left
+        """
+        if not self.path.exists():
+            return None
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            print(f"[journal] 작업 기록을 읽을 수 없습니다: {e}")
+            return None
+        header: Optional[dict[str, Any]] = None
+        operations: dict[str, dict[str, Any]] = {}
+        done_actions: set[str] = set()
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 중단 중에 잘린 마지막 줄
+            if entry.get("type") == "begin":
+                header = entry
+            elif entry.get("type") == "op":
+                operations[entry["key"]] = entry
+            elif entry.get("type") == "done":
+                for key in entry["keys"]:
+                    finished = operations.pop(key, None)
+                    if finished is not None:
+                        done_actions.add(finished["action"])
+        if header is None or header.get("scope") != self.scope or not operations:
+            return None
+        self.run_id = header["run"]
+        return {
+            "run": header["run"],
+            "start_date": header["start_date"],
+            "end_date": header["end_date"],
+            "mode": header["mode"],
+            "operations": list(operations.values()),
+            "done_actions": done_actions,
+        }
@@ -0,0 +1,92 @@
+"""
+Diff-based reconciliation between calendar schedules and backend attendances.
+
+Both sides are keyed on (userId, typeId, startDate, endDate, content).
+Exact matches are left alone; the remaining records are paired on
+(userId, typeId, startDate) to become updates, and whatever is left over
+becomes a create (calendar only) or a delete (backend only).
+
+The backend side is consumed as a stream (one page at a time): exact
+matches are dropped as they arrive, so only the records that will be
+updated or deleted are held in memory.
+"""
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+AttendanceKey = tuple[str, str, str, str, str]
+
+
+def _date_only(value: Any) -> str:
+    """'2026-01-05', '2026-01-05 09:00', '2026-01-05T00:00:00.000Z' -> '2026-01-05'"""
+    return str(value or "")[:10]
+
+
+def attendance_key(record: dict[str, Any]) -> AttendanceKey:
+    """Payload 또는 백엔드 Attendance 객체에서 비교 키 생성"""
+    return (
+        str(record.get("userId") or ""),
+        str(record.get("typeId") or ""),
+        _date_only(record.get("startDate")),
+        _date_only(record.get("endDate")),
+        (record.get("content") or "").strip(),
+    )
+
+
+@dataclass
+class SyncPlan:
+    """Operations needed to make the backend match the calendar."""
+
+    creates: list[dict[str, Any]] = field(default_factory=list)
+    updates: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+    deletes: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    # 정확히 일치하지 않은 백엔드 레코드 (수정/삭제 대상, 계획 출력용)
+    stale: list[dict[str, Any]] = field(default_factory=list)
+
+
+def plan_sync(desired: list[dict[str, Any]], existing: Iterable[dict[str, Any]]) -> SyncPlan:
+    """
+    Compute the minimal create/update/delete set.
+
+    Args:
+        desired: Attendance payloads built from the calendar
+        existing: Attendances returned by GET /attendances for the window
+                  (any iterable, e.g. APIClient.iter_attendances_in_range)
+
+    Returns:
+        SyncPlan with the operations to issue
+    """
+    plan = SyncPlan()
+
+    # 1. 완전히 같은 레코드는 그대로 둔다 (중복 일정도 개수만큼 매칭, 일치한 레코드는 바로 버림)
+    wanted: dict[AttendanceKey, deque] = defaultdict(deque)
+    for payload in desired:
+        wanted[attendance_key(payload)].append(payload)
+    matched = set()
+    for record in existing:
+        payloads = wanted.get(attendance_key(record))
+        if payloads:
+            matched.add(id(payloads.popleft()))
+            plan.unchanged += 1
+        else:
+            plan.stale.append(record)
+    leftovers = [payload for payload in desired if id(payload) not in matched]
+
+    # 2. 같은 사람/유형/시작일이면 종료일·내용만 바뀐 것으로 보고 수정
+    loose: dict[tuple[str, str, str], list[dict[str, Any]]] = defaultdict(list)
+    for record in plan.stale:
+        loose[attendance_key(record)[:3]].append(record)
+
+    for payload in leftovers:
+        candidates = loose.get(attendance_key(payload)[:3])
+        if candidates:
+            plan.updates.append((candidates.pop()["id"], payload))
+        else:
+            plan.creates.append(payload)
+
+    # 3. 캘린더에 없는 나머지는 삭제
+    for records in loose.values():
+        plan.deletes.extend(record["id"] for record in records)
+
+    return plan
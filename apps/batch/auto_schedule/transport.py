@@ -0,0 +1,85 @@
+"""
+HTTP transport settings shared by the API and calendar sessions.
+
+- Connection pool sized to the worker count, with pool_block so extra
+  workers wait for a pooled keep-alive socket instead of opening (and
+  then discarding) one-off connections.
+- Accept-Encoding lists every decoder urllib3 has available, so br/zstd
+  are negotiated when `brotli`/`zstandard` are installed (gzip otherwise).
+- Large JSON request bodies can be gzip-compressed (Content-Encoding:
+  gzip); the NestJS backend (express body-parser) inflates them.
+- Optional HTTP/2 through urllib3's experimental support (needs `h2`).
+"""
+import gzip
+import json
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+_http2_enabled = False
+
+
+def accept_encoding() -> str:
+    """Accept-Encoding value for the decoders installed in this environment."""
+    return make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def configure_session(session: requests.Session, pool_size: int) -> requests.Session:
+    """
+    Mount a keep-alive pool of `pool_size` connections and set Accept-Encoding.
+
+    Args:
+        session: Session to configure (cookies/hooks are kept)
+        pool_size: Max pooled connections per host (match worker concurrency)
+
+    Returns:
+        The same session
+    """
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = accept_encoding()
+    return session
+
+
+def encode_json(payload: Any, compress_min_bytes: int = 0) -> tuple[bytes, dict[str, str]]:
+    """
+    Serialize `payload` as a JSON request body.
+
+    Args:
+        payload: JSON-serializable body
+        compress_min_bytes: Gzip bodies at least this large (0 = never)
+
+    Returns:
+        (body, headers to send with it)
+    """
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if compress_min_bytes and len(body) >= compress_min_bytes:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def enable_http2() -> bool:
+    """
+    Switch urllib3 HTTPS connections to HTTP/2 (process-wide, experimental).
+
+    Returns:
+        True if HTTP/2 is active, False if `h2` is missing or unsupported
+    """
+    global _http2_enabled
+    if _http2_enabled:
+        return True
+    try:
+        import urllib3.http2
+
+        urllib3.http2.inject_into_urllib3()
+    except ImportError as e:  # h2 미설치 / urllib3 < 2.3
+        print(f"[transport] HTTP/2를 사용할 수 없어 HTTP/1.1로 진행합니다: {e}")
+        return False
+    _http2_enabled = True
+    print("[transport] HTTP/2 사용 (실험적)")
+    return True
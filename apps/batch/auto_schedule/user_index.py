@@ -0,0 +1,219 @@
+"""
+User resolution index for calendar schedules.
+
+Maps the name parsed from a schedule title (and the calendar memberId)
+to a backend user id:
+
+1. alias from [aliases] (English names, nicknames, ...)
+2. exact normalized name (NFKC, no whitespace, casefold) - unique only
+3. calendar memberId, to split same-name users (learned from earlier
+   unique matches) or when pinned in [members]
+4. near match via a character-bigram index + edit distance, for longer
+   names only, and only when a single candidate is closest
+
+Everything except the fuzzy fallback is a dict lookup. The index is
+persisted as JSON so learned memberIds survive between runs, and
+update() only re-indexes users whose name or email changed.
+"""
+import json
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+
+def normalize_name(name: str) -> str:
+    """' 홍 길동 ' / 'Ｈｏｎｇ Gildong' -> '홍길동' / 'honggildong'"""
+    return "".join(unicodedata.normalize("NFKC", name or "").split()).casefold()
+
+
+def _bigrams(key: str) -> set[str]:
+    return {key[i : i + 2] for i in range(len(key) - 1)} or {key}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, stopping early once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _fuzzy_limit(key: str) -> int:
+    """허용 편집 거리 (한글 3글자 이름처럼 짧은 이름은 오매칭 위험이 커서 0)"""
+    if len(key) >= 10:
+        return 2
+    if len(key) >= 5:
+        return 1
+    return 0
+
+
+class UserIndex:
+    """Normalized-name / alias / memberId index over backend users."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        aliases: Optional[dict[str, str]] = None,
+        members: Optional[dict[str, str]] = None,
+    ):
+        """
+        Initialize user index.
+
+        Args:
+            path: JSON file to persist users and learned memberIds (None = memory only)
+            aliases: alias -> user id, email or registered name ([aliases])
+            members: calendar memberId -> user id, email or registered name ([members])
+        """
+        self.path = Path(path) if path else None
+        self._aliases = {normalize_name(k): v for k, v in (aliases or {}).items()}
+        self._pinned_members = {k.casefold(): v for k, v in (members or {}).items()}
+        self._users: dict[str, tuple[str, str]] = {}  # id -> (name, email)
+        self._members: dict[str, str] = {}  # memberId -> id (learned)
+        self._by_key: dict[str, set[str]] = defaultdict(set)
+        self._by_email: dict[str, str] = {}
+        self._by_bigram: dict[str, set[str]] = defaultdict(set)
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[users] 사용자 인덱스를 읽을 수 없어 새로 만듭니다: {e}")
+            return
+        for user_id, (name, email) in data.get("users", {}).items():
+            self._add(user_id, name, email)
+        self._members = dict(data.get("members", {}))
+
+    def save(self) -> None:
+        """변경 사항이 있으면 인덱스 파일에 저장"""
+        if not self.path or not self._dirty:
+            return
+        data = {
+            "users": {user_id: list(entry) for user_id, entry in self._users.items()},
+            "members": self._members,
+        }
+        self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        self._dirty = False
+
+    def _add(self, user_id: str, name: str, email: str) -> None:
+        key = normalize_name(name)
+        self._users[user_id] = (name, email)
+        self._by_key[key].add(user_id)
+        if email:
+            self._by_email[email.casefold()] = user_id
+        for gram in _bigrams(key):
+            self._by_bigram[gram].add(key)
+
+    def _remove(self, user_id: str) -> None:
+        name, email = self._users.pop(user_id)
+        key = normalize_name(name)
+        self._by_key[key].discard(user_id)
+        if not self._by_key[key]:
+            del self._by_key[key]
+            for gram in _bigrams(key):
+                self._by_bigram[gram].discard(key)
+        if email and self._by_email.get(email.casefold()) == user_id:
+            del self._by_email[email.casefold()]
+
+    def update(self, users: list[dict[str, Any]]) -> int:
+        """
+        get_users() 결과와 동기화 (바뀐 사용자만 재색인).
+
+        Returns:
+            Number of users added, changed or removed
+        """
+        current = {u["id"]: (u.get("name") or "", u.get("email") or "") for u in users}
+        changed = 0
+        for user_id in [uid for uid in self._users if self._users[uid] != current.get(uid)]:
+            self._remove(user_id)
+            changed += 1
+        for user_id, (name, email) in current.items():
+            if user_id not in self._users:
+                self._add(user_id, name, email)
+                changed += 1
+        stale = [m for m, uid in self._members.items() if uid not in self._users]
+        for member_id in stale:
+            del self._members[member_id]
+        if changed or stale:
+            self._dirty = True
+        return changed
+
+    @property
+    def names(self) -> frozenset:
+        """등록된 사용자 이름 원문 (schedule_parser known_names 용)"""
+        return frozenset(name for name, _ in self._users.values())
+
+    def _target(self, value: str) -> Optional[str]:
+        """[aliases]/[members] 값(사용자 id, 이메일, 이름)을 user id로"""
+        if value in self._users:
+            return value
+        if value.casefold() in self._by_email:
+            return self._by_email[value.casefold()]
+        ids = self._by_key.get(normalize_name(value), ())
+        return next(iter(ids)) if len(ids) == 1 else None
+
+    def _fuzzy(self, key: str) -> Optional[str]:
+        limit = _fuzzy_limit(key)
+        if limit == 0:
+            return None
+        candidates = set()
+        for gram in _bigrams(key):
+            candidates |= self._by_bigram.get(gram, set())
+        scored = sorted((_edit_distance(key, c, limit), c) for c in candidates)
+        scored = [(d, c) for d, c in scored if d <= limit]
+        if not scored or (len(scored) > 1 and scored[0][0] == scored[1][0]):
+            return None
+        ids = self._by_key[scored[0][1]]
+        return next(iter(ids)) if len(ids) == 1 else None
+
+    def _member_user(self, member_id: Optional[str]) -> Optional[str]:
+        if not member_id:
+            return None
+        pinned = self._pinned_members.get(member_id.casefold())
+        return self._target(pinned) if pinned else self._members.get(member_id)
+
+    def resolve(self, user_name: str, member_id: Optional[str] = None) -> tuple[Optional[str], str]:
+        """
+        일정의 사용자 이름/memberId를 user id로 변환.
+
+        memberId는 동명이인을 가르거나([members]로 지정한 경우) 이름이 없을 때만 쓴다.
+        공용 캘린더에 다른 사람 일정을 올리는 경우가 있어 이름보다 우선하지 않는다.
+
+        Returns:
+            (user id 또는 None, 매칭 방식: alias/exact/member/fuzzy/ambiguous/missing)
+        """
+        key = normalize_name(user_name)
+        if key in self._aliases:
+            user_id = self._target(self._aliases[key])
+            return (user_id, "alias") if user_id else (None, "missing")
+
+        ids = self._by_key.get(key, ())
+        if len(ids) == 1:
+            user_id = next(iter(ids))
+            # 확실한 매칭이면 memberId를 학습해 동명이인 구분에 쓴다
+            if member_id and self._members.get(member_id) != user_id:
+                self._members[member_id] = user_id
+                self._dirty = True
+            return user_id, "exact"
+
+        member_user = self._member_user(member_id)
+        if len(ids) > 1:
+            if member_user in ids:
+                return member_user, "member"
+            return None, "ambiguous"
+        if member_user and member_id and member_id.casefold() in self._pinned_members:
+            return member_user, "member"
+
+        user_id = self._fuzzy(key) if key else None
+        return (user_id, "fuzzy") if user_id else (None, "missing")
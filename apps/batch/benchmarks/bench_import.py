@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: cold start (import) cost of the entry point.
+
+Runs a fresh interpreter per round, so every import is cold (bytecode
+caches are warm, as in an installed build). Reports the wall time of
+`import main`, the slowest modules from `-X importtime`, and whether the
+login-only stacks (Selenium, IMAP) were loaded.
+
+    python benchmarks/bench_import.py [rounds]
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SOURCE_DIR = Path(__file__).resolve().parents[1] / "auto_schedule"
+LAZY_MODULES = ("selenium", "imaplib", "auth", "iris_http")
+PROBE = f"import sys, main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=SOURCE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _slowest_imports(limit: int = 10) -> list[tuple[int, str]]:
+    """-X importtime 출력에서 main이 직접 import한 모듈을 누적 시간(us) 순으로"""
+    stderr = _run("-X", "importtime", "-c", "import main").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:  # main 바로 아래 (들여쓰기 2칸)
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    loaded = _run("-c", PROBE).stdout.strip()
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _run("-c", "import main")
+        timings.append(time.perf_counter() - start)
+    baseline = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _run("-c", "pass")
+        baseline.append(time.perf_counter() - start)
+
+    interpreter = statistics.median(baseline)
+    total = statistics.median(timings)
+    print(f"{rounds} rounds")
+    print(f"interpreter      {interpreter * 1e3:8.1f} ms")
+    print(f"import main      {total * 1e3:8.1f} ms  (+{(total - interpreter) * 1e3:.1f} ms)")
+    print(f"lazy modules     {loaded or 'none loaded'}")
+    print("slowest imports of main (cumulative):")
+    for cumulative, name in _slowest_imports():
+        print(f"  {cumulative / 1e3:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
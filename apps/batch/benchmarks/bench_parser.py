@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: summary parsing cost per event.
+
+Compares the old multi-split helpers (inlined below for reference) with
+schedule_parser.parse_schedule on synthetic summaries. Each variant runs
+several rounds and the fastest one is reported, so a noisy host does not
+decide the comparison.
+
+    python benchmarks/bench_parser.py [count] [rounds]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "auto_schedule"))
+
+from schedule_parser import parse_schedule  # noqa: E402
+
+TYPES = ["휴가", "반차", "반반차", "출장", "외근", "재택"]
+NAMES = ["이경봉", "손병진", "김철수", "Jean-Luc", "박영희"]
+CONTENTS = ["", "스틸샵 시스템 업무 협의", "A-B 라인 점검", "고객사 미팅", "오후"]
+
+
+def _legacy_parse(schedule: dict) -> tuple:
+    """이전 구현: 제목을 여러 번 split 하고 날짜는 문자열로 유지"""
+    summary = schedule["summary"]
+    schedule_type = summary.split("]")[0][1:] if summary.startswith("[") else ""
+    user_name = summary.split("-")[-1].strip() if "-" in summary else ""
+    content = ""
+    if "]" in summary and "-" in summary:
+        parts = summary.split("]", 1)[1].rsplit("-", 1)
+        if len(parts) == 2:
+            content = parts[0].strip()
+    start = schedule["startDate"].split()[0] if " " in schedule["startDate"] else schedule["startDate"]
+    end = schedule["endDate"].split()[0] if " " in schedule["endDate"] else schedule["endDate"]
+    return schedule_type, user_name, content, start, end
+
+
+def _synthetic(count: int) -> list:
+    rng = random.Random(42)
+    schedules = []
+    for i in range(count):
+        day = 1 + i % 28
+        schedules.append({
+            "memberId": f"m{i % 500}",
+            "summary": f"[{rng.choice(TYPES)}]{rng.choice(CONTENTS)}-{rng.choice(NAMES)}",
+            "startDate": f"2026-01-{day:02d} 09:00",
+            "endDate": f"2026-01-{day:02d} 18:00",
+        })
+    return schedules
+
+
+def _bench(label: str, func, schedules: list, rounds: int) -> None:
+    elapsed = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for schedule in schedules:
+            func(schedule)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{label:<16} {elapsed * 1e3:8.1f} ms total  {elapsed / len(schedules) * 1e9:8.0f} ns/event")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    schedules = _synthetic(count)
+    known_names = frozenset(NAMES)
+    print(f"{count} synthetic summaries, best of {rounds} rounds")
+    _bench("legacy", _legacy_parse, schedules, rounds)
+    _bench("parse_schedule", parse_schedule, schedules, rounds)
+    _bench("+ known_names", lambda s: parse_schedule(s, known_names), schedules, rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,19 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 
+# 진입점: auto_schedule/main.py (sync/plan/login 명령). Selenium/IMAP은 main.py가 필요할 때만
+# import하지만 PyInstaller는 함수 안의 import도 따라가므로 번들에는 그대로 들어간다.
 a = Analysis(
-    ['auto_login\\main.py'],
-    pathex=[],
+    ['auto_schedule/main.py'],
+    pathex=['auto_schedule'],
     binaries=[],
     datas=[],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # 실행에 쓰지 않는 표준 라이브러리/개발 도구는 번들에서 제외
+    excludes=['tkinter', '_tkinter', 'unittest', 'doctest', 'pydoc', 'pytest', '_pytest', 'pytest_benchmark'],
     noarchive=False,
     optimize=0,
 )
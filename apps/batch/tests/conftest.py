@@ -0,0 +1,86 @@
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# auto_schedule 모듈은 실행 파일과 같은 폴더 기준의 평면 import를 쓴다 (import auth, from api_client ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "auto_schedule"))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="100k 이벤트 등 오래 걸리는 벤치마크도 실행",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: 오래 걸리는 벤치마크 (--run-slow로 실행)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="--run-slow 옵션이 필요합니다")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+class _Benchmark:
+    """
+    pytest-benchmark가 없을 때 쓰는 최소 대체품.
+
+    benchmark(fn, ...) / benchmark.pedantic(fn, setup=..., rounds=...)와
+    extra_info를 지원하고, 결과는 세션 끝에 표로 출력한다.
+    """
+
+    results: list = []
+
+    def __init__(self, name: str):
+        self.name = name
+        self.extra_info: dict = {}
+
+    def __call__(self, fn, *args, **kwargs):
+        return self.pedantic(fn, args=args, kwargs=kwargs, rounds=3)
+
+    def pedantic(self, fn, args=(), kwargs=None, setup=None, rounds=1, iterations=1, warmup_rounds=0):
+        timings = []
+        result = None
+        for round_index in range(warmup_rounds + rounds):
+            call_args, call_kwargs = args, kwargs or {}
+            if setup is not None:
+                prepared = setup()
+                if prepared is not None:
+                    call_args, call_kwargs = prepared
+            started = time.perf_counter()
+            for _ in range(iterations):
+                result = fn(*call_args, **call_kwargs)
+            if round_index >= warmup_rounds:
+                timings.append((time.perf_counter() - started) / iterations)
+        _Benchmark.results.append((self.name, timings, self.extra_info))
+        return result
+
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+
+    @pytest.fixture
+    def benchmark(request):
+        return _Benchmark(request.node.name)
+
+    def pytest_terminal_summary(terminalreporter):
+        if not _Benchmark.results:
+            return
+        terminalreporter.section("benchmark (fallback timer)")
+        for name, timings, extra in _Benchmark.results:
+            extra_text = " ".join(f"{key}={value}" for key, value in extra.items())
+            terminalreporter.write_line(
+                f"{name:<55} min {min(timings):8.3f}s  median {statistics.median(timings):8.3f}s  "
+                f"rounds {len(timings)}  {extra_text}"
+            )
@@ -0,0 +1,487 @@
+"""
+Local stand-ins for the services a sync talks to.
+
+- FakeCalendarServer: calendar.worksmobile.com individualUserList /
+  memberScheduleViewList over real HTTP (reach it through RedirectAdapter)
+- FakeBackendServer: the /api/v1 endpoints used by APIClient, with an
+  in-memory attendance table, configurable latency and 429 injection
+- FakeIMAP: in-process replacement for imaplib.IMAP4_SSL used by auth.py
+
+All of them are deterministic for a given seed so benchmark runs are
+comparable.
+"""
+import base64
+import gzip
+import imaplib
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.header import Header
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 대괄호 일정 비율을 실제 캘린더와 비슷하게 (일부는 교육/일반 일정이라 필터에서 빠짐)
+_SUMMARIES = [
+    "[휴가]-{name}",
+    "[반차]오후-{name}",
+    "[출장]스틸샵 A-B 라인 협의-{name}",
+    "[외근]고객사 미팅-{name}",
+    "[교육]보안 교육-{name}",
+    "주간 회의",
+]
+ATTENDANCE_TYPES = [
+    {"id": "type-annual", "code": "ANNUAL", "name": "연차", "category": "LEAVE"},
+    {"id": "type-trip", "code": "BUSINESS_TRIP", "name": "출장", "category": "WORK"},
+    {"id": "type-sick", "code": "SICK", "name": "병가", "category": "LEAVE"},
+]
+
+
+def member_name(index: int) -> str:
+    return f"사용자{index:05d}"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":  # express body-parser처럼 풀어서 처리
+            raw = gzip.decompress(raw)
+        return json.loads(raw or b"null")
+
+    def _send(self, status: int, data: Any = None, headers: Optional[dict] = None) -> None:
+        body = b"" if data is None else json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeCalendarServer(_Server):
+    """
+    calendar.worksmobile.com 대역.
+
+    Args:
+        total_events: 전체 일정 수 (팀원당 events_per_member개)
+        view_from: 일정을 배치할 기간 시작 ('YYYY-MM-DD HH:MM', main._get_date_range 형식)
+        latency: 요청당 지연(초)
+    """
+
+    def __init__(self, total_events: int, view_from: str, events_per_member: int = 20, latency: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.requests = 0
+        members = max(1, -(-total_events // events_per_member))
+        self.members = [{"memberId": f"m{i:05d}", "name": member_name(i)} for i in range(members)]
+        start = datetime.strptime(view_from[:10], "%Y-%m-%d")
+        rng = random.Random(seed)
+        self.schedules: dict[str, list[dict]] = {m["memberId"]: [] for m in self.members}
+        for n in range(total_events):
+            member = self.members[n % members]
+            day = start + timedelta(days=rng.randrange(14))
+            length = rng.choice((0, 0, 0, 1, 2))
+            self.schedules[member["memberId"]].append({
+                "scheduleId": f"s{n:07d}",
+                "summary": rng.choice(_SUMMARIES).format(name=member["name"]),
+                "startDate": day.strftime("%Y-%m-%d 00:00"),
+                "endDate": (day + timedelta(days=length)).strftime("%Y-%m-%d 23:59"),
+                "scheduleType": "NORMAL",
+            })
+        super().__init__(self._handler())
+
+    def _handler(self):
+        server = self
+
+        class Handler(_JsonHandler):
+            def do_POST(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                path = urlsplit(self.path)
+                body = self._body()
+                if path.path == "/api/individualUserList":
+                    return self._send(200, {"userInfoList": server.members})
+                if path.path == "/api/memberScheduleViewList":
+                    query = parse_qs(path.query)
+                    view_from = query["viewFrom"][0][:10]
+                    view_until = query["viewUntil"][0][:10]
+                    result = [
+                        {
+                            "memberId": member["memberId"],
+                            "scheduleViewList": [
+                                event
+                                for event in server.schedules.get(member["memberId"], [])
+                                if event["startDate"][:10] <= view_until and event["endDate"][:10] >= view_from
+                            ],
+                        }
+                        for member in body["memberList"]
+                    ]
+                    return self._send(200, result)
+                self._send(404, {"message": "not found"})
+
+        return Handler
+
+
+class RedirectAdapter(HTTPAdapter):
+    """https://calendar.worksmobile.com/... 요청을 로컬 가짜 서버로 보냄"""
+
+    def __init__(self, target: str, **kwargs):
+        super().__init__(**kwargs)
+        self.target = target.rstrip("/")
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = self.target + parts.path + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+def redirect_session(session: requests.Session, target: str, pool_size: int = 10) -> requests.Session:
+    session.mount("https://", RedirectAdapter(target, pool_connections=1, pool_maxsize=pool_size))
+    return session
+
+
+def _fake_jwt(lifetime: int = 3600) -> str:
+    def _b64(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    return f"{_b64({'alg': 'none'})}.{_b64({'exp': int(time.time()) + lifetime})}.sig"
+
+
+class FakeBackendServer(_Server):
+    """
+    /api/v1 백엔드 대역.
+
+    Args:
+        users: 사용자 수 (이름은 member_name(i))
+        latency: 요청당 지연(초)
+        throttle_every: 쓰기 요청 N번마다 한 번 429 (0이면 끔)
+        retry_after: 429 응답의 Retry-After(초)
+        existing: 미리 넣어 둘 근태 레코드 수 (reconcile 삭제 비용 측정용)
+        existing_date: 미리 넣는 레코드의 날짜 (YYYY-MM-DD, 조회 기간 안이면 삭제 대상)
+    """
+
+    def __init__(
+        self,
+        users: int,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        retry_after: float = 0,
+        existing: int = 0,
+        existing_date: str = "2000-01-01",
+    ):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.users = [{"id": f"user-{i:05d}", "name": member_name(i), "email": f"u{i}@example.com"} for i in range(users)]
+        self.attendances: dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.throttled = 0
+        self.requests = 0
+        self.pages = 0
+        for n in range(existing):
+            record_id = str(uuid.uuid4())
+            self.attendances[record_id] = {
+                "id": record_id,
+                "userId": self.users[n % users]["id"],
+                "typeId": "type-annual",
+                "startDate": f"{existing_date}T00:00:00.000Z",
+                "endDate": f"{existing_date}T00:00:00.000Z",
+                "content": None,
+            }
+        super().__init__(self._handler())
+
+    def _in_range(self, record: dict, start: Optional[str], end: Optional[str]) -> bool:
+        return (not end or record["startDate"][:10] <= end) and (not start or record["endDate"][:10] >= start)
+
+    def _handler(self):
+        server = self
+
+        class Handler(_JsonHandler):
+            def _enter(self, write: bool) -> bool:
+                """지연/429 처리. 계속 진행하면 True"""
+                if server.latency:
+                    time.sleep(server.latency)
+                with server.lock:
+                    server.requests += 1
+                    if not write:
+                        return True
+                    server.writes += 1
+                    throttle = server.throttle_every and server.writes % server.throttle_every == 0
+                    if throttle:
+                        server.throttled += 1
+                if throttle:
+                    self._body()
+                    self._send(429, {"message": "Too Many Requests"}, {"Retry-After": str(server.retry_after)})
+                    return False
+                return True
+
+            def do_GET(self):
+                self._enter(write=False)
+                path = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(path.query).items()}
+                route = path.path.removeprefix("/api/v1")
+                if route == "/auth/me":
+                    return self._send(200, {"id": "admin"})
+                if route == "/users":
+                    return self._send(200, server.users)
+                if route == "/attendance-types":
+                    return self._send(200, ATTENDANCE_TYPES)
+                if route in ("/attendances", "/attendances/count"):
+                    with server.lock:
+                        records = [
+                            r for r in server.attendances.values()
+                            if server._in_range(r, query.get("startDate"), query.get("endDate"))
+                        ]
+                    if route.endswith("count"):
+                        return self._send(200, {"count": len(records)})
+                    if query.get("fields"):
+                        keep = {"id", *query["fields"].split(",")}
+                        records = [{k: v for k, v in r.items() if k in keep} for r in records]
+                    if "limit" not in query:
+                        return self._send(200, records)
+                    # 백엔드와 같은 id 순 커서 페이지
+                    limit = int(query["limit"])
+                    cursor = query.get("cursor", "")
+                    records = sorted((r for r in records if r["id"] > cursor), key=lambda r: r["id"])
+                    with server.lock:
+                        server.pages += 1
+                    page = records[:limit]
+                    next_cursor = page[-1]["id"] if len(records) > limit else None
+                    return self._send(200, {"items": page, "nextCursor": next_cursor})
+                self._send(404, {"message": "not found"})
+
+            def do_POST(self):
+                route = urlsplit(self.path).path.removeprefix("/api/v1")
+                if route == "/auth/login":
+                    self._body()
+                    return self._send(201, {"accessToken": _fake_jwt()})
+                if not self._enter(write=True):
+                    return
+                body = self._body()
+                if route == "/attendances":
+                    return self._send(201, self._create(body))
+                if route == "/attendances/bulk":
+                    for item in body["items"]:
+                        self._create(item)
+                    return self._send(201, {"count": len(body["items"])})
+                if route == "/attendances/bulk-delete":
+                    with server.lock:
+                        ids = body.get("ids")
+                        doomed = [
+                            record_id for record_id, r in server.attendances.items()
+                            if (ids is None or record_id in ids)
+                            and server._in_range(r, body.get("startDate"), body.get("endDate"))
+                        ]
+                        for record_id in doomed:
+                            del server.attendances[record_id]
+                    return self._send(200, {"count": len(doomed)})
+                self._send(404, {"message": "not found"})
+
+            def do_PATCH(self):
+                if not self._enter(write=True):
+                    return
+                record_id = urlsplit(self.path).path.rsplit("/", 1)[-1]
+                body = self._body()
+                with server.lock:
+                    record = server.attendances.get(record_id)
+                    if record is None:
+                        return self._send(404, {"message": "not found"})
+                    record.update(self._normalize(body))
+                self._send(200, record)
+
+            def do_DELETE(self):
+                if not self._enter(write=True):
+                    return
+                record_id = urlsplit(self.path).path.rsplit("/", 1)[-1]
+                with server.lock:
+                    found = server.attendances.pop(record_id, None)
+                self._send(200 if found else 404, {"message": "Attendance deleted successfully"})
+
+            @staticmethod
+            def _normalize(payload: dict) -> dict:
+                return {
+                    key: (f"{value[:10]}T00:00:00.000Z" if key in ("startDate", "endDate") else value)
+                    for key, value in payload.items()
+                }
+
+            def _create(self, payload: dict) -> dict:
+                record = {"id": str(uuid.uuid4()), "content": None, **self._normalize(payload)}
+                with server.lock:
+                    server.attendances[record["id"]] = record
+                return record
+
+        return Handler
+
+
+class FakeIMAP:
+    """
+    imaplib.IMAP4_SSL 대역 (auth.getAuthNumber / wait_for_auth_code 용).
+
+    deliver_at 이후 검색부터 인증 메일이 보인다. idle=True면 IDLE 중인 연결에
+    도착 시각에 맞춰 EXISTS를 밀어 주고, idle=False면 IDLE 미지원 서버처럼
+    응답해 wait_for_auth_code가 NOOP 재검색 경로를 탄다. drop_idle=True면 첫 IDLE
+    도중 연결이 끊긴 것처럼 EOF(b"")를 돌려준다 (재접속 후에는 정상).
+    """
+
+    def __init__(
+        self,
+        code: str = "123456",
+        deliver_at: Optional[float] = None,
+        old_mails: int = 3,
+        idle: bool = True,
+        drop_idle: bool = False,
+    ):
+        self.code = code
+        self.deliver_at = time.time() if deliver_at is None else deliver_at
+        self.old_mails = old_mails
+        self.idle = idle
+        self.drop_idle = drop_idle
+        self.commands = 0
+        self.connects = 0
+        self.readlines = 0
+        self._lines: list[bytes] = []
+        self._idle_tag: Optional[bytes] = None
+        self._notify: Optional[threading.Timer] = None
+        self._sock, self._peer = socket.socketpair()
+
+    def __call__(self, host: str, port: int = 993, timeout: Optional[float] = None) -> "FakeIMAP":
+        """imaplib.IMAP4_SSL(host, port, timeout=...) 자리에 인스턴스를 그대로 넣을 수 있도록"""
+        self.connects += 1
+        self._lines.clear()
+        return self
+
+    def _mails(self) -> list[tuple[bytes, float, str]]:
+        now = time.time()
+        mails = [(str(i + 1).encode(), now - 86400 * (self.old_mails - i), "[000000] 이전 인증") for i in range(self.old_mails)]
+        if now >= self.deliver_at:
+            mails.append((str(self.old_mails + 1).encode(), self.deliver_at, f"[{self.code}] 인증번호"))
+        return mails
+
+    def _find(self, uid: bytes) -> tuple[bytes, float, str]:
+        return next(mail for mail in self._mails() if mail[0] == uid)
+
+    @staticmethod
+    def _header(subject: str) -> bytes:
+        return f"Subject: {Header(subject, 'utf-8').encode()}\r\n\r\n".encode()
+
+    def login(self, user, password):
+        self.commands += 1
+        return "OK", [b"LOGIN completed"]
+
+    def select(self, mailbox="INBOX"):
+        self.commands += 1
+        return "OK", [str(len(self._mails())).encode()]
+
+    def search(self, charset, criteria):
+        self.commands += 1
+        return "OK", [b" ".join(mail[0] for mail in self._mails())]
+
+    def fetch(self, message_id, parts):
+        self.commands += 1
+        uid, received_at, subject = self._find(message_id)
+        if "INTERNALDATE" in parts:
+            stamp = imaplib.Time2Internaldate(received_at)
+            return "OK", [f"{uid.decode()} (INTERNALDATE {stamp})".encode()]
+        return "OK", [(uid + b" (RFC822 {0}", self._header(subject)), b")"]
+
+    def uid(self, command, *args):
+        self.commands += 1
+        if command == "SEARCH":
+            return self.search(None, args[-1])
+        uid, received_at, subject = self._find(args[0])
+        stamp = imaplib.Time2Internaldate(received_at)
+        header = self._header(subject)
+        return "OK", [(f"{uid.decode()} (UID {uid.decode()} INTERNALDATE {stamp} BODY[HEADER.FIELDS (SUBJECT)] {{{len(header)}}}".encode(), header), b")"]
+
+    def socket(self) -> socket.socket:
+        return self._sock
+
+    def _push_exists(self) -> None:
+        self._peer.send(b"x")
+
+    def send(self, data: bytes) -> None:
+        self.commands += 1
+        tag, _, command = data.strip().partition(b" ")
+        if command == b"IDLE":
+            if not self.idle:
+                self._lines.append(tag + b" BAD IDLE not supported\r\n")
+                return
+            self._idle_tag = tag
+            self._lines.append(b"+ idling\r\n")
+            if self.drop_idle and self.connects == 1:
+                self._push_exists()  # select가 바로 깨어나 EOF를 읽도록
+                return
+            self._notify = threading.Timer(max(0.0, self.deliver_at - time.time()), self._push_exists)
+            self._notify.daemon = True
+            self._notify.start()
+        elif data.strip() == b"DONE":
+            if self._notify is not None:
+                self._notify.cancel()
+            self._lines.append(self._idle_tag + b" OK IDLE terminated\r\n")
+
+    def readline(self) -> bytes:
+        self.readlines += 1
+        if self._lines:
+            return self._lines.pop(0)
+        if self.drop_idle and self.connects == 1:
+            return b""
+        self._sock.recv(1)
+        return f"* {len(self._mails())} EXISTS\r\n".encode()
+
+    def noop(self):
+        self.commands += 1
+        return "OK", [b"NOOP completed"]
+
+    def close(self):
+        return "OK", [b""]
+
+    def logout(self):
+        return "BYE", [b""]
+
+    def shutdown(self) -> None:
+        pass
+
+    def __enter__(self) -> "FakeIMAP":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._notify is not None:
+            self._notify.cancel()
+        self._sock.close()
+        self._peer.close()
@@ -0,0 +1,49 @@
+import imaplib
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import auth
+
+from .fakes import FakeIMAP
+
+
+def _wait(monkeypatch, stub, **kwargs):
+    monkeypatch.setattr(imaplib, "IMAP4_SSL", stub)
+    not_before = datetime.now(timezone.utc) - timedelta(seconds=1)
+    start = time.monotonic()
+    code, _ = auth.wait_for_auth_code("user@example.com", "app-password", "no_reply@worksmobile.com", not_before, **kwargs)
+    return code, time.monotonic() - start
+
+
+def test_idle_push_returns_as_soon_as_mail_arrives(monkeypatch):
+    """IDLE 알림을 받으면 idle_slice를 기다리지 않고 바로 코드를 확인한다"""
+    with FakeIMAP(deliver_at=time.time() + 0.1) as stub:
+        code, elapsed = _wait(monkeypatch, stub, timeout=10, idle_slice=5)
+        assert code == stub.code
+        assert elapsed < 1
+        assert stub.connects == 1
+
+
+def test_dropped_idle_connection_falls_back_to_polling(monkeypatch):
+    """IDLE 중 EOF(b"")는 연결 끊김으로 보고 재접속해 폴링한다 (readline 무한 루프 없음)"""
+    with FakeIMAP(deliver_at=time.time() + 0.3, drop_idle=True) as stub:
+        code, _ = _wait(monkeypatch, stub, timeout=10, idle_slice=5)
+        assert code == stub.code
+        assert stub.connects == 2
+        assert stub.readlines == 2  # "+ idling" 한 줄과 EOF 한 줄뿐, 이후에는 IDLE을 쓰지 않음
+
+
+def test_idle_raises_abort_on_eof():
+    with FakeIMAP(drop_idle=True) as stub:
+        stub.connects = 1
+        with pytest.raises(imaplib.IMAP4.abort):
+            auth._idle(stub, timeout=5)
+
+
+def test_server_without_idle_uses_noop(monkeypatch):
+    with FakeIMAP(deliver_at=time.time() + 0.1, idle=False) as stub:
+        code, _ = _wait(monkeypatch, stub, timeout=10, idle_slice=5)
+        assert code == stub.code
+        assert stub.connects == 1
@@ -0,0 +1,391 @@
+"""
+Offline benchmarks for the fetch -> filter -> register pipeline.
+
+Run from apps/batch:
+
+    uv run pytest tests -q                 # 10 / 1k events
+    uv run pytest tests -q --run-slow      # + 100k events
+
+With pytest-benchmark installed the usual table / --benchmark-json apply;
+otherwise conftest.py prints a small timing summary.
+"""
+import imaplib
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+import auth
+import main
+from api_client import SYNC_FIELDS, APIClient
+from rate_limiter import AdaptiveTokenBucket
+from retry_policy import CircuitBreaker, RetryPolicy
+from sync_journal import SyncJournal
+
+from .fakes import FakeBackendServer, FakeCalendarServer, FakeIMAP, redirect_session
+
+SIZES = [10, 1_000, pytest.param(100_000, marks=pytest.mark.slow)]
+
+
+def _expected_registrations(calendar: FakeCalendarServer) -> int:
+    return sum(
+        1
+        for events in calendar.schedules.values()
+        for event in events
+        if main._is_bracket_schedule(event["summary"])
+    )
+
+
+def _run_pipeline(
+    calendar: FakeCalendarServer,
+    backend: FakeBackendServer,
+    concurrency: int = 4,
+    bulk: bool = True,
+    chunk_size: int = 200,
+    mode: str = "reconcile",
+) -> dict:
+    """main._sync_once와 같은 순서: 팀원 조회 -> 일정 스트리밍 -> 등록"""
+    view_from, view_until = main._get_date_range()
+    session = redirect_session(main._create_calendar_session([], concurrency), calendar.url, concurrency)
+    member_list = main._fetch_member_list(session)
+    events = main._stream_team_schedule(session, member_list, view_from, view_until, workers=concurrency)
+
+    client = APIClient(
+        f"{backend.url}/api/v1",
+        "bench@example.com",
+        "password",
+        rate_limiter=AdaptiveTokenBucket(rate=10_000),
+        pool_size=concurrency,
+        compress_min_bytes=8192,
+    )
+    client.login()
+    try:
+        return main._register_attendances(
+            events,
+            client,
+            view_from[:10],
+            view_until[:10],
+            concurrency=concurrency,
+            mode=mode,
+            bulk=bulk,
+            chunk_size=chunk_size,
+        )
+    finally:
+        session.close()
+        client.session.close()
+
+
+def _fresh_backend(calendar: FakeCalendarServer, backend: FakeBackendServer, **kwargs):
+    """pedantic setup: 매 라운드 빈 백엔드에서 시작 (setup이 있으면 인자도 setup이 돌려줘야 한다)"""
+
+    def _setup():
+        backend.attendances.clear()
+        return (calendar, backend), kwargs
+
+    return _setup
+
+
+@pytest.mark.parametrize("events", SIZES)
+def test_pipeline_initial_sync(benchmark, events):
+    """빈 백엔드에 전체 등록 (reconcile + bulk)"""
+    view_from, _ = main._get_date_range()
+    with FakeCalendarServer(events, view_from) as calendar, FakeBackendServer(len(calendar.members)) as backend:
+        stats = benchmark.pedantic(
+            _run_pipeline,
+            setup=_fresh_backend(calendar, backend),
+            rounds=3 if events <= 1_000 else 1,
+        )
+        expected = _expected_registrations(calendar)
+        assert stats["success"] == expected
+        assert stats["failed"] == 0
+        benchmark.extra_info.update(events=events, registered=expected, backend_requests=backend.requests)
+
+
+@pytest.mark.parametrize("events", SIZES)
+def test_pipeline_noop_resync(benchmark, events):
+    """변경 없는 재동기화: 조회만 하고 쓰기는 0건이어야 한다"""
+    view_from, _ = main._get_date_range()
+    with FakeCalendarServer(events, view_from) as calendar, FakeBackendServer(len(calendar.members)) as backend:
+        _run_pipeline(calendar, backend)
+        writes_before = backend.writes
+        stats = benchmark.pedantic(_run_pipeline, args=(calendar, backend), rounds=3 if events <= 1_000 else 1)
+        assert backend.writes == writes_before
+        assert stats["unchanged"] == _expected_registrations(calendar)
+        benchmark.extra_info.update(events=events)
+
+
+@pytest.mark.parametrize("events", SIZES)
+def test_plan_only(benchmark, events):
+    """--plan: 조회/파싱/매핑/비교만 하고 쓰기는 0건 (기존 레코드 50건은 삭제 계획에 나와야 한다)"""
+    view_from, view_until = main._get_date_range()
+    with FakeCalendarServer(events, view_from) as calendar, FakeBackendServer(
+        len(calendar.members), existing=50, existing_date=view_from[:10]
+    ) as backend:
+        client = APIClient(f"{backend.url}/api/v1", "bench@example.com", "password", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+        client.login()
+        session = redirect_session(main._create_calendar_session([], 4), calendar.url, 4)
+        member_list = main._fetch_member_list(session)
+
+        def _plan():
+            plan = {}
+            stream = main._stream_team_schedule(session, member_list, view_from, view_until)
+            main._register_attendances(stream, client, view_from[:10], view_until[:10], plan=plan)
+            return plan
+
+        plan = benchmark.pedantic(_plan, rounds=3 if events <= 1_000 else 1)
+        counts = plan["counts"]
+        assert backend.writes == 0
+        assert counts["create"] + counts["update"] + plan["unchanged"] == _expected_registrations(calendar)
+        assert counts["delete"] + counts["update"] + plan["unchanged"] == 50
+        benchmark.extra_info.update(events=events, **counts)
+        session.close()
+
+
+def test_existing_fetch_paged(benchmark):
+    """기존 레코드 2,500건을 500건씩 커서 페이지 + 필요한 컬럼만 조회"""
+    view_from, view_until = main._get_date_range()
+    with FakeBackendServer(10, existing=2_500, existing_date=view_from[:10]) as backend:
+        client = APIClient(f"{backend.url}/api/v1", "bench@example.com", "password", page_size=500)
+        client.login()
+        records = benchmark.pedantic(client.get_attendances_in_range, args=(view_from[:10], view_until[:10]), rounds=3)
+        assert len(records) == 2_500
+        assert len({r["id"] for r in records}) == 2_500
+        assert set(records[0]) == set(SYNC_FIELDS)
+        assert backend.pages == 3 * 5
+        benchmark.extra_info.update(pages=backend.pages)
+        client.session.close()
+
+
+def test_pipeline_with_latency_and_throttling(benchmark):
+    """요청마다 5ms 지연 + 쓰기 5번마다 429 (작은 bulk 청크로 재시도 경로를 태움)"""
+    view_from, _ = main._get_date_range()
+    with FakeCalendarServer(1_000, view_from, latency=0.005) as calendar, FakeBackendServer(
+        len(calendar.members), latency=0.005, throttle_every=5
+    ) as backend:
+        stats = benchmark.pedantic(
+            _run_pipeline,
+            setup=_fresh_backend(calendar, backend, chunk_size=50),
+            rounds=1,
+        )
+        assert stats["success"] == _expected_registrations(calendar)
+        assert backend.throttled > 0
+        benchmark.extra_info.update(throttled=backend.throttled, backend_requests=backend.requests)
+
+
+def test_pipeline_single_requests(benchmark):
+    """bulk 엔드포인트 없이 건별 생성 (concurrency 8)"""
+    view_from, _ = main._get_date_range()
+    with FakeCalendarServer(1_000, view_from) as calendar, FakeBackendServer(len(calendar.members)) as backend:
+        stats = benchmark.pedantic(
+            _run_pipeline,
+            setup=_fresh_backend(calendar, backend, bulk=False, concurrency=8),
+            rounds=1,
+        )
+        assert stats["success"] == _expected_registrations(calendar)
+
+
+def test_multi_team_sync(benchmark):
+    """팀 2개가 캘린더 세션 하나를 공유해 병렬 동기화 (팀원 절반씩, 백엔드 각각)"""
+    view_from, _ = main._get_date_range()
+    settings = {
+        "calendar_member_chunk_size": 50,
+        "calendar_window_days": 14,
+        "calendar_workers": 4,
+        "calendar_timeout": (5, 30),
+        "calendar_retries": 3,
+        "api_concurrency": 4,
+        "api_sync_mode": "reconcile",
+        "api_bulk": True,
+        "api_bulk_chunk_size": 200,
+        "type_mapping": main.DEFAULT_TYPE_MAPPING,
+    }
+    with FakeCalendarServer(1_000, view_from) as calendar, FakeBackendServer(
+        len(calendar.members)
+    ) as backend_a, FakeBackendServer(len(calendar.members)) as backend_b:
+        session = redirect_session(main._create_calendar_session([], 8), calendar.url, 8)
+        member_list = main._fetch_member_list(session)
+        half = len(member_list) // 2
+        teams = []
+        for name, backend, members in (("a", backend_a, member_list[:half]), ("b", backend_b, member_list[half:])):
+            client = APIClient(f"{backend.url}/api/v1", "bench@example.com", "password", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+            client.login()
+            team_settings = {**settings, "team_name": name, "team_members": [m["memberId"] for m in members]}
+            teams.append({"settings": team_settings, "api_client": client, "user_index": None, "sync_state": None})
+
+        results = benchmark.pedantic(main._sync_teams, args=(session, member_list, teams), rounds=1)
+        assert results["a"]["success"] == len(backend_a.attendances) > 0
+        assert results["b"]["success"] == len(backend_b.attendances) > 0
+        assert results["a"]["success"] + results["b"]["success"] == _expected_registrations(calendar)
+        session.close()
+
+
+def test_backfill_resume(benchmark, tmp_path):
+    """2주를 3일 단위 5개 기간으로 병렬 백필 -> 체크포인트 2개만 남기고 다시 실행하면 나머지 3개 기간만"""
+    view_from, view_until = main._get_date_range()
+    date_from, date_to = (datetime.strptime(value[:10], "%Y-%m-%d").date() for value in (view_from, view_until))
+    journal_path = tmp_path / "backfill_journal.jsonl"
+    with FakeCalendarServer(1_000, view_from) as calendar, FakeBackendServer(len(calendar.members)) as backend:
+        client = APIClient(f"{backend.url}/api/v1", "bench@example.com", "password", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+        client.login()
+        settings = {
+            "calendar_member_chunk_size": 50,
+            "calendar_window_days": 14,
+            "calendar_workers": 4,
+            "calendar_timeout": (5, 30),
+            "calendar_retries": 3,
+            "api_base_url": client.base_url,
+            "api_email": client.email,
+            "api_concurrency": 4,
+            "api_bulk": True,
+            "api_bulk_chunk_size": 200,
+            "type_mapping": main.DEFAULT_TYPE_MAPPING,
+            "users_aliases": {},
+            "users_members": {},
+            "team_name": "default",
+            "team_members": [],
+            "backfill_window_days": 3,
+            "backfill_workers": 3,
+            "backfill_journal_path": journal_path,
+        }
+        session = redirect_session(main._create_calendar_session([], 8), calendar.url, 8)
+        member_list = main._fetch_member_list(session)
+        team = {"settings": settings, "api_client": client}
+        args = (session, member_list, [team], date_from, date_to)
+
+        benchmark.pedantic(main._run_backfill, args=args, rounds=1)
+        expected = _expected_registrations(calendar)
+        assert len(backend.attendances) == expected
+        lines = journal_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 5
+
+        # 중단 흉내: 체크포인트 3개를 지우고 다시 실행 -> 그 기간만 조회, 이미 맞으므로 쓰기 0건
+        journal_path.write_text("\n".join(lines[:2]) + "\n", encoding="utf-8")
+        writes, calendar_requests = backend.writes, calendar.requests
+        main._run_backfill(*args)
+        assert calendar.requests - calendar_requests == 3
+        assert backend.writes == writes
+        assert len(backend.attendances) == expected
+        assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 5
+        benchmark.extra_info.update(events=expected)
+        session.close()
+
+
+class _Crash(Exception):
+    pass
+
+
+def test_resume_after_crash(benchmark, tmp_path):
+    """bulk 생성 첫 청크 뒤 프로세스가 죽은 상황 -> --resume은 남은 청크만 다시 보낸다"""
+    view_from, view_until = main._get_date_range()
+    with FakeCalendarServer(1_000, view_from) as calendar, FakeBackendServer(len(calendar.members)) as backend:
+        client = APIClient(f"{backend.url}/api/v1", "bench@example.com", "password", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+        client.login()
+        journal = SyncJournal(tmp_path / "sync_journal.jsonl", "bench")
+        create_bulk = client.create_attendances_bulk
+
+        def _crash_after_first_chunk(payloads, chunk_size, keys=None):
+            create_bulk(payloads[:chunk_size], chunk_size, keys[:chunk_size])
+            raise _Crash()
+
+        client.create_attendances_bulk = _crash_after_first_chunk
+        session = redirect_session(main._create_calendar_session([], 4), calendar.url, 4)
+        member_list = main._fetch_member_list(session)
+        stream = main._stream_team_schedule(session, member_list, view_from, view_until)
+        with pytest.raises(_Crash):
+            main._register_attendances(stream, client, view_from[:10], view_until[:10], chunk_size=200, journal=journal)
+        del client.create_attendances_bulk
+        expected = _expected_registrations(calendar)
+        assert len(backend.attendances) == 200 < expected
+
+        settings = {"team_name": "default", "api_bulk": True, "api_bulk_chunk_size": 200, "api_concurrency": 4}
+        team = {"settings": settings, "api_client": client, "journal": journal}
+        writes = backend.writes
+        stats = benchmark.pedantic(main._resume_team, args=(team,), rounds=1)
+        assert stats["success"] == expected - 200
+        assert stats["unchanged"] == 200
+        assert backend.writes - writes == -(-(expected - 200) // 200)
+        assert len(backend.attendances) == expected
+        assert main._resume_team(team) is None
+        session.close()
+
+
+def test_backend_outage_fails_fast(benchmark):
+    """백엔드가 내려간 뒤 쓰기 40청크: 차단기가 열리면 남은 청크는 재시도 대기 없이 바로 실패"""
+    payloads = [
+        {"userId": "user-00000", "typeId": "type-annual", "startDate": f"2024-01-{day:02d}", "endDate": f"2024-01-{day:02d}"}
+        for day in range(1, 29)
+    ] * 72
+    with FakeBackendServer(1) as backend:
+        client = APIClient(
+            f"{backend.url}/api/v1",
+            "bench@example.com",
+            "password",
+            rate_limiter=AdaptiveTokenBucket(rate=10_000),
+            retry_policy=RetryPolicy("api", base_delay=0.05, max_delay=0.2, breaker=CircuitBreaker("api", reset_timeout=60)),
+        )
+        client.login()
+    client.session.close()  # keep-alive 연결까지 끊어 이후 요청은 연결 거부
+    created, failed = benchmark.pedantic(client.create_attendances_bulk, args=(payloads, 50), rounds=1)
+    assert created == 0
+    assert len(failed) == len(payloads)
+    assert client.retry_policy.breaker.state == "open"
+    client.session.close()
+
+
+def test_calendar_stream_latency(benchmark):
+    """캘린더 조회만 (요청당 20ms, 팀원/기간 청크 병렬)"""
+    view_from, view_until = main._get_date_range()
+    with FakeCalendarServer(1_000, view_from, latency=0.02) as calendar:
+
+        def _fetch():
+            session = redirect_session(main._create_calendar_session([], 4), calendar.url, 4)
+            try:
+                members = main._fetch_member_list(session)
+                return list(main._stream_team_schedule(session, members, view_from, view_until, window_days=7))
+            finally:
+                session.close()
+
+        events = benchmark.pedantic(_fetch, rounds=3)
+        assert len(events) == _expected_registrations(calendar)
+        benchmark.extra_info.update(calendar_requests=calendar.requests)
+
+
+def test_auth_code_wait(benchmark, monkeypatch):
+    """인증 메일이 0.2초 뒤 도착할 때 wait_for_auth_code가 코드를 받기까지"""
+    with FakeIMAP() as stub:
+        monkeypatch.setattr(imaplib, "IMAP4_SSL", stub)
+
+        def _setup():
+            stub.deliver_at = time.time() + 0.2
+            return (), {}
+
+        def _wait():
+            not_before = datetime.now(timezone.utc) - timedelta(seconds=1)
+            return auth.wait_for_auth_code("user@example.com", "app-password", "no_reply@worksmobile.com", not_before, timeout=10)
+
+        code, received_at = benchmark.pedantic(_wait, setup=_setup, rounds=3)
+        assert code == stub.code
+        benchmark.extra_info.update(imap_commands=stub.commands)
+
+
+def test_get_auth_number(benchmark, monkeypatch):
+    """폴링 방식 getAuthNumber 1회 (접속 + 검색 + 본문/INTERNALDATE 조회)"""
+    with FakeIMAP(deliver_at=time.time() - 1) as stub:
+        monkeypatch.setattr(imaplib, "IMAP4_SSL", stub)
+        code, _ = benchmark(auth.getAuthNumber, "user@example.com", "app-password", "no_reply@worksmobile.com")
+        assert code == stub.code
+
+
+def test_cold_import(benchmark):
+    """새 인터프리터에서 import main: 로그인용 Selenium/IMAP 모듈은 읽지 않아야 한다"""
+    source_dir = Path(main.__file__).parent
+    probe = "import sys, main; print(','.join(m for m in ('selenium', 'imaplib', 'auth', 'iris_http') if m in sys.modules))"
+
+    def _import():
+        return subprocess.run([sys.executable, "-c", probe], cwd=source_dir, capture_output=True, text=True, check=True)
+
+    result = benchmark.pedantic(_import, rounds=3)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from json_stream import iter_json_array
+
+SAMPLES = [
+    "[]",
+    "[1, 2.5, -3e-2, 0, true, false, null]",
+    '[ {"a": [1, {"b": "}]"}], "c": "esc \\" \\\\ ]"}, "str", [], {} ]',
+    '[{"name": "홍길동", "summary": "[휴가] 연차 – 오전"}, 10]',
+]
+
+
+def _chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_split_at_every_byte_position(text):
+    data = text.encode("utf-8")
+    expected = json.loads(text)
+    for cut in range(len(data) + 1):
+        assert list(iter_json_array([data[:cut], data[cut:]])) == expected, cut
+
+
+@pytest.mark.parametrize("size", [1, 2, 3])
+@pytest.mark.parametrize("text", SAMPLES)
+def test_small_chunks(text, size):
+    assert list(iter_json_array(_chunked(text.encode("utf-8"), size))) == json.loads(text)
+
+
+def test_each_element_is_decoded_once(monkeypatch):
+    """한 바이트씩 도착해도 요소마다 한 번만 디코딩한다 (청크마다 재디코딩하면 O(n²))"""
+    calls = []
+    raw_decode = json.JSONDecoder.raw_decode
+
+    def _counting(self, s, idx=0):
+        calls.append(idx)
+        return raw_decode(self, s, idx)
+
+    monkeypatch.setattr(json.JSONDecoder, "raw_decode", _counting)
+    items = [{"memberId": n, "schedules": [{"summary": f"[휴가] {n}"}] * 5} for n in range(3)] + [1.25]
+    assert list(iter_json_array(_chunked(json.dumps(items).encode("utf-8"), 1))) == items
+    assert len(calls) == len(items)
+
+
+@pytest.mark.parametrize("text", ["{}", "[1, 2", '[{"a": 1}', "[tru]"])
+def test_malformed_input_raises(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(_chunked(text.encode("utf-8"), 2)))
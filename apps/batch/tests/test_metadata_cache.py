@@ -0,0 +1,36 @@
+import threading
+
+from metadata_cache import MetadataCache
+
+
+def test_concurrent_writers_share_one_file(tmp_path, capsys):
+    """같은 파일을 쓰는 캐시 여러 개(팀별 APIClient)가 동시에 저장해도 임시 파일이 겹치지 않는다"""
+    path = tmp_path / "metadata_cache.json"
+    caches = [MetadataCache(path) for _ in range(4)]
+    errors = []
+
+    def _put(cache, n):
+        try:
+            for i in range(200):
+                cache.put(f"team-{n}", {"i": i}, etag=f'"{i}"')
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=_put, args=(cache, n)) for n, cache in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert "저장 실패" not in capsys.readouterr().out
+    assert not list(tmp_path.glob("*.tmp"))
+    # 인스턴스마다 자기 항목으로 파일 전체를 덮어쓰므로 마지막 저장 하나는 온전히 남아야 한다
+    assert any(MetadataCache(path).get(f"team-{n}") for n in range(4))
+
+
+def test_entries_survive_reload(tmp_path):
+    path = tmp_path / "metadata_cache.json"
+    MetadataCache(path).put("users", [{"id": "u1"}], etag='"v1"')
+    entry = MetadataCache(path).get("users")
+    assert entry["etag"] == '"v1"' and entry["data"] == [{"id": "u1"}]
@@ -0,0 +1,99 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import retry_policy
+from retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy, parse_retry_after
+
+
+def _response(status: int, retry_after: str | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def _failing(*statuses: int):
+    """statuses 순서대로 HTTPError를 던지고, 다 쓰면 "ok"를 돌려주는 action"""
+    remaining = list(statuses)
+    calls = []
+
+    def _action():
+        calls.append(1)
+        if remaining:
+            response = _response(*remaining.pop(0)) if isinstance(remaining[0], tuple) else _response(remaining.pop(0))
+            raise requests.HTTPError(response=response)
+        return "ok"
+
+    return _action, calls
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waits = []
+    monkeypatch.setattr(retry_policy.time, "sleep", waits.append)
+    return waits
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after(_response(429)) is None
+    assert parse_retry_after(_response(429, "3")) == 3.0
+    assert parse_retry_after(_response(429, "-1")) == 0.0
+    assert parse_retry_after(_response(429, "soon")) is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(_response(503, later)) <= 30
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy("test", base_delay=0.5, max_delay=4.0)
+    waits = [policy.backoff(2.0) for _ in range(200)]
+    assert all(0.5 <= w <= 4.0 for w in waits)
+    assert len(set(waits)) > 1
+
+
+def test_retries_transient_status_then_succeeds(sleeps):
+    action, calls = _failing(503, (429, "2"))
+    assert RetryPolicy("test", max_attempts=3).call(action) == "ok"
+    assert len(calls) == 3
+    assert sleeps[1] == 2.0  # Retry-After 우선
+
+
+def test_client_errors_are_final(sleeps):
+    action, calls = _failing(404)
+    with pytest.raises(requests.HTTPError):
+        RetryPolicy("test", max_attempts=3).call(action)
+    assert (len(calls), sleeps) == (1, [])
+
+
+def test_gives_up_after_max_attempts(sleeps):
+    action, calls = _failing(500, 500, 500)
+    with pytest.raises(requests.HTTPError):
+        RetryPolicy("test", max_attempts=2).call(action)
+    assert len(calls) == 2
+
+
+def test_throttle_hook_sets_the_wait(sleeps):
+    action, _ = _failing((429, "1"))
+    RetryPolicy("test").call(action, on_throttle=lambda wait: wait * 5)
+    assert sleeps == [5.0]
+
+
+def test_breaker_opens_and_probes(sleeps, monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    policy = RetryPolicy("test", max_attempts=1, breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            policy.call(_failing(503)[0])
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        policy.call(lambda: "ok")
+    opened = time.monotonic()
+    monkeypatch.setattr(retry_policy.time, "monotonic", lambda: opened + 31)
+    assert breaker.state == "half-open"
+    assert policy.call(lambda: "ok") == "ok"
+    assert breaker.state == "closed"
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from schedule_parser import ParsedSchedule, parse_schedule, parse_summary
+
+KNOWN = frozenset({"이경봉", "손병진", "Jean-Luc"})
+
+
+def _schedule(summary: str) -> dict:
+    return {"memberId": "m1", "summary": summary, "startDate": "2026-01-05 09:00", "endDate": "2026-01-06 18:00"}
+
+
+@pytest.mark.parametrize(
+    "summary, expected",
+    [
+        ("[출장]스틸샵 A-B 라인 협의-이경봉", ("출장", "이경봉", "스틸샵 A-B 라인 협의")),
+        ("[휴가]-손병진", ("휴가", "손병진", None)),
+        ("[휴가]오후 - 손병진", ("휴가", "손병진", "오후")),
+        ("[휴가]오후–손병진", ("휴가", "손병진", "오후")),
+        ("[휴가]오후 — 손병진", ("휴가", "손병진", "오후")),
+        ("[휴가]손병진", ("휴가", "", None)),
+        ("휴가-손병진", ("", "", None)),
+    ],
+)
+def test_separators(summary, expected):
+    """- 가 기본 구분자이고, 하이픈이 없을 때만 – / — 를 쓴다"""
+    parsed = parse_schedule(_schedule(summary))
+    assert (parsed.type, parsed.user_name, parsed.content) == expected
+    assert parse_schedule(_schedule(summary), KNOWN)[:3] == expected
+
+
+@pytest.mark.parametrize(
+    "summary, expected",
+    [
+        ("[출장]고객사 미팅-Jean-Luc", ("출장", "Jean-Luc", "고객사 미팅")),
+        ("[휴가]-Jean-Luc", ("휴가", "Jean-Luc", None)),
+        ("[휴가]A-B 점검 – Jean-Luc", ("휴가", "Jean-Luc", "A-B 점검")),
+    ],
+)
+def test_hyphenated_names_need_known_names(summary, expected):
+    assert parse_schedule(_schedule(summary), KNOWN)[:3] == expected
+    assert parse_schedule(_schedule(summary)).user_name == "Luc"
+
+
+def test_fast_path_matches_parse_summary():
+    """partition 빠른 경로와 parse_summary 결과가 같다"""
+    summaries = [
+        f"[{kind}]{content}{sep}{name}"
+        for kind in ("휴가", "반차")
+        for content in ("", "오후", "A-B 라인", "고객사 미팅 ")
+        for sep in ("-", " - ", "–", "—")
+        for name in ("이경봉", "Jean-Luc", "모르는사람")
+    ]
+    for summary in summaries:
+        for known in (None, KNOWN):
+            parsed = parse_schedule(_schedule(summary), known)
+            schedule_type, user_name, content = parse_summary(summary, known)
+            assert parsed[:3] == (schedule_type, user_name, content or None), (summary, known)
+
+
+def test_dates_and_member():
+    parsed = parse_schedule(_schedule("[휴가]-이경봉"))
+    assert isinstance(parsed, ParsedSchedule)
+    assert (parsed.start_date, parsed.end_date, parsed.member_id) == (date(2026, 1, 5), date(2026, 1, 6), "m1")
+    parsed = parse_schedule({"summary": "[휴가]-이경봉", "startDate": "bad", "endDate": None})
+    assert (parsed.start_date, parsed.end_date, parsed.member_id) == (None, None, None)
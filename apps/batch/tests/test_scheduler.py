@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from scheduler import CronSchedule, next_run
+
+
+def test_every_fifteen_minutes_on_weekdays():
+    cron = CronSchedule("*/15 9-18 * * 1-5")
+    assert cron.next_after(datetime(2026, 1, 5, 9, 7, 30)) == datetime(2026, 1, 5, 9, 15)
+    assert cron.next_after(datetime(2026, 1, 5, 18, 45)) == datetime(2026, 1, 6, 9, 0)
+    # 금요일 저녁 -> 월요일 아침
+    assert cron.next_after(datetime(2026, 1, 9, 19, 0)) == datetime(2026, 1, 12, 9, 0)
+
+
+def test_sunday_is_zero_or_seven():
+    assert CronSchedule("0 8 * * 0").weekdays == CronSchedule("0 8 * * 7").weekdays == frozenset({6})
+
+
+def test_day_of_month_or_weekday():
+    """일/요일이 둘 다 지정되면 둘 중 하나만 맞아도 실행"""
+    cron = CronSchedule("0 0 1 * 1")
+    assert cron.next_after(datetime(2026, 1, 1, 0, 0)) == datetime(2026, 1, 5, 0, 0)
+    assert cron.next_after(datetime(2026, 1, 26, 0, 0)) == datetime(2026, 2, 1, 0, 0)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "0 0 31 2 *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression).next_after(datetime(2026, 1, 1))
+
+
+def test_next_run_interval_and_jitter():
+    now = datetime(2026, 1, 5, 9, 0)
+    assert next_run(now, 30) == now + timedelta(minutes=30)
+    assert next_run(now, 30, CronSchedule("0 12 * * *")) == datetime(2026, 1, 5, 12, 0)
+    delayed = next_run(now, 30, jitter_seconds=60)
+    assert now + timedelta(minutes=30) <= delayed <= now + timedelta(minutes=31)
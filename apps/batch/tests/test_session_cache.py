@@ -0,0 +1,36 @@
+import threading
+
+from session_cache import SessionCache
+
+
+def test_concurrent_saves_keep_every_entry(tmp_path):
+    """캘린더/API 로그인이 동시에 저장해도 항목이 사라지거나 임시 파일 경쟁으로 실패하지 않는다"""
+    cache = SessionCache(tmp_path / "session_cache.bin")
+    errors = []
+
+    def _save(name):
+        try:
+            for i in range(20):
+                cache.save(name, {"i": i}, expires_at=2**31)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=_save, args=(f"entry-{n}",)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    for n in range(8):
+        assert cache.load(f"entry-{n}") == {"i": 19}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_invalidate_and_expiry(tmp_path):
+    cache = SessionCache(tmp_path / "session_cache.bin")
+    cache.save("calendar", ["cookie"], expires_at=2**31)
+    cache.save("old", ["cookie"], expires_at=1)
+    assert cache.load("old") is None
+    cache.invalidate("calendar")
+    assert cache.load("calendar") is None
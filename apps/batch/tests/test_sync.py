@@ -0,0 +1,221 @@
+import weakref
+
+import requests
+
+import main
+from api_client import SYNC_FIELDS, APIClient
+from rate_limiter import AdaptiveTokenBucket
+from sync_journal import SyncJournal
+
+from .fakes import FakeBackendServer, FakeCalendarServer, redirect_session
+
+SETTINGS = {
+    "team_name": "default",
+    "team_members": [],
+    "calendar_member_chunk_size": 50,
+    "calendar_window_days": 14,
+    "calendar_workers": 2,
+    "calendar_timeout": (5, 30),
+    "calendar_retries": 1,
+    "api_concurrency": 2,
+    "api_sync_mode": "reconcile",
+    "api_bulk": True,
+    "api_bulk_chunk_size": 200,
+    "type_mapping": main.DEFAULT_TYPE_MAPPING,
+}
+
+
+def _sync(calendar, backend, **overrides):
+    client = APIClient(f"{backend.url}/api/v1", "a@example.com", "pw", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+    client.login()
+    session = redirect_session(main._create_calendar_session([], 2), calendar.url, 2)
+    try:
+        member_list = main._fetch_member_list(session)
+        return main._sync_once({**SETTINGS, **overrides}, session, member_list, client, main.UserIndex())
+    finally:
+        session.close()
+        client.session.close()
+
+
+def test_reconcile_removes_attendances_when_calendar_is_empty():
+    """기간 내 일정이 모두 지워지면 남은 근태도 삭제된다"""
+    view_from, _ = main._get_date_range()
+    with FakeCalendarServer(0, view_from) as calendar, FakeBackendServer(
+        len(calendar.members), existing=5, existing_date=view_from[:10]
+    ) as backend:
+        stats = _sync(calendar, backend)
+        assert stats["deleted"] == 5
+        assert backend.attendances == {}
+
+
+def test_replace_with_empty_calendar_does_not_touch_backend():
+    view_from, _ = main._get_date_range()
+    with FakeCalendarServer(0, view_from) as calendar, FakeBackendServer(
+        len(calendar.members), existing=5, existing_date=view_from[:10]
+    ) as backend:
+        assert _sync(calendar, backend, api_sync_mode="replace") is None
+        assert len(backend.attendances) == 5
+
+
+def test_no_visible_members_skips_reconcile():
+    """팀원을 하나도 못 보면 (권한/설정 오류) 비교·삭제하지 않는다"""
+    view_from, _ = main._get_date_range()
+    with FakeCalendarServer(0, view_from) as calendar, FakeBackendServer(
+        len(calendar.members), existing=5, existing_date=view_from[:10]
+    ) as backend:
+        assert _sync(calendar, backend, team_members=["nobody"]) is None
+        assert len(backend.attendances) == 5
+
+
+def test_backfill_window_without_events_deletes_leftovers(tmp_path):
+    """백필 기간에 일정이 없으면 남은 근태를 지운 뒤에 완료로 기록한다"""
+    view_from, view_until = main._get_date_range()
+    date_from, date_to = (main.date.fromisoformat(value[:10]) for value in (view_from, view_until))
+    journal_path = tmp_path / "backfill_journal.jsonl"
+    with FakeCalendarServer(0, view_from) as calendar, FakeBackendServer(
+        len(calendar.members), existing=5, existing_date=view_from[:10]
+    ) as backend:
+        client = APIClient(f"{backend.url}/api/v1", "a@example.com", "pw", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+        client.login()
+        settings = {
+            **SETTINGS,
+            "api_base_url": client.base_url,
+            "api_email": client.email,
+            "users_aliases": {},
+            "users_members": {},
+            "backfill_window_days": 7,
+            "backfill_workers": 2,
+            "backfill_journal_path": journal_path,
+        }
+        session = redirect_session(main._create_calendar_session([], 2), calendar.url, 2)
+        member_list = main._fetch_member_list(session)
+        main._run_backfill(session, member_list, [{"settings": settings, "api_client": client}], date_from, date_to)
+        session.close()
+        assert backend.attendances == {}
+        assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_replace_skips_creates_when_range_delete_fails(tmp_path):
+    """기간 삭제가 실패하면 생성하지 않고 실패로 센다 -> --resume은 삭제 후 전부 다시 생성"""
+    view_from, view_until = main._get_date_range()
+    with FakeCalendarServer(40, view_from) as calendar, FakeBackendServer(
+        len(calendar.members), existing=5, existing_date=view_from[:10]
+    ) as backend:
+        client = APIClient(f"{backend.url}/api/v1", "a@example.com", "pw", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+        client.login()
+        journal = SyncJournal(tmp_path / "sync_journal.jsonl", "test")
+
+        def _broken_delete(*args, **kwargs):
+            raise requests.ConnectionError("range delete failed")
+
+        client.delete_attendances_in_range = _broken_delete
+        session = redirect_session(main._create_calendar_session([], 2), calendar.url, 2)
+        stream = main._stream_team_schedule(session, main._fetch_member_list(session), view_from, view_until)
+        stats = main._register_attendances(
+            stream, client, view_from[:10], view_until[:10], mode="replace", chunk_size=50, journal=journal
+        )
+        session.close()
+        assert stats["failed"] > 0 and stats["success"] == 0
+        assert len(backend.attendances) == 5
+
+        del client.delete_attendances_in_range
+        settings = {"team_name": "default", "api_bulk": True, "api_bulk_chunk_size": 50, "api_concurrency": 2}
+        stats = main._resume_team({"settings": settings, "api_client": client, "journal": journal})
+        assert stats["deleted"] == 5
+        assert len(backend.attendances) == stats["success"] > 0
+        assert main._resume_team({"settings": settings, "api_client": client, "journal": journal}) is None
+
+
+def test_resume_keeps_creates_when_range_delete_mark_was_lost(tmp_path):
+    """완료된 생성이 있으면 기간 삭제는 이미 끝난 것 -> 다시 지우지 않는다"""
+    view_from, view_until = main._get_date_range()
+    with FakeBackendServer(1) as backend:
+        client = APIClient(f"{backend.url}/api/v1", "a@example.com", "pw", rate_limiter=AdaptiveTokenBucket(rate=10_000))
+        client.login()
+        day = main.date.fromisoformat(view_from[:10])
+        payloads = [
+            main._create_attendance_payload(backend.users[0]["id"], "type-annual", day, day, f"#{n}") for n in range(2)
+        ]
+        journal = SyncJournal(tmp_path / "sync_journal.jsonl", "test")
+        keys = journal.begin(view_from[:10], view_until[:10], "replace", [("delete_range", None, None)] + [("create", None, p) for p in payloads])
+        client.create_attendance_with_retry(payloads[0], idempotency_key=keys[1])
+        journal.mark_done([keys[1]])  # 기간 삭제의 완료 줄은 유실
+
+        settings = {"team_name": "default", "api_bulk": False, "api_bulk_chunk_size": 50, "api_concurrency": 2}
+        stats = main._resume_team({"settings": settings, "api_client": client, "journal": journal})
+        assert stats["deleted"] == 0 and stats["success"] == 1
+        assert len(backend.attendances) == 2
+
+
+PAGE_SIZE = 50
+
+
+class _Record(dict):
+    """weakref를 걸 수 있는 dict (살아 있는 레코드 수 세기용)"""
+
+
+def test_existing_records_are_streamed_page_by_page(monkeypatch):
+    """변경 없는 재동기화: 기존 근태 전체가 아니라 한두 페이지 분량만 동시에 메모리에 있다"""
+    view_from, _ = main._get_date_range()
+    counts = {"alive": 0, "peak": 0, "pages": 0}
+
+    def _released():
+        counts["alive"] -= 1
+
+    iter_records = APIClient.iter_attendances_in_range
+
+    def _tracked(self, start_date, end_date, fields=SYNC_FIELDS, page_size=None):
+        for n, record in enumerate(iter_records(self, start_date, end_date, fields, PAGE_SIZE)):
+            if n % PAGE_SIZE == 0:
+                counts["pages"] += 1
+            tracked = _Record(record)
+            weakref.finalize(tracked, _released)
+            counts["alive"] += 1
+            counts["peak"] = max(counts["peak"], counts["alive"])
+            yield tracked
+
+    with FakeCalendarServer(1_000, view_from) as calendar, FakeBackendServer(len(calendar.members)) as backend:
+        first = _sync(calendar, backend)
+        assert first["success"] > PAGE_SIZE * 4
+        monkeypatch.setattr(APIClient, "iter_attendances_in_range", _tracked)
+        stats = _sync(calendar, backend)
+        assert stats["unchanged"] == first["success"]
+        assert stats["success"] == stats["deleted"] == 0
+    assert counts["pages"] > 4
+    assert counts["peak"] <= 2 * PAGE_SIZE
+
+
+def test_range_delete_pages_through_records():
+    """bulk 없이 기간 삭제: 페이지를 받으면서 지워도 다음 페이지가 빠지지 않는다"""
+    with FakeBackendServer(3, existing=30, existing_date="2026-01-05") as backend:
+        client = APIClient(f"{backend.url}/api/v1", "a@example.com", "pw", page_size=10, rate_limiter=AdaptiveTokenBucket(rate=10_000))
+        client.login()
+        assert client.delete_attendances_in_range("2026-01-01", "2026-01-31") == 30
+        assert backend.attendances == {}
+        client.session.close()
+
+
+def test_stream_keeps_recurring_occurrences(monkeypatch):
+    """같은 scheduleId의 반복 일정 회차는 모두 남기고, 기간 경계에 걸쳐 두 번 받은 일정만 하나로"""
+
+    def _event(schedule_id, start, end):
+        return {"memberId": "m1", "summary": "[외근]-홍길동", "startDate": start, "endDate": end, "scheduleType": None, "scheduleId": schedule_id}
+
+    weekly = [_event("weekly", f"2026-01-{day:02d} 09:00", f"2026-01-{day:02d} 18:00") for day in (5, 12)]
+    boundary = _event("trip", "2026-01-09 00:00", "2026-01-10 23:59")
+    chunks = {"2026-01-05 00:00": weekly[:1] + [boundary], "2026-01-10 00:00": [boundary] + weekly[1:]}
+    monkeypatch.setattr(main, "_fetch_schedule_chunk_events", lambda session, members, start, *args: chunks[start])
+
+    events = list(main._stream_team_schedule(None, ["m1"], "2026-01-05 00:00", "2026-01-14 23:59", window_days=5, workers=1))
+    assert events == [weekly[0], boundary, weekly[1]]
+
+
+def test_calendar_probe_uses_configured_timeout():
+    class _Session:
+        def post(self, url, **kwargs):
+            self.timeout = kwargs["timeout"]
+            raise requests.ConnectionError("offline")
+
+    session = _Session()
+    assert main._probe_calendar_session(session, (1.5, 7.0)) is None
+    assert session.timeout == (1.5, 7.0)
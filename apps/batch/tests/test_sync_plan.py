@@ -0,0 +1,59 @@
+from sync_plan import attendance_key, plan_sync
+
+
+def _payload(user="u1", type_id="t1", start="2026-01-05", end="2026-01-05", content=None):
+    return {"userId": user, "typeId": type_id, "startDate": start, "endDate": end, "content": content}
+
+
+def _record(record_id, **kwargs):
+    record = _payload(**kwargs)
+    record.update(
+        id=record_id,
+        startDate=f"{record['startDate']}T00:00:00.000Z",
+        endDate=f"{record['endDate']}T00:00:00.000Z",
+    )
+    return record
+
+
+def test_key_ignores_time_and_blank_content():
+    assert attendance_key(_payload(content=" ")) == attendance_key(_record("a"))
+
+
+def test_plan_creates_updates_deletes():
+    desired = [
+        _payload(),  # 그대로
+        _payload(start="2026-01-06", end="2026-01-07"),  # 종료일 변경
+        _payload(user="u2"),  # 신규
+    ]
+    existing = [
+        _record("keep"),
+        _record("change", start="2026-01-06", end="2026-01-06"),
+        _record("gone", user="u3"),
+    ]
+    plan = plan_sync(desired, existing)
+    assert plan.unchanged == 1
+    assert plan.updates == [("change", desired[1])]
+    assert plan.creates == [desired[2]]
+    assert plan.deletes == ["gone"]
+
+
+def test_duplicates_match_one_to_one():
+    plan = plan_sync([_payload(), _payload()], [_record("a"), _record("b"), _record("c")])
+    assert plan.unchanged == 2
+    assert len(plan.deletes) == 1 and not plan.creates and not plan.updates
+
+
+def test_empty_calendar_deletes_everything():
+    plan = plan_sync([], [_record("a"), _record("b", user="u2")])
+    assert sorted(plan.deletes) == ["a", "b"]
+
+
+def test_existing_can_be_a_stream():
+    """기존 근태를 페이지 스트림으로 받아도 결과가 같고, 일치하지 않은 레코드만 남긴다"""
+    desired = [_payload(), _payload(user="u2")]
+    existing = [_record("keep"), _record("gone", user="u3")]
+    plan = plan_sync(desired, (record for record in existing))
+    assert plan.unchanged == 1
+    assert plan.creates == [desired[1]]
+    assert plan.deletes == ["gone"]
+    assert [record["id"] for record in plan.stale] == ["gone"]
@@ -0,0 +1,38 @@
+import configparser
+
+import pytest
+
+import main
+
+SETTINGS = {
+    "api_base_url": "http://localhost:3000/api/v1",
+    "api_email": "admin@example.com",
+    "api_password": "pw",
+    "api_sync_mode": "reconcile",
+    "cache_journal_path": None,
+}
+
+
+def _parser(text: str) -> configparser.ConfigParser:
+    parser = configparser.ConfigParser()
+    parser.read_string(text)
+    return parser
+
+
+def test_team_profiles_fall_back_to_api_settings():
+    teams = main._load_teams(_parser("[team:a]\nmembers = 1, 홍길동\n[team:b]\nemail = b@example.com\n"), SETTINGS)
+    assert [(t["team_name"], t["api_email"], t["team_members"]) for t in teams] == [
+        ("a", "admin@example.com", ["1", "홍길동"]),
+        ("b", "b@example.com", []),
+    ]
+
+
+def test_teams_sharing_a_backend_account_are_rejected():
+    """같은 계정이면 근태 조회 범위가 같아 서로의 근태를 삭제하므로 설정 단계에서 막는다"""
+    with pytest.raises(RuntimeError, match="team:a"):
+        main._load_teams(_parser("[team:a]\nmembers = 1\n[team:b]\nmembers = 2\nemail = ADMIN@example.com\n"), SETTINGS)
+
+
+def test_same_email_on_another_backend_is_allowed():
+    teams = main._load_teams(_parser("[team:a]\n[team:b]\nbase_url = http://other:3000/api/v1\n"), SETTINGS)
+    assert len(teams) == 2
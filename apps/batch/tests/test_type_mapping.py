@@ -0,0 +1,20 @@
+import main
+
+ATTENDANCE_TYPES = [
+    {"id": "t-annual", "code": "ANNUAL"},
+    {"id": "t-trip", "code": "BUSINESS_TRIP"},
+]
+
+
+def test_default_mapping():
+    table = main._build_type_table(main.DEFAULT_TYPE_MAPPING, ATTENDANCE_TYPES)
+    assert main._map_type_to_attendance_type("반차", table) == "t-annual"
+    assert main._map_type_to_attendance_type("외근", table) == "t-trip"
+    assert main._map_type_to_attendance_type("교육", table) is None
+
+
+def test_custom_mapping_is_case_insensitive_and_skips_unknown_codes():
+    table = main._build_type_table({"WFH": "BUSINESS_TRIP", "병가": "SICK"}, ATTENDANCE_TYPES)
+    assert table == {"wfh": "t-trip"}
+    assert main._map_type_to_attendance_type("wfh", table) == "t-trip"
+    assert main._map_type_to_attendance_type("병가", table) is None
@@ -0,0 +1,61 @@
+from user_index import UserIndex, normalize_name
+
+USERS = [
+    {"id": "u1", "name": "이경봉", "email": "kb@example.com"},
+    {"id": "u2", "name": "김철수", "email": "cs1@example.com"},
+    {"id": "u3", "name": "김철수", "email": "cs2@example.com"},
+    {"id": "u4", "name": "Jean-Luc Picard", "email": "jl@example.com"},
+]
+
+
+def _index(**kwargs) -> UserIndex:
+    index = UserIndex(**kwargs)
+    index.update(USERS)
+    return index
+
+
+def test_normalize_name():
+    assert normalize_name(" 이 경봉 ") == "이경봉"
+    assert normalize_name("Ｊｅａｎ-Luc  PICARD") == "jean-lucpicard"
+
+
+def test_exact_and_alias():
+    index = _index(aliases={"KB": "kb@example.com", "Picard": "Jean-Luc Picard"})
+    assert index.resolve("이 경봉") == ("u1", "exact")
+    assert index.resolve("kb") == ("u1", "alias")
+    assert index.resolve("picard") == ("u4", "alias")
+    assert index.resolve("없는사람") == (None, "missing")
+
+
+def test_same_name_needs_member_id():
+    index = _index(members={"M-2": "cs1@example.com"})
+    assert index.resolve("김철수") == (None, "ambiguous")
+    assert index.resolve("김철수", "m-2") == ("u2", "member")
+    assert index.resolve("", "M-2") == ("u2", "member")
+
+
+def test_member_id_is_learned_from_unique_matches(tmp_path):
+    path = tmp_path / "user_index.json"
+    index = _index(path=path)
+    index.resolve("이경봉", "member-1")
+    index.save()
+    reloaded = UserIndex(path=path)
+    assert reloaded._member_user("member-1") == "u1"
+    assert reloaded.resolve("이경봉") == ("u1", "exact")
+
+
+def test_fuzzy_only_for_long_names():
+    index = _index()
+    assert index.resolve("Jean-Luc Pikard") == ("u4", "fuzzy")
+    assert index.resolve("이경붕") == (None, "missing")
+
+
+def test_update_reindexes_only_changes():
+    index = _index()
+    assert index.update(USERS) == 0
+    renamed = [dict(USERS[0], name="이경복")] + USERS[1:]
+    assert index.update(renamed) == 2  # 이전 항목 제거 + 새 항목 추가
+    assert index.resolve("이경복") == ("u1", "exact")
+    assert index.resolve("이경봉") == (None, "missing")
+    assert index.update(USERS[1:]) == 1
+    assert "이경복" not in index.names